@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Callable, List, NamedTuple
+
+from logy.builtin.register import Register
+from logy.core.main import Logy
+from logy.core.primitive import Component, Pin, Wire, MultiWire, Mode, BinaryData, D
+from logy.core.system import WriteEvent
+
+
+class Circuit(NamedTuple):
+    """
+    A benchmark circuit: the design, its clock and a stimulus applied before each cycle.
+    """
+    logy: Logy
+    clock: Pin
+    stimulus: Callable[[Logy, int, int], None]
+
+
+class Increment(Component):
+    """
+    A combinational component whose output is its input plus one.
+    """
+
+    def __init__(self, pin_in: Pin, pin_out: Pin, name: str = None):
+        super().__init__([(pin_in, Mode.IN, 'in'), (pin_out, Mode.OUT, 'out')], name=name)
+        self.data_in, self.data_out
+
+    @property
+    def pin_in(self) -> Pin:
+        return self.get_pin('in').pin
+
+    @property
+    def pin_out(self) -> Pin:
+        return self.get_pin('out').pin
+
+    @Component.mapped('in', Mode.IN)
+    def data_in(self, data: D) -> int:
+        return data.value
+
+    @Component.mapped('out', Mode.OUT, srcs=('data_in',), eval=lambda value: (value + 1) & 0xffffffff)
+    def data_out(self, value: int) -> int:
+        return value
+
+
+class Add(Component):
+    """
+    A combinational component whose output is the sum of its two inputs.
+    """
+
+    def __init__(self, pin_a: Pin, pin_b: Pin, pin_out: Pin, name: str = None):
+        super().__init__([(pin_a, Mode.IN, 'a'), (pin_b, Mode.IN, 'b'), (pin_out, Mode.OUT, 'out')], name=name)
+        self.data_a, self.data_b, self.data_out
+
+    @property
+    def pin_out(self) -> Pin:
+        return self.get_pin('out').pin
+
+    @Component.mapped('a', Mode.IN)
+    def data_a(self, data: D) -> int:
+        return data.value
+
+    @Component.mapped('b', Mode.IN)
+    def data_b(self, data: D) -> int:
+        return data.value
+
+    @Component.mapped('out', Mode.OUT, srcs=('data_a', 'data_b'), eval=lambda a, b: (a + b) & 0xffffffff)
+    def data_out(self, value: int) -> int:
+        return value
+
+
+def _clock(logy: Logy, regs: List[Register], width: int = 1, delay: int = 0):
+    logy.add_pin(clock := Pin(BinaryData(0, length=width), name="GCLK"))
+    logy.add_wire(Wire.branch(clock, [(reg.pin_clk, delay) for reg in regs], name="CLKTREE"))
+    return clock
+
+
+def ripple_chain(size: int, delay: int = 0) -> Circuit:
+    """
+    A chain of 8-bit registers shifting a new value in every cycle, with wires of some delay.
+    """
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=8), name=f"R{i}") for i in range(size)]
+    logy.add_comp(*regs)
+    clock = _clock(logy, regs, delay=delay)
+    logy.add_wire(*[Wire.direct(src.pin_data_out, dst.pin_data_in, delay) for src, dst in zip(regs, regs[1:])])
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, regs[0].pin_data_in, time, (cycle * 37 + 1) & 0xff))
+
+    return Circuit(logy, clock, stimulus)
+
+
+def clock_tree(size: int) -> Circuit:
+    """
+    A single clock branching out to many 1-bit registers.
+    """
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=1), name=f"R{i}") for i in range(size)]
+    logy.add_comp(*regs)
+    logy.add_pin(data := Pin(BinaryData(0, length=1), name="D"))
+    logy.add_wire(Wire.branch(data, [(reg.pin_data_in, 0) for reg in regs], name="DTREE"))
+    clock = _clock(logy, regs)
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, data, time, cycle & 1))
+
+    return Circuit(logy, clock, stimulus)
+
+
+def register_bank(size: int, width: int = 32) -> Circuit:
+    """
+    A bank of `size` registers of `width` bits loading a shared bus every cycle.
+    """
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=width), name=f"R{i}") for i in range(size)]
+    logy.add_comp(*regs)
+    logy.add_pin(bus := Pin(BinaryData(0, length=width), name="BUS"))
+    logy.add_wire(Wire.branch(bus, [(reg.pin_data_in, 0) for reg in regs], name="BUS"))
+    clock = _clock(logy, regs)
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, bus, time, (cycle * 2654435761) & ((1 << width) - 1)))
+
+    return Circuit(logy, clock, stimulus)
+
+
+def comb_chain(size: int) -> Circuit:
+    """
+    An input register feeding `size` chained incrementers into an output register.
+    """
+    logy = Logy()
+    src, dst = Register(BinaryData(0, length=32), name="SRC"), Register(BinaryData(0, length=32), name="DST")
+    incs = [Increment(Pin(BinaryData(0, length=32), name=f"I{i}"), Pin(BinaryData(0, length=32), name=f"O{i}"),
+                      name=f"INC{i}") for i in range(size)]
+    logy.add_comp(src, dst, *incs)
+    clock = _clock(logy, [src, dst])
+    logy.add_wire(Wire.direct(src.pin_data_out, incs[0].pin_in),
+                  *[Wire.direct(prev.pin_out, inc.pin_in) for prev, inc in zip(incs, incs[1:])],
+                  Wire.direct(incs[-1].pin_out, dst.pin_data_in))
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, src.pin_data_in, time, (cycle * 2654435761) & 0xffffffff))
+
+    return Circuit(logy, clock, stimulus)
+
+
+def adder_tree(size: int) -> Circuit:
+    """
+    A bank of `size` registers summed by a balanced tree of adders into an output register,
+    so that both inputs of every adder change at the same time.
+    """
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=32), name=f"R{i}") for i in range(size)]
+    dst = Register(BinaryData(0, length=32), name="DST")
+    logy.add_comp(*regs, dst)
+    logy.add_pin(bus := Pin(BinaryData(0, length=32), name="BUS"))
+    logy.add_wire(Wire.branch(bus, [(reg.pin_data_in, 0) for reg in regs], name="BUS"))
+    clock = _clock(logy, [*regs, dst])
+
+    level, index = [reg.pin_data_out for reg in regs], 0
+    while len(level) > 1:
+        outs = []
+        for a, b in zip(level[::2], level[1::2]):
+            add = Add(Pin(BinaryData(0, length=32), name=f"A{index}"), Pin(BinaryData(0, length=32), name=f"B{index}"),
+                      Pin(BinaryData(0, length=32), name=f"S{index}"), name=f"ADD{index}")
+            logy.add_comp(add)
+            logy.add_wire(Wire.direct(a, add.get_pin('a').pin), Wire.direct(b, add.get_pin('b').pin))
+            outs.append(add.pin_out)
+            index += 1
+        level = outs + level[len(outs) * 2:]
+    logy.add_wire(Wire.direct(level[0], dst.pin_data_in))
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, bus, time, (cycle * 2654435761) & 0xffffffff))
+
+    return Circuit(logy, clock, stimulus)
+
+
+# fields of a MIPS instruction word, by bits [start, stop)
+FIELDS = {'opcode': (26, 32), 'rs': (21, 26), 'rt': (16, 21), 'rd': (11, 16), 'imm': (0, 16)}
+
+
+def decode_stage(size: int) -> Circuit:
+    """
+    `size` instruction registers loading a shared instruction bus, each split by a bus wire into field registers,
+    with instructions differing in a few fields from one cycle to the next.
+    """
+    logy = Logy()
+    irs = [Register(BinaryData(0, length=32), name=f"IR{i}") for i in range(size)]
+    fields = [{field: Register(BinaryData(0, length=stop - start), name=f"{field.upper()}{i}")
+               for field, (start, stop) in FIELDS.items()} for i in range(size)]
+    logy.add_comp(*irs, *(reg for regs in fields for reg in regs.values()))
+    logy.add_pin(bus := Pin(BinaryData(0, length=32), name="BUS"))
+    logy.add_wire(Wire.branch(bus, [(ir.pin_data_in, 0) for ir in irs], name="BUS"),
+                  *[MultiWire.split(ir.pin_data_out, [(regs[field].pin_data_in, FIELDS[field]) for field in regs],
+                                    name=f"DECODE{i}") for i, (ir, regs) in enumerate(zip(irs, fields))])
+    clock = _clock(logy, [*irs, *(reg for regs in fields for reg in regs.values())])
+
+    def stimulus(logy: Logy, time: int, cycle: int):
+        # lw $rt, imm($rs): the opcode and rt are kept, rs and imm change
+        word = (0x23 << 26) | ((cycle & 31) << 21) | (8 << 16) | ((cycle * 4) & 0xffff)
+        logy.system.schedule(WriteEvent(None, bus, time, word))
+
+    return Circuit(logy, clock, stimulus)
+
+
+CIRCUITS = {
+    'ripple_chain': (ripple_chain, (16, 64, 256)),
+    'clock_tree': (clock_tree, (64, 256, 1024)),
+    'register_bank': (register_bank, (32,)),
+    'comb_chain': (comb_chain, (16, 64, 256)),
+    'adder_tree': (adder_tree, (16, 64, 256)),
+    'decode_stage': (decode_stage, (16, 64, 256)),
+}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict, List
+
+from logy.bench.circuits import Increment
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent
+
+
+def traced(build: Callable[[], object]) -> int:
+    """
+    Get the bytes still allocated by a build once it returns, keeping its result alive until measured.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def footprint(pins: int) -> Dict[str, float]:
+    """
+    Measure bytes per pin, alone and in a design of incrementers chained by wires, and bytes per pending event.
+    """
+    data = BinaryData(0, length=32)
+
+    def design():
+        logy = Logy()
+        ends = [Pin(data) for _ in range(pins)]
+        comps = [Increment(ends[i], ends[i + 1]) for i in range(0, pins, 2)]
+        wires = [Wire.direct(ends[i], ends[i + 1], 1) for i in range(1, pins - 1, 2)]
+        logy.add_comp(*comps)
+        logy.add_wire(*wires)
+        return logy
+
+    logy = design()
+    targets = [pin for comp in logy.comps for pin in comp.pins]
+
+    def events():
+        system = logy.system
+        for time, pin in enumerate(targets):
+            system.schedule(WriteEvent(None, pin, time + 1, time & 0xff))
+        return system
+
+    return {'pin': traced(lambda: [Pin(data) for _ in range(pins)]) / pins,
+            'design_pin': traced(design) / pins,
+            'event': traced(events) / pins}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Measure the memory footprint of pins and pending events.")
+    parser.add_argument('--pins', type=int, default=100_000)
+    args = parser.parse_args(argv)
+    result = footprint(args.pins)
+    print(f"{args.pins} pins: {result['pin']:.0f} B/pin, {result['design_pin']:.0f} B/pin in a design, "
+          f"{result['event']:.0f} B/pending event")
+
+
+if __name__ == '__main__':
+    main()
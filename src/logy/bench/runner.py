@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, Iterable, List, Optional
+
+from logy.bench.circuits import CIRCUITS, Circuit
+from logy.core.main import Logy
+from logy.core.parallel import ParallelLogy
+from logy.core.system import WriteEvent
+
+PERIOD = 10
+
+
+def logy_of(build: Callable[[int], Circuit], size: int) -> Logy:
+    """
+    Build the design of a circuit, for each process of a parallel engine.
+    """
+    return build(size).logy
+
+
+def simulate(circuit: Circuit, cycles: int):
+    """
+    Run clock cycles of the circuit on the event engine, scheduling stimulus one cycle at a time.
+    """
+    logy, clock, stimulus = circuit
+    system = logy.system
+    for cycle in range(cycles):
+        start = system.now()
+        stimulus(logy, start, cycle)
+        system.schedule(WriteEvent(None, clock, start + PERIOD // 2, 1))
+        system.schedule(WriteEvent(None, clock, start + PERIOD - 1, 0))
+        system.advance(PERIOD)
+
+
+def measure(build: Callable[[int], Circuit], size: int, cycles: int, memory: bool = True,
+            inertial: Optional[int] = None, delta: bool = False, processes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Measure setup time, run time and event throughput of a circuit, and optionally its peak memory in a second pass.
+    With processes, the circuit runs on the parallel engine and peak memory is not measured.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    circuit = build(size)
+    circuit.logy.elaborate()
+    circuit.logy.system.inertial, circuit.logy.system.delta = inertial, delta
+    if processes:
+        parallel = ParallelLogy(circuit.logy, logy_of, build, size, partitions=processes, inertial=inertial,
+                                delta=delta)
+        circuit, memory = circuit._replace(logy=parallel), False
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulate(circuit, cycles)
+    run = time.perf_counter() - start
+    if processes:
+        circuit.logy.sync()
+        circuit.logy.close()
+    events = circuit.logy.system.executed
+
+    result = {'size': size, 'cycles': cycles, 'setup_s': setup, 'run_s': run, 'events': events,
+              'events_per_s': events / run if run else None, 's_per_cycle': run / cycles,
+              'avoided': circuit.logy.system.avoided, 'peak_bytes': None}
+    del circuit
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        circuit = build(size)
+        circuit.logy.elaborate()
+        circuit.logy.system.inertial, circuit.logy.system.delta = inertial, delta
+        simulate(circuit, cycles)
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run(names: Iterable[str] = None, sizes: Optional[List[int]] = None, cycles: int = 50,
+        memory: bool = True, inertial: Optional[int] = None, delta: bool = False,
+        processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    results = []
+    for name in names or CIRCUITS:
+        build, default_sizes = CIRCUITS[name]
+        for size in sizes or default_sizes:
+            result = measure(build, size, cycles, memory, inertial, delta, processes)
+            result['circuit'] = name
+            results.append(result)
+            print(f"{name:<14} {size:>6}: setup {result['setup_s']:.3f}s, {result['events_per_s'] or 0:>10,.0f} ev/s, "
+                  f"{result['s_per_cycle'] * 1e3:.3f}ms/cycle"
+                  + (f", peak {result['peak_bytes'] / 2 ** 20:.1f}MiB" if result['peak_bytes'] else ''),
+                  file=sys.stderr)
+    return results
+
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'machine': platform.machine(), 'platform': platform.platform(), 'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the event engine on scaled reference circuits.")
+    parser.add_argument('circuits', nargs='*', help=f"circuits to run among {', '.join(CIRCUITS)}, all by default")
+    parser.add_argument('--sizes', type=int, nargs='+', help="sizes overriding each circuit's defaults")
+    parser.add_argument('--cycles', type=int, default=50)
+    parser.add_argument('--no-memory', action='store_true', help="skip the peak memory pass")
+    parser.add_argument('--inertial', type=int, metavar='WINDOW', help="enable the inertial delay model")
+    parser.add_argument('--delta', action='store_true', help="evaluate components once per delta cycle")
+    parser.add_argument('--processes', type=int, metavar='N', help="run on the parallel engine with N processes")
+    parser.add_argument('-o', '--output', default='bench.json', help="result file, '-' for stdout")
+    args = parser.parse_args(argv)
+    for name in args.circuits:
+        if name not in CIRCUITS:
+            parser.error(f"unknown circuit '{name}'")
+
+    report = {'meta': metadata(),
+              'results': run(args.circuits, args.sizes, args.cycles, memory=not args.no_memory,
+                             inertial=args.inertial, delta=args.delta, processes=args.processes)}
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
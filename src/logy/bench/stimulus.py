@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from logy.builtin.register import Register
+from logy.core.error import SchedulerOverflowError
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent, Stimulus
+
+PERIOD = 10
+
+
+def design() -> Tuple[Logy, List[Register], Pin]:
+    """
+    A chain of 4 registers, the first loading a new value every cycle.
+    """
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=8), name=f"R{i}") for i in range(4)]
+    logy.add_comp(*regs)
+    logy.add_pin(clock := Pin(BinaryData(0, length=1), name="GCLK"))
+    logy.add_wire(Wire.branch(clock, [(reg.pin_clk, 0) for reg in regs], name="CLKTREE"),
+                  *[Wire.direct(src.pin_data_out, dst.pin_data_in) for src, dst in zip(regs, regs[1:])])
+    logy.elaborate()
+    return logy, regs, clock
+
+
+def changes(pin: Pin, cycles: int):
+    return ((cycle * PERIOD, pin, (cycle * 37 + 1) & 0xff) for cycle in range(cycles))
+
+
+def scheduled(logy: Logy, regs: List[Register], clock: Pin, cycles: int):
+    for source in (changes(regs[0].pin_data_in, cycles), Stimulus.clock(clock, PERIOD, cycles, start=PERIOD // 2)):
+        for event in iter(Stimulus.of(source).next, None):
+            logy.system.schedule(WriteEvent(None, event.target, event.time, event.data))
+
+
+def streamed(logy: Logy, regs: List[Register], clock: Pin, cycles: int):
+    logy.system.stream(changes(regs[0].pin_data_in, cycles), Stimulus.clock(clock, PERIOD, cycles, start=PERIOD // 2))
+
+
+def replayed(path: str, cycles: int):
+    """
+    Save the stimulus to a trace file, from another instance of the design, as pins are referred to by id.
+    """
+    _, regs, _ = design()
+    Stimulus.save(path, changes(regs[0].pin_data_in, cycles))
+
+    def load(logy: Logy, regs: List[Register], clock: Pin, cycles: int):
+        logy.system.stream(Stimulus.load(path, logy), Stimulus.clock(clock, PERIOD, cycles, start=PERIOD // 2))
+
+    return load
+
+
+def measure(load: Callable[[Logy, List[Register], Pin, int], None], cycles: int) -> Dict[str, float]:
+    """
+    Load a stimulus of some cycles and run it, measuring the peak memory and the final value of the chain.
+    """
+    logy, regs, clock = design()
+    tracemalloc.start()
+    start = perf_counter()
+    load(logy, regs, clock, cycles)
+    logy.system.advance(cycles * PERIOD)
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'elapsed': elapsed, 'peak': peak, 'events': logy.system.executed, 'value': regs[-1].pin_data_out.data.value}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Compare stimuli scheduled up front with streamed ones.")
+    parser.add_argument('--cycles', type=int, nargs='+', default=[1000, 4000])
+    parser.add_argument('--capacity', type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'stimulus.bin')
+        for cycles in args.cycles:
+            loads = [('scheduled', scheduled), ('streamed', streamed), ('trace file', replayed(path, cycles))]
+            for name, load in loads:
+                result = measure(load, cycles)
+                print(f"{cycles:6} cycles {name:10}: {result['elapsed']:.2f}s, peak {result['peak'] / 1024:,.0f}KiB, "
+                      f"{result['events']} events, R3 {result['value']}")
+
+    # a bounded queue cannot hold a long stimulus scheduled up front, but holds it streamed
+    cycles = max(args.cycles)
+    for name, load in [('scheduled', scheduled), ('streamed', streamed)]:
+        logy, regs, clock = design()
+        logy.use(Logy.EventSystem(capacity=args.capacity))
+        try:
+            load(logy, regs, clock, cycles)
+            logy.system.advance(cycles * PERIOD)
+            print(f"{name} in a queue of {args.capacity}: {logy.system.executed} events")
+        except SchedulerOverflowError as e:
+            print(f"{name} in a queue of {args.capacity}: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Optional, Union, BinaryIO
+
+from logy.builtin.clock import SyncComponent
+from logy.core.primitive import Component, Pin, BinaryData, Mode, D
+
+# struct formats of unsigned words by size in bytes
+_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+class Memory(SyncComponent, classifier="_MEM", states=[('__word', 'word')]):
+    """
+    A byte-addressed memory with an asynchronous read port and a synchronous write port.
+    DOUT holds the word at ADDR; on the clock edge, DIN is written at ADDR if WE is set.
+    Contents are kept in a bytearray, or in a memory-mapped file if given, and accessed through a memoryview,
+    so that images are loaded and dumped without a Python object per word.
+    """
+
+    def __init__(self, size: int, word_size: int = 4, byteorder: str = 'big', file: Optional[str] = None,
+                 name: str = None, is_rising_edge=True):
+        """
+        :param size: size in bytes
+        :param word_size: size of a word in bytes
+        :param byteorder: order of bytes in a word, 'big' or 'little'
+        :param file: a file to map the contents to, kept in memory if None
+        """
+        if byteorder not in ('big', 'little'):
+            raise ValueError(f"byteorder must be 'big' or 'little', not {byteorder!r}")
+        self.__size = size
+        self.__word_size = word_size
+        self.__byteorder = byteorder
+        fmt = _FORMATS.get(word_size)
+        self.__struct = struct.Struct(('>' if byteorder == 'big' else '<') + fmt) if fmt else None
+        if file is None:
+            self.__buffer = bytearray(size)
+        else:
+            fd = os.open(file, os.O_RDWR | os.O_CREAT)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self.__buffer = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        self.__view = memoryview(self.__buffer)
+
+        template = BinaryData(0, length=word_size * 8)
+        self.__template = template
+        self.__pin_address = Pin(BinaryData(0, length=max(1, (size - 1).bit_length())), name="ADDR")
+        self.__pin_data_in = Pin(template, name="DIN")
+        self.__pin_write_enable = Pin(BinaryData(0, length=1), name="WE")
+        self.__pin_data_out = Pin(template, name="DOUT")
+        SyncComponent.__init__(self, [(self.__pin_address, Mode.IN, "ADDR"), (self.__pin_data_in, Mode.IN, "DIN"),
+                                      (self.__pin_write_enable, Mode.IN, "WE"),
+                                      (self.__pin_data_out, Mode.OUT, "DOUT")], name=name)
+        self.is_rising_edge = is_rising_edge
+
+        self.address
+        self.data_in
+        self.write_enable
+        self.__word = self.__fetch(self.address)
+        self.data_out
+
+    @property
+    def pin_address(self):
+        return self.__pin_address
+
+    @property
+    def pin_data_in(self):
+        return self.__pin_data_in
+
+    @property
+    def pin_write_enable(self):
+        return self.__pin_write_enable
+
+    @property
+    def pin_data_out(self):
+        return self.__pin_data_out
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def word_size(self) -> int:
+        return self.__word_size
+
+    @property
+    def byteorder(self) -> str:
+        return self.__byteorder
+
+    @property
+    def word(self) -> BinaryData:
+        return self.__word
+
+    @Component.mapped("ADDR", Mode.IN)
+    def address(self, data: D) -> int:
+        return data.value
+
+    @Component.mapped("DIN", Mode.IN)
+    def data_in(self, data: D) -> D:
+        return data
+
+    @Component.mapped("WE", Mode.IN)
+    def write_enable(self, data: D) -> bool:
+        return data.value == 1
+
+    @Component.mapped("DOUT", Mode.OUT, srcs=['word'], eval=lambda word: word)
+    def data_out(self, value: D) -> D:
+        return value
+
+    def update(self, state):
+        super().update(state)
+        if 'address' in state:
+            self.__word = self.__fetch(self.address)
+
+    def rising_edge(self):
+        if self.is_rising_edge and self.write_enable:
+            self.__store(self.address, self.data_in.value)
+
+    def falling_edge(self):
+        if not self.is_rising_edge and self.write_enable:
+            self.__store(self.address, self.data_in.value)
+
+    """ word access """
+
+    def __check(self, address: int, length: int):
+        if address < 0 or address + length > self.__size:
+            raise IndexError(f"{self.full_name}: access of {length} bytes at {address:#x} is out of range")
+
+    def __fetch(self, address: int) -> BinaryData:
+        # an address out of range, like one driven while settling, reads the default word
+        if address < 0 or address + self.__word_size > self.__size:
+            return self.__template.of(None)
+        return self.__template.of(self.read(address))
+
+    def __store(self, address: int, value: int):
+        # a write out of range, like one clocked while the address settles, is ignored
+        if address < 0 or address + self.__word_size > self.__size:
+            return
+        self.write(address, value)
+
+    def read(self, address: int) -> int:
+        """
+        Read the word at the byte address.
+        """
+        self.__check(address, self.__word_size)
+        if self.__struct:
+            return self.__struct.unpack_from(self.__buffer, address)[0]
+        return int.from_bytes(self.__view[address:address + self.__word_size], self.__byteorder)
+
+    def write(self, address: int, value: int):
+        """
+        Write the word at the byte address.
+        """
+        self.__check(address, self.__word_size)
+        if self.__struct:
+            self.__struct.pack_into(self.__buffer, address, value)
+        else:
+            self.__view[address:address + self.__word_size] = value.to_bytes(self.__word_size, self.__byteorder)
+        if abs(address - self.address) < self.__word_size:
+            self.__word = self.__fetch(self.address)
+
+    """ bulk access """
+
+    def load(self, image: Union[bytes, bytearray, memoryview, str, os.PathLike], offset: int = 0):
+        """
+        Load a binary image at the byte offset, from a bytes-like object or a file read straight into memory.
+        """
+        if isinstance(image, (str, os.PathLike)):
+            with open(image, 'rb') as file:
+                length = os.fstat(file.fileno()).st_size
+                self.__check(offset, length)
+                file.readinto(self.__view[offset:offset + length])
+        else:
+            image = memoryview(image).cast('B')
+            self.__check(offset, len(image))
+            self.__view[offset:offset + len(image)] = image
+        self.__word = self.__fetch(self.address)
+
+    def view(self, start: int = 0, length: Optional[int] = None) -> memoryview:
+        """
+        Get a read-only view of the contents, without copying.
+        """
+        length = self.__size - start if length is None else length
+        self.__check(start, length)
+        return self.__view[start:start + length].toreadonly()
+
+    def dump(self, file: Union[str, os.PathLike, BinaryIO], start: int = 0, length: Optional[int] = None):
+        """
+        Write the contents to a file path or a binary file.
+        """
+        view = self.view(start, length)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'wb') as f:
+                f.write(view)
+        else:
+            file.write(view)
+
+    def flush(self):
+        """
+        Flush the contents to the mapped file, if any.
+        """
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.flush()
+
+    def close(self):
+        """
+        Release the contents, flushing and unmapping the mapped file if any.
+        """
+        self.__view.release()
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    """ state """
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['contents'] = bytes(self.__view)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        contents = state.pop('contents', None)
+        super().__setstate__(state)
+        if contents is not None:
+            self.__view[:len(contents)] = contents
+
+    def __repr__(self):
+        return f"<<{self.full_name}>>(size: {self.__size}, word_size: {self.__word_size}, " \
+               f"byteorder: {self.__byteorder}, address: {self.address:#x}, word: {self.__word})"
+
+
+if __name__ == '__main__':
+    import tracemalloc
+    from time import perf_counter
+    from logy.core.main import Logy
+    from logy.core.system import WriteEvent
+
+    logy = Logy()
+    tracemalloc.start()
+    memory = Memory(16 << 20, name="IMEM")
+    logy.add_comp(memory)
+
+    image = bytes(range(256)) * (4 << 12)
+    start = perf_counter()
+    memory.load(image, offset=0x400000)
+    print(f"loaded {len(image) >> 20}MiB in {(perf_counter() - start) * 1e3:.2f}ms, "
+          f"peak {tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}MiB traced")
+    tracemalloc.stop()
+
+    logy.system.schedule(WriteEvent(None, memory.pin_address, 0, 0x400004))
+    logy.system.advance(5)
+    print(f"DOUT at 0x400004: {memory.pin_data_out.data.value:#010x}")
+
+    logy.system.schedule(WriteEvent(None, memory.pin_data_in, 10, 0xdeadbeef))
+    logy.system.schedule(WriteEvent(None, memory.pin_write_enable, 10, 1))
+    logy.system.schedule(WriteEvent(None, memory.pin_clk, 15, 1))
+    logy.system.schedule(WriteEvent(None, memory.pin_clk, 17, 0))
+    logy.system.advance(20)
+    print(f"DOUT after write: {memory.pin_data_out.data.value:#010x}, "
+          f"bytes: {memory.view(0x400004, 4).hex()}")
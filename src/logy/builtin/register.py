@@ -9,7 +9,7 @@ class Register(SyncComponent, BufferedElement[ComponentBehavior, BD], classifier
         self.__pin_data_out = Pin(data.of(None), name="DOUT")
         SyncComponent.__init__(self, [(self.__pin_data_in, Mode.IN, "DIN"),
                                       (self.__pin_data_out, Mode.OUT, "DOUT")], name=name)
-        BufferedElement.__init__(self, data, name=self.name)
+        BufferedElement.__init__(self, data, name=name)
         self.is_rising_edge = is_rising_edge
 
         self.data_in
@@ -33,7 +33,6 @@ class Register(SyncComponent, BufferedElement[ComponentBehavior, BD], classifier
 
     def rising_edge(self):
         if self.is_rising_edge:
-            print('rising-edge')
             self.data = self.data_in
 
     def falling_edge(self):
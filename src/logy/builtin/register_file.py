@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import re
+import types
+from array import array
+from typing import Dict, Tuple, List, Iterable
+
+from logy.builtin.clock import SyncComponent
+from logy.core.primitive import Component, Pin, BinaryData, Mode
+
+
+def _named(name: str, func):
+    func.__name__ = func.__qualname__ = name
+    return func
+
+
+class RegisterFile(SyncComponent, classifier="_RF"):
+    """
+    A file of registers kept in one array, with asynchronous read ports and synchronous write ports.
+    Each read port i has an address pin RA{i} and a data pin RD{i}; each write port j has an address pin WA{j},
+    a data pin WD{j} and an enable pin WE{j}. Register 0 always reads as zero and ignores writes.
+    All write ports are handled by a single evaluation on the clock edge, later ports winning on the same register,
+    and only read ports whose word changed drive their pin.
+
+    Instances are of a subclass made once per port configuration, holding its pin-mapped properties.
+    """
+    __classes: Dict[Tuple[int, int], type] = {}
+    reads = 0
+    writes = 0
+
+    def __new__(cls, count: int = 32, width: int = 32, reads: int = 2, writes: int = 1, *args, **kwargs):
+        if cls is RegisterFile:
+            cls = RegisterFile.ports(reads, writes)
+        return super().__new__(cls)
+
+    def __init__(self, count: int = 32, width: int = 32, reads: int = 2, writes: int = 1, name: str = None,
+                 is_rising_edge=True):
+        """
+        :param count: number of registers
+        :param width: width of a register in bits
+        :param reads: number of read ports
+        :param writes: number of write ports
+        """
+        self.__count = count
+        self.__registers = array('Q', bytes(8 * count)) if width <= 64 else [0] * count
+        self.__template = BinaryData(0, length=width)
+        address = BinaryData(0, length=max(1, (count - 1).bit_length()))
+        self.__read_pins = [(Pin(address, name=f"RA{i}"), Pin(self.__template, name=f"RD{i}")) for i in range(reads)]
+        self.__write_pins = [(Pin(address, name=f"WA{j}"), Pin(self.__template, name=f"WD{j}"),
+                              Pin(BinaryData(0, length=1), name=f"WE{j}")) for j in range(writes)]
+        SyncComponent.__init__(self, [
+            *((pin, mode, pin.name) for pins in self.__read_pins for pin, mode in zip(pins, (Mode.IN, Mode.OUT))),
+            *((pin, Mode.IN, pin.name) for pins in self.__write_pins for pin in pins),
+        ], name=name)
+        self.is_rising_edge = is_rising_edge
+
+        for i in range(reads):
+            getattr(self, f"read_address_{i}")
+            self.__setattr__(f"word_{i}", self.__fetch(getattr(self, f"read_address_{i}")))
+            getattr(self, f"read_data_{i}")
+        for j in range(writes):
+            getattr(self, f"write_address_{j}"), getattr(self, f"write_data_{j}"), getattr(self, f"write_enable_{j}")
+
+    @classmethod
+    def ports(cls, reads: int, writes: int) -> type:
+        """
+        Get the subclass of RegisterFile with the numbers of read and write ports.
+        """
+        key = (reads, writes)
+        if key not in RegisterFile.__classes:
+            def body(namespace):
+                namespace.update(__module__=__name__, reads=reads, writes=writes)
+                for i in range(reads):
+                    namespace[f"read_address_{i}"] = Component.mapped(f"RA{i}", Mode.IN)(
+                        _named(f"read_address_{i}", lambda self, data: data.value))
+                    namespace[f"read_data_{i}"] = Component.mapped(f"RD{i}", Mode.OUT, srcs=[f"word_{i}"],
+                                                                   eval=lambda word: word)(
+                        _named(f"read_data_{i}", lambda self, value: value))
+                for j in range(writes):
+                    namespace[f"write_address_{j}"] = Component.mapped(f"WA{j}", Mode.IN)(
+                        _named(f"write_address_{j}", lambda self, data: data.value))
+                    namespace[f"write_data_{j}"] = Component.mapped(f"WD{j}", Mode.IN)(
+                        _named(f"write_data_{j}", lambda self, data: data.value))
+                    namespace[f"write_enable_{j}"] = Component.mapped(f"WE{j}", Mode.IN)(
+                        _named(f"write_enable_{j}", lambda self, data: data.value == 1))
+
+            RegisterFile.__classes[key] = types.new_class(
+                f"{RegisterFile.__name__}{reads}R{writes}W", (RegisterFile,),
+                {'states': [f"word_{i}" for i in range(reads)]}, body)
+        return RegisterFile.__classes[key]
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    def pin_read_address(self, port: int) -> Pin:
+        return self.__read_pins[port][0]
+
+    def pin_read_data(self, port: int) -> Pin:
+        return self.__read_pins[port][1]
+
+    def pin_write_address(self, port: int) -> Pin:
+        return self.__write_pins[port][0]
+
+    def pin_write_data(self, port: int) -> Pin:
+        return self.__write_pins[port][1]
+
+    def pin_write_enable(self, port: int) -> Pin:
+        return self.__write_pins[port][2]
+
+    def update(self, state):
+        super().update(state)
+        for i in range(self.reads):
+            if f"read_address_{i}" in state:
+                self.__setattr__(f"word_{i}", self.__fetch(getattr(self, f"read_address_{i}")))
+
+    def rising_edge(self):
+        if self.is_rising_edge:
+            self.__write_ports()
+
+    def falling_edge(self):
+        if not self.is_rising_edge:
+            self.__write_ports()
+
+    def __write_ports(self):
+        written = False
+        for j in range(self.writes):
+            if getattr(self, f"write_enable_{j}"):
+                index = getattr(self, f"write_address_{j}")
+                if 0 < index < self.__count:
+                    self.__registers[index] = getattr(self, f"write_data_{j}")
+                    written = True
+        if written:
+            self.__refresh()
+
+    def __fetch(self, index: int) -> BinaryData:
+        return self.__template.of(self.__registers[index] if 0 <= index < self.__count else None)
+
+    def __refresh(self):
+        for i in range(self.reads):
+            self.__setattr__(f"word_{i}", self.__fetch(getattr(self, f"read_address_{i}")))
+
+    """ register access """
+
+    def read(self, index: int) -> int:
+        """
+        Read a register by index.
+        """
+        return self.__registers[index]
+
+    def write(self, index: int, value: int):
+        """
+        Write a register by index, ignored for register 0.
+        """
+        if index:
+            self.__registers[index] = value
+            self.__refresh()
+
+    def load(self, values: Iterable[int]):
+        """
+        Load registers from index 0 in bulk; register 0 is kept zero.
+        """
+        values = list(values)[1:self.__count]
+        self.__registers[1:len(values) + 1] = array('Q', values) if isinstance(self.__registers, array) else values
+        self.__refresh()
+
+    def dump(self) -> List[int]:
+        return list(self.__registers)
+
+    """ state """
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['registers'] = self.dump()
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        registers = state.pop('registers', None)
+        super().__setstate__(state)
+        if registers is not None:
+            self.__registers[:] = array('Q', registers) if isinstance(self.__registers, array) else registers
+
+
+def __getattr__(name: str):
+    # subclasses by port configuration, resolved by name when loading a netlist or a checkpoint
+    match = re.fullmatch(r"RegisterFile(\d+)R(\d+)W", name)
+    if match:
+        return RegisterFile.ports(int(match[1]), int(match[2]))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == '__main__':
+    import tracemalloc
+    from logy.builtin.register import Register
+    from logy.core.main import Logy
+    from logy.core.primitive import Wire
+    from logy.core.system import WriteEvent
+
+    CYCLES = 32
+
+    def run(logy: Logy, clock: Pin, stimulus) -> int:
+        for cycle in range(CYCLES):
+            stimulus(cycle * 10, cycle)
+            logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 5, 1))
+            logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 9, 0))
+            logy.system.advance(10)
+        return logy.system.executed
+
+    # a register file writing register (cycle % 32) every cycle, and reading it back on port 0
+    tracemalloc.start()
+    logy = Logy()
+    rf = RegisterFile(32, 32)
+    logy.add_comp(rf)
+    built = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def stimulus(time: int, cycle: int):
+        for pin, value in [(rf.pin_write_address(0), cycle % 32), (rf.pin_write_data(0), cycle * 3),
+                           (rf.pin_write_enable(0), 1), (rf.pin_read_address(0), cycle % 32),
+                           (rf.pin_read_address(1), 1)]:
+            logy.system.schedule(WriteEvent(None, pin, time, value))
+
+    events = run(logy, rf.pin_clk, stimulus)
+    print(f"RegisterFile: {events / CYCLES:.1f} events/cycle, {built / 1024:.1f}KiB, "
+          f"RD0 {rf.pin_read_data(0).data.value}, RD1 {rf.pin_read_data(1).data.value}, R0 {rf.read(0)}")
+
+    # 32 registers sharing a clock, with a write enable modelled by writing only the selected register's input
+    tracemalloc.start()
+    logy = Logy()
+    regs = [Register(BinaryData(0, length=32)) for _ in range(32)]
+    logy.add_comp(*regs)
+    logy.add_pin(clock := Pin(BinaryData(0, length=1), name="GCLK"))
+    logy.add_wire(Wire.branch(clock, [(reg.pin_clk, 0) for reg in regs]))
+    built = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def stimulus(time: int, cycle: int):
+        logy.system.schedule(WriteEvent(None, regs[cycle % 32].pin_data_in, time, cycle * 3))
+
+    events = run(logy, clock, stimulus)
+    print(f"32 Registers: {events / CYCLES:.1f} events/cycle, {built / 1024:.1f}KiB")
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+
+from logy.core.compiled import CompiledLogy
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Data, BinaryData, D
+from logy.core.primitive.data import mask
+
+
+class ArrayData(BinaryData):
+    """
+    A binary data whose value is an array over a batch of independent simulations.
+    Validation and slicing work lane-wise with the same width semantics as BinaryData,
+    while equality compares whole batches so that state change detection keeps working.
+    """
+    __slots__ = ()
+
+    DTYPE = np.uint64
+
+    @classmethod
+    def broadcast(cls, data: D, size: int) -> ArrayData:
+        """
+        Get an array data of the batch size, with every lane holding the value of the data.
+        """
+        length, signed = (data.length, data.signed) if isinstance(data, BinaryData) else (64, False)
+        value = np.asarray(data.value, dtype=cls.DTYPE) if isinstance(data, ArrayData) \
+            else np.full(size, data.value, dtype=cls.DTYPE)
+        return cls(value, data.default, length, signed)
+
+    def valid(self, value) -> bool:
+        value = np.asarray(value)
+        if self.signed:
+            value = self._to_binary(value, length=self.length, signed=True)
+        return bool(np.all((value >= 0) & (value <= mask(self.length))))
+
+    def of(self, value, _slice: slice = None):
+        if value is None:
+            value = self.default
+        if _slice:
+            start, stop, _ = _slice.indices(self.length)
+            bits = mask(stop - start) << start if stop > start else 0
+            value = (self.value & (mask(self.length) ^ bits)) | ((np.asarray(value, dtype=self.DTYPE) << start) & bits)
+        if not self.valid(value):
+            raise AttributeError
+        return self._with(np.broadcast_to(np.asarray(value, dtype=self.DTYPE), self.value.shape).copy())
+
+    def __eq__(self, other: Union[D, int]):
+        if isinstance(other, Data):
+            other = other.value
+        elif not isinstance(other, (int, np.ndarray)):
+            return False
+        return bool(np.all(self.value == other))
+
+    def __ne__(self, other: Union[D, int]):
+        return not self.__eq__(other)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, _ = item.indices(self.length)
+            return (self.value >> start) & mask(stop - start) if stop > start else np.zeros_like(self.value)
+        if item < 0 or item >= self.length:
+            raise IndexError
+        return (self.value >> item) & 1
+
+
+class BatchedLogy(CompiledLogy):
+    """
+    A compiled engine which advances a batch of independent simulations of one design at once.
+    Every net and every data state of the components holds an ArrayData over the batch, except for the clock
+    which is shared. Mapped funcs and evals are called once per batch, so they should use operators that
+    broadcast over arrays (arithmetic, bitwise, comparisons) instead of `and`, `or` or `if` on values.
+    Components are converted in place and are not meant to be simulated by the event engine afterwards.
+    """
+
+    def __init__(self, logy: Logy, clock: Pin, size: int):
+        self.__size = size
+        super().__init__(logy, clock)
+
+    @property
+    def size(self):
+        return self.__size
+
+    def _data(self, pin: Pin) -> D:
+        if self.net(pin) == self.net(self.clock):
+            return pin.data
+        return ArrayData.broadcast(pin.data, self.__size)
+
+    def elaborate(self):
+        super().elaborate()
+        for comp in self.logy.comps:
+            for name in comp.states.values():
+                value = getattr(comp, name, None)
+                if isinstance(value, Data) and not isinstance(value, ArrayData):
+                    object.__setattr__(comp, name, ArrayData.broadcast(value, self.__size))
+
+    def poke(self, pin: Pin, value):
+        """
+        Write a value to every lane, or an array of values lane by lane.
+        """
+        super().poke(pin, value.value if isinstance(value, Data) else value)
+
+    def lane(self, pin: Pin, index: int) -> Optional[int]:
+        """
+        Get the value of the pin in a single simulation of the batch.
+        """
+        data = self.peek(pin)
+        return int(data.value[index]) if isinstance(data, ArrayData) else data.value
+
+    def sync(self):
+        with self._installed():
+            for pin in self.logy.pins:
+                pin.__setstate__({'data': self.peek(pin)})
+
+
+if __name__ == '__main__':
+    import time
+    from logy.builtin.register import Register
+    from logy.core.primitive import Component, Mode, Wire
+
+    class Adder(Component):
+        def __init__(self, pin_a: Pin, pin_b: Pin, pin_out: Pin, name: str = None):
+            super().__init__([(pin_a, Mode.IN, 'a'), (pin_b, Mode.IN, 'b'), (pin_out, Mode.OUT, 'out')], name=name)
+            self.A, self.B, self.Out
+
+        @Component.mapped('a', Mode.IN)
+        def A(self, data: D):
+            return data.value
+
+        @Component.mapped('b', Mode.IN)
+        def B(self, data: D):
+            return data.value
+
+        @Component.mapped('out', Mode.OUT, srcs=("A", "B"), eval=lambda a, b: (a + b) & 0xff)
+        def Out(self, value):
+            return value
+
+    # accumulator: acc <- acc + in
+    logy = Logy()
+    acc = Register(BinaryData(0, length=8), name="ACC")
+    adder = Adder(Pin(BinaryData(0, length=8)), Pin(BinaryData(0, length=8)), Pin(BinaryData(0, length=8)))
+    logy.add_comp(acc, adder)
+    logy.add_pin(clk := Pin(BinaryData(0, length=1), name="GCLK"), pin_in := Pin(BinaryData(0, length=8), name="IN"))
+    logy.add_wire(Wire.direct(clk, acc.pin_clk),
+                  Wire.direct(pin_in, adder.get_pin('b').pin),
+                  Wire.direct(acc.pin_data_out, adder.get_pin('a').pin),
+                  Wire.direct(adder.get_pin('out').pin, acc.pin_data_in))
+
+    SIZE, CYCLES = 10_000, 20
+    batched = BatchedLogy(logy, clk, SIZE)
+    batched.poke(pin_in, np.arange(SIZE) % 256)
+    batched.settle()
+    start = time.perf_counter()
+    batched.step(CYCLES)
+    elapsed = time.perf_counter() - start
+    expected = (np.arange(SIZE) % 256 * CYCLES) & 0xff
+    print(f"{SIZE} x {CYCLES} cycles in {elapsed:.4f}s, {SIZE * CYCLES / elapsed:,.0f} lane-cycles/s, "
+          f"matches: {bool(np.all(acc.data.value == expected))}")
@@ -1,17 +1,23 @@
 from __future__ import annotations
-from typing import Set, Dict, Callable, List, Union
 
-from logy.core.primitive import PinEntry, Component, Wire, Mode, Pin
+import io
+import pickle
+from typing import Dict, Callable, List, Union, Optional, Tuple
+
+from logy.core.error import DesignError
+from logy.core.helpers import ELEMENT_SLOTS, PIN_SLOTS, extras_of
+from logy.core.primitive import PinEntry, Component, Wire, Mode, Pin, Element
 from logy.core.system import InternalEvent, EventHandler
 
 
 class ComponentBuilder:
     def __init__(self):
         self.__name: str = None
-        self.__pins: Set[PinEntry] = set()
+        # ordered sets, keeping the order elements were given in
+        self.__pins: Dict[PinEntry, None] = {}
         self.__pin_names: Dict[str, PinEntry] = {}
-        self.__wires: Set[Wire] = set()
-        self.__comps: Set[Component] = set()
+        self.__wires: Dict[Wire, None] = {}
+        self.__comps: Dict[Component, None] = {}
         self.__comp_names: Dict[str, Component] = {}
         self.__handlers: List[EventHandler[InternalEvent]] = []
 
@@ -21,17 +27,17 @@ class ComponentBuilder:
 
     def pin(self, pin: Pin, mode: Mode, id: str = None) -> ComponentBuilder:
         entry = PinEntry(pin, mode)
-        self.__pins.add(entry)
+        self.__pins[entry] = None
         if id:
             self.__pin_names[id] = entry
         return self
 
     def wire(self, wire: Wire) -> ComponentBuilder:
-        self.__wires.add(wire)
+        self.__wires[wire] = None
         return self
 
     def comp(self, comp: Component, id: str = None) -> ComponentBuilder:
-        self.__comps.add(comp)
+        self.__comps[comp] = None
         if id:
             self.__comp_names[id] = comp
         return self
@@ -40,20 +46,241 @@ class ComponentBuilder:
         self.__handlers.append(handler)
         return self
 
+    def template(self) -> ComponentTemplate:
+        """
+        Make a template of the component, which instances are stamped out of without constructing their elements.
+        The pins, wires and components given are its prototype, and are not changed.
+        """
+        ids = {entry: id for id, entry in self.__pin_names.items()}
+        return ComponentTemplate(self.__name, [(entry.pin, entry.mode, ids.get(entry)) for entry in self.__pins],
+                                 list(self.__wires), list(self.__comps), self.__comp_names)
+
     def build(self) -> Component:
-        comp = ComponentBuilder.BuiltComponent(self.__name, self.__pins, self.__pin_names, self.__wires, self.__comps, self.__comp_names)
-        return comp
-        pass
+        """
+        Build the component out of the pins, wires and components given.
+        """
+        template = self.template()
+        return ComponentBuilder.BuiltComponent(template, template.prototype, name=self.__name)
 
     class BuiltComponent(Component):
-        def __init__(self, name: str, pins: Set[PinEntry], pin_names: Dict[str, PinEntry], wires: Set[Wire],
-                     comps: Set[Component],
-                     comp_names: Dict[str, Component]
-                     ):
-            super().__init__(
-                [(entry.pin, entry.mode, next((name for name, e in pin_names if e == entry), None)) for entry in pins],
-                wires, comps, name=name)
-            self.__wires = set(wires)
-            self.__comp_names = comp_names.copy()
+        """
+        A component made of a template and its own elements, laid out as in the template.
+        Pin maps are those of the template, so instances only hold their elements and states.
+        """
+
+        def __init__(self, template: ComponentTemplate, elements: Tuple[Element, ...], name: str = None):
+            # not through Component.__init__, as pins are mapped by the template
+            Element.__init__(self, name)
+            self.__template = template
+            self.__elements = elements
+
+        @property
+        def template(self) -> ComponentTemplate:
+            return self.__template
+
+        @property
+        def pins(self):
+            elements = self.__elements
+            return dict.fromkeys(elements[index] for index, _, _ in self.__template.ports).keys()
+
+        @property
+        def entries(self):
+            elements = self.__elements
+            return dict.fromkeys(elements[index].entry(mode) for index, mode, _ in self.__template.ports).keys()
+
+        @property
+        def wires(self):
+            return dict.fromkeys(self.__elements[index] for index in self.__template.wires).keys()
+
+        @property
+        def comps(self):
+            return dict.fromkeys(self.__elements[index] for index in self.__template.comps).keys()
+
+        def get_comp(self, id: str) -> Component:
+            return self.__elements[self.__template.comp_names[id]]
+
+        def get_pin(self, id: str):
+            index, mode, _ = self.__template.ports[self.__template.port_names[id]]
+            return self.__elements[index].entry(mode)
+
+        def get_delay(self, pin: Pin, mode: Mode):
+            return self.table.pins.get(pin.entry(mode), (0,))[0]
+
+        def attach(self, pin: Pin, mode: Mode, id: Union[int, str] = None):
+            raise DesignError(f"{self.id}: pins of a template instance are fixed by its template")
+
+        def detach(self, arg: Union[Pin, Union[int, str]], mode: Mode = None):
+            raise DesignError(f"{self.id}: pins of a template instance are fixed by its template")
+
+
+class _Pickler(pickle.Pickler):
+    """
+    A pickler referring to elements by their index in a template, and to nested templates by identity.
+    """
+
+    def __init__(self, file, indices: Dict[int, int], templates: List[ComponentTemplate]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__indices = indices
+        self.__templates = templates
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Element):
+            index = self.__indices.get(id(obj))
+            if index is None:
+                raise DesignError(f"{obj.id} is referred to by the template, but is not part of it")
+            return index
+        if isinstance(obj, ComponentTemplate):
+            self.__templates.append(obj)
+            return 'template', len(self.__templates) - 1
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, elements: List[Element], templates: List[ComponentTemplate]):
+        super().__init__(file)
+        self.__elements = elements
+        self.__templates = templates
+
+    def persistent_load(self, pid):
+        if isinstance(pid, tuple):
+            return self.__templates[pid[1]]
+        return self.__elements[pid]
+
+
+class ComponentTemplate:
+    """
+    The structure of a built component, shared by all its instances: classes and names of its elements, ports,
+    wires with their delays and sub-components, laid out by index.
+    Attributes of the elements other than names and pin data are pickled once, and an instance is stamped out by
+    creating its elements and loading those attributes into them, referring to each other by index.
+    Only the tables above, pin data and the pin maps of the instance are shared: inner components and wires key
+    their pin maps and delays by their own pin entries, so each instance still holds its own copies of those.
+    """
+
+    def __init__(self, name: Optional[str], ports: List[Tuple[Pin, Mode, Optional[str]]], wires: List[Wire],
+                 comps: List[Component], comp_names: Dict[str, Component]):
+        self.name = name
+        elements: Dict[int, Element] = {}
+
+        def collect(element: Element):
+            if id(element) in elements:
+                return
+            elements[id(element)] = element
+            if isinstance(element, Wire):
+                for pin in element.pins:
+                    collect(pin)
+            elif isinstance(element, Component):
+                for child in (*element.pins, *element.wires, *element.comps):
+                    collect(child)
+
+        for element in (*(pin for pin, _, _ in ports), *wires, *comps):
+            collect(element)
+        indices = {key: index for index, key in enumerate(elements)}
+        self.prototype: Tuple[Element, ...] = tuple(elements.values())
+
+        # shared tables: ports as (element index, mode, id), and element indices of wires and components
+        self.ports: Tuple[Tuple[int, Mode, Optional[str]], ...] = \
+            tuple((indices[id(pin)], mode, port_id) for pin, mode, port_id in ports)
+        self.port_names: Dict[str, int] = {port_id: k for k, (_, _, port_id) in enumerate(self.ports) if port_id}
+        self.wires: Tuple[int, ...] = tuple(indices[id(wire)] for wire in wires)
+        self.comps: Tuple[int, ...] = tuple(indices[id(comp)] for comp in comps)
+        self.comp_names: Dict[str, int] = {comp_id: indices[id(comp)] for comp_id, comp in comp_names.items()}
+
+        # elements: class, name and whether it was given, and the data of pins, shared as data is immutable
+        self.__classes = tuple(type(element) for element in self.prototype)
+        self.__names = tuple((element.name, element.named) for element in self.prototype)
+        self.__data = tuple(element.data if isinstance(element, Pin) else None for element in self.prototype)
+        self.__pins = tuple(index for index, element in enumerate(self.prototype) if isinstance(element, Pin))
+        self.__templates: List[ComponentTemplate] = []
+        buffer = io.BytesIO()
+        _Pickler(buffer, indices, self.__templates).dump(
+            [(index, state) for index, element in enumerate(self.prototype)
+             if (state := extras_of(element, PIN_SLOTS if isinstance(element, Pin) else ELEMENT_SLOTS))])
+        self.__state = buffer.getvalue()
+
+    def __len__(self):
+        return len(self.__classes)
+
+    def __getstate__(self):
+        # instances do not need the prototype, which may not be part of the design they are saved with
+        return {**self.__dict__, 'prototype': None}
+
+    def instance(self, name: str = None) -> ComponentBuilder.BuiltComponent:
+        """
+        Stamp out an instance of the template, with new elements in the state the prototype had when templated.
+        """
+        new, setattr_ = object.__new__, object.__setattr__
+        elements = [new(cls) for cls in self.__classes]
+        for element, (element_name, named) in zip(elements, self.__names):
+            setattr_(element, '_Element__named', named)
+            setattr_(element, '_Element__name', element_name)
+            setattr_(element, '_Element__id', None)
+        for index in self.__pins:
+            setattr_(elements[index], '_BufferedElement__data', self.__data[index])
+            setattr_(elements[index], '_BufferedElement__validated', False)
+            setattr_(elements[index], '_Pin__entries', None)
+        for index, state in _Unpickler(io.BytesIO(self.__state), elements, self.__templates).load():
+            element = elements[index]
+            for key, value in state.items():
+                setattr_(element, key, value)
+        return ComponentBuilder.BuiltComponent(self, tuple(elements), name=name or self.name)
+
+
+if __name__ == '__main__':
+    import tracemalloc
+    from time import perf_counter
+    from logy.builtin.register import Register
+    from logy.core.main import Logy
+    from logy.core.primitive import BinaryData
+    from logy.core.system import WriteEvent
+
+    WIDTH, SLICES, STAGES = 32, 32, 4
+
+    def builder() -> ComponentBuilder:
+        """
+        A pipeline register slice: a few registers in a row, clocked together.
+        """
+        d, q, clk = Pin(BinaryData(0, length=WIDTH), name="D"), Pin(BinaryData(0, length=WIDTH), name="Q"), \
+            Pin(BinaryData(0, length=1), name="CLK")
+        regs = [Register(BinaryData(0, length=WIDTH), name=f"S{i}") for i in range(STAGES)]
+        built = ComponentBuilder().name("SLICE").pin(d, Mode.IN, "D").pin(q, Mode.OUT, "Q").pin(clk, Mode.IN, "CLK")
+        for i, reg in enumerate(regs):
+            built.comp(reg, f"S{i}")
+        built.wire(Wire.direct(d, regs[0].pin_data_in, name="DIN"))
+        for i, (src, dst) in enumerate(zip(regs, regs[1:])):
+            built.wire(Wire.direct(src.pin_data_out, dst.pin_data_in, name=f"L{i}"))
+        built.wire(Wire.direct(regs[-1].pin_data_out, q, name="QOUT"))
+        built.wire(Wire.branch(clk, [(reg.pin_clk, 0) for reg in regs], name="CLKTREE"))
+        return built
+
+    def measure(make: Callable[[], List[Component]]):
+        tracemalloc.start()
+        start = perf_counter()
+        comps = make()
+        elapsed = perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return comps, elapsed, size
 
+    built, built_time, built_size = measure(lambda: [builder().build() for _ in range(SLICES)])
+    template = builder().template()
+    stamped, stamped_time, stamped_size = measure(lambda: [template.instance() for _ in range(SLICES)])
+    print(f"{SLICES} slices of {len(template)} elements: built {built_time * 1e3:.1f}ms {built_size / 1024:.0f}KiB, "
+          f"instanced {stamped_time * 1e3:.1f}ms {stamped_size / 1024:.0f}KiB")
 
+    # instances simulate like built components
+    results = []
+    for slices in (built, stamped):
+        logy = Logy()
+        logy.add_comp(*slices)
+        logy.add_pin(clock := Pin(BinaryData(0, length=1), name="GCLK"))
+        logy.add_wire(Wire.branch(clock, [(s.get_pin('CLK').pin, 0) for s in slices], name="GCLKTREE"))
+        logy.elaborate()
+        for cycle in range(8):
+            for i, s in enumerate(slices):
+                logy.system.schedule(WriteEvent(None, s.get_pin('D').pin, cycle * 10, cycle * 100 + i))
+            logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 5, 1))
+            logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 9, 0))
+            logy.system.advance(10)
+        results.append([s.get_pin('Q').pin.data.value for s in slices])
+    print("match:", results[0] == results[1], results[1][:4])
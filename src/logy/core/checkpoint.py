@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import pickle
+from array import array
+from typing import Dict, List, Tuple, Any, Union, BinaryIO, TYPE_CHECKING
+
+from logy.core.error import DesignError
+from logy.core.helpers import path_of, resolve
+from logy.core.primitive import Data, Element
+
+if TYPE_CHECKING:
+    from logy.core.main import Logy
+
+VERSION = 2
+
+
+def digest(elements: List[Element]) -> str:
+    """
+    Get a digest of the design structure: element classes and their states, in order.
+    """
+    hasher = hashlib.sha1()
+    for element in elements:
+        hasher.update(f"{path_of(type(element))}:{','.join(element.states)};".encode())
+    return hasher.hexdigest()
+
+
+def _ints(values: List[int]):
+    """
+    Pack integers into an unsigned 64-bit array if they all fit.
+    """
+    try:
+        return array('Q', values)
+    except (OverflowError, TypeError):
+        return values
+
+
+class _Columns:
+    """
+    Element states transposed into one column per state alias.
+    Data values are split into an integer array and indices into a shared table of (class, other fields)
+    templates; other values are kept as objects and pickled with the column.
+    """
+
+    def __init__(self):
+        self.templates: Dict[Tuple[type, tuple], int] = {}
+        self.columns: Dict[str, Dict[str, list]] = {}
+
+    def add(self, row: int, state: Dict[str, Any]):
+        for alias, value in state.items():
+            if value is None:
+                continue
+            column = self.columns.get(alias)
+            if column is None:
+                column = self.columns[alias] = {'rows': [], 'values': [], 'templates': [],
+                                                'object_rows': [], 'objects': []}
+            if isinstance(value, Data):
+                number, *fields = value.__reduce__()[1]
+                column['rows'].append(row)
+                column['values'].append(number)
+                column['templates'].append(self.templates.setdefault((type(value), tuple(fields)),
+                                                                     len(self.templates)))
+            else:
+                column['object_rows'].append(row)
+                column['objects'].append(value)
+
+    def pack(self) -> Dict[str, Any]:
+        return {
+            'templates': [(path_of(cls), fields) for cls, fields in self.templates],
+            'columns': {alias: {'rows': array('I', column['rows']), 'values': _ints(column['values']),
+                                'templates': array('I', column['templates']),
+                                'object_rows': array('I', column['object_rows']), 'objects': column['objects']}
+                        for alias, column in self.columns.items()},
+        }
+
+    @staticmethod
+    def unpack(packed: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+        templates = [resolve(path)(0, *fields) for path, fields in packed['templates']]
+        states: List[Dict[str, Any]] = [{} for _ in range(size)]
+        for alias, column in packed['columns'].items():
+            for row, value, template in zip(column['rows'], column['values'], column['templates']):
+                states[row][alias] = templates[template]._with(value)
+            for row, value in zip(column['object_rows'], column['objects']):
+                states[row][alias] = value
+        return states
+
+
+def save(logy: Logy, file: Union[str, BinaryIO]):
+    """
+    Save the time, pending events, counters and every element state of a Logy.
+    """
+    elements = logy.elements
+    rows = {id(element): row for row, element in enumerate(elements)}
+
+    columns = _Columns()
+    for row, element in enumerate(elements):
+        columns.add(row, element.__getstate__())
+
+    # events: class, source row, target row, time and the remaining fields
+    types: Dict[type, int] = {}
+    event_types, sources, targets, times, payloads = array('I'), array('q'), array('q'), [], []
+    for event in logy.system.queue:
+        event_types.append(types.setdefault(type(event), len(types)))
+        sources.append(rows.get(id(event.source), -1))
+        targets.append(rows.get(id(event.target), -1))
+        times.append(event.time)
+        payloads.append(tuple(getattr(event, field.name) for field in dataclasses.fields(event)[3:]))
+
+    checkpoint = {
+        'version': VERSION,
+        'digest': digest(elements),
+        'time': logy.system.now(),
+        'counters': {name: getattr(logy.system, name) for name in logy.system.COUNTERS},
+        'states': columns.pack(),
+        'events': {'types': [path_of(cls) for cls in types], 'type': event_types, 'source': sources,
+                   'target': targets, 'time': _ints(times), 'payload': payloads},
+    }
+    if isinstance(file, str):
+        with open(file, 'wb') as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def restore(logy: Logy, file: Union[str, BinaryIO]):
+    """
+    Restore a checkpoint into a Logy holding the same design, built the same way.
+    """
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            checkpoint = pickle.load(f)
+    else:
+        checkpoint = pickle.load(file)
+    if checkpoint.get('version') != VERSION:
+        raise ValueError(f"unsupported checkpoint version {checkpoint.get('version')}")
+    elements = logy.elements
+    if checkpoint['digest'] != digest(elements):
+        raise DesignError("checkpoint was saved from a different design")
+
+    for element, state in zip(elements, _Columns.unpack(checkpoint['states'], len(elements))):
+        # states saved as None are not packed, and are reset
+        element.__setstate__({**dict.fromkeys(element.states), **state})
+
+    events = checkpoint['events']
+    types = [resolve(path) for path in events['types']]
+    logy.system.reset(checkpoint['time'], (
+        types[type](elements[source] if source >= 0 else None, elements[target] if target >= 0 else None,
+                    time, *payload)
+        for type, source, target, time, payload in zip(events['type'], events['source'], events['target'],
+                                                        events['time'], events['payload'])))
+    for name, count in checkpoint['counters'].items():
+        setattr(logy.system, name, count)
+
+
+if __name__ == '__main__':
+    import io
+    from time import perf_counter
+    from logy.bench.circuits import ripple_chain
+    from logy.bench.runner import simulate
+
+    prefix, suffix = 200, 50
+    reference = ripple_chain(256)
+    start = perf_counter()
+    simulate(reference, prefix)
+    simulated = perf_counter() - start
+    buffer = io.BytesIO()
+    reference.logy.checkpoint(buffer)
+    simulate(reference, suffix)
+
+    resumed = ripple_chain(256)
+    buffer.seek(0)
+    start = perf_counter()
+    resumed.logy.restore(buffer)
+    restored = perf_counter() - start
+    simulate(resumed, suffix)
+
+    print(f"checkpoint: {len(buffer.getvalue())} bytes, restore {restored * 1e3:.2f}ms "
+          f"vs re-simulating {prefix} cycles {simulated * 1e3:.2f}ms")
+    print("match:", [comp.data for comp in reference.logy.ordered_comps] ==
+          [comp.data for comp in resumed.logy.ordered_comps]
+          and reference.logy.system.now() == resumed.logy.system.now())
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Dict, List, Set, Tuple, Callable, Any
+
+from logy.builtin.clock import SyncComponent
+from logy.core.error import DesignError
+from logy.core.main import Logy
+from logy.core.primitive import PinBehavior, WireBehavior, ComponentBehavior, Pin, Wire, Component, Mode, Data, D, \
+    MultiWire
+
+
+class CompiledLogy:
+    """
+    A cycle-based engine for synchronous designs.
+    The netlist of a Logy is elaborated once: pins joined by wires become nets, combinational components are
+    levelized between sync components, and a straight-line settle function is generated for them.
+    Each clock cycle then costs a few function calls instead of events. Delays are ignored.
+    """
+
+    def __init__(self, logy: Logy, clock: Pin):
+        self.__logy = logy
+        self.__clock = clock
+        self.__pin_behavior = CompiledLogy.PinBehavior()
+        self.__wire_behavior = CompiledLogy.WireBehavior()
+        self.__component_behavior = CompiledLogy.ComponentBehavior()
+
+        self.__nets: Dict[Pin, int] = {}
+        self.__values: List[D] = []
+        # sync component -> *(alias, net) of inputs with the clock last, *(alias, net, template) of outputs
+        self.__syncs: List[Tuple[Component, List[Tuple[str, int]], List[Tuple[str, int, D]]]] = []
+        self.__settle: Callable[[List[D]], None] = None
+        self.__gated = False
+        self.source = ''
+        self.elaborate()
+
+    @property
+    def logy(self):
+        return self.__logy
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    def net(self, pin: Pin) -> int:
+        return self.__nets[pin]
+
+    def _data(self, pin: Pin) -> D:
+        """
+        Get the data of the pin as held in net values, which also serves as the template to write the net.
+        """
+        return pin.data
+
+    """ elaboration """
+
+    def elaborate(self):
+        pins = set(self.logy.pins)
+        for comp in self.logy.comps:
+            pins.update(comp.pins)
+        for wire in self.logy.wires:
+            if isinstance(wire, MultiWire):
+                # nets carry whole values, and a bus joins slices of its pins
+                raise DesignError(f"{wire.full_name}: bus wires are not supported by the compiled engine")
+            pins.update(wire.pins)
+        self.__nets = self.__join(pins)
+        self.__values = [None] * (max(self.__nets.values(), default=-1) + 1)
+        driven = {entry.pin for comp in self.logy.comps for entry in comp.entries if entry.mode is Mode.OUT}
+        for pin, net in self.__nets.items():
+            if self.__values[net] is None or pin in driven:
+                self.__values[net] = self._data(pin)
+        clock = self.__nets[self.__clock]
+
+        combs: List[Component] = []
+        self.__syncs = []
+        for comp in sorted(self.logy.comps, key=lambda c: c.full_name):
+            props = type(comp).mapped_properties()
+            if not props:
+                continue
+            if isinstance(comp, SyncComponent):
+                ins = [(alias, self.__nets[comp.get_pin(prop.id).pin]) for alias, prop in props.items()
+                       if prop.mode is Mode.IN]
+                ins.sort(key=lambda it: it[1] == clock)
+                outs = [(alias, self.__nets[pin], self._data(pin)) for alias, prop in props.items()
+                        if prop.mode is Mode.OUT and prop.eval for pin in [comp.get_pin(prop.id).pin]]
+                self.__syncs.append((comp, ins, outs))
+            else:
+                combs.append(comp)
+
+        levels = self.__levelize(combs)
+        self.__gated = any(self.__nets[comp.get_pin(prop.id).pin] == clock
+                           for comp in combs for prop in type(comp).mapped_properties().values()
+                           if prop.mode is Mode.IN)
+        self.__settle = self.__generate(levels)
+
+    def __join(self, pins: Set[Pin]) -> Dict[Pin, int]:
+        parent: Dict[Pin, Pin] = {pin: pin for pin in pins}
+
+        def find(pin: Pin) -> Pin:
+            while parent[pin] is not pin:
+                parent[pin] = parent[parent[pin]]
+                pin = parent[pin]
+            return pin
+
+        for wire in self.logy.wires:
+            root, *others = [find(pin) for pin in wire.pins]
+            for other in others:
+                parent[find(other)] = find(root)
+
+        nets: Dict[Pin, int] = {}
+        roots: Dict[Pin, int] = {}
+        for pin in sorted(pins, key=lambda p: p.id):
+            nets[pin] = roots.setdefault(find(pin), len(roots))
+        return nets
+
+    def __levelize(self, combs: List[Component]) -> List[List[Component]]:
+        drivers: Dict[int, Component] = {}
+        for comp in combs:
+            for entry in comp.entries:
+                if entry.mode is Mode.OUT:
+                    net = self.__nets[entry.pin]
+                    if net in drivers:
+                        raise DesignError(f"net of {entry.pin.full_name} is driven by both "
+                                          f"{drivers[net].full_name} and {comp.full_name}")
+                    drivers[net] = comp
+        deps: Dict[Component, Set[Component]] = {
+            comp: {drivers[self.__nets[entry.pin]] for entry in comp.entries
+                   if entry.mode is Mode.IN and self.__nets[entry.pin] in drivers} - {comp}
+            for comp in combs}
+
+        users: Dict[Component, List[Component]] = {comp: [] for comp in combs}
+        for comp, srcs in deps.items():
+            for src in srcs:
+                users[src].append(comp)
+        pending = {comp: len(srcs) for comp, srcs in deps.items()}
+
+        levels: List[List[Component]] = []
+        level = [comp for comp in combs if not pending[comp]]
+        while level:
+            levels.append(level)
+            following = []
+            for comp in level:
+                for user in users[comp]:
+                    pending[user] -= 1
+                    if not pending[user]:
+                        following.append(user)
+            level = following
+        if sum(map(len, levels)) < len(combs):
+            raise DesignError("combinational loop through "
+                              + ", ".join(comp.full_name for comp, count in pending.items() if count))
+        return levels
+
+    def __generate(self, levels: List[List[Component]]) -> Callable[[List[D]], None]:
+        namespace: Dict[str, Any] = {'_write': _write}
+        lines = ['def settle(v):']
+
+        def bind(prefix: str, obj) -> str:
+            name = f"{prefix}{len(namespace)}"
+            namespace[name] = obj
+            return name
+
+        for depth, level in enumerate(levels):
+            lines.append(f"    # level {depth}")
+            for comp in level:
+                c = bind('c', comp)
+                props = type(comp).mapped_properties()
+                local: Dict[str, str] = {}
+                for alias, prop in props.items():
+                    if prop.mode is Mode.IN:
+                        local[alias] = f"{c}_{alias}"
+                        lines.append(f"    {local[alias]} = {bind('f', prop.func)}({c}, "
+                                     f"v[{self.__nets[comp.get_pin(prop.id).pin]}])")
+                outs = [(alias, prop) for alias, prop in props.items() if prop.mode is Mode.OUT and prop.eval]
+                while outs:
+                    ready = [(alias, prop) for alias, prop in outs
+                             if not any(src in props and src not in local for src in prop.srcs)]
+                    if not ready:
+                        raise DesignError(f"{comp.full_name}: mapped outputs depend on each other")
+                    for alias, prop in ready:
+                        args = ', '.join(local.get(src) or f"getattr({c}, {src!r})" for src in prop.srcs)
+                        pin = comp.get_pin(prop.id).pin
+                        local[alias] = f"{c}_{alias}"
+                        lines.append(f"    {local[alias]} = {bind('e', prop.eval)}({args})")
+                        lines.append(f"    v[{self.__nets[pin]}] = "
+                                     f"_write({bind('t', self._data(pin))}, {local[alias]})")
+                        outs.remove((alias, prop))
+        if len(lines) == 1:
+            lines.append("    pass")
+
+        self.source = '\n'.join(lines) + '\n'
+        exec(compile(self.source, f"<compiled {len(namespace)}>", 'exec'), namespace)
+        return namespace['settle']
+
+    """ simulation """
+
+    def peek(self, pin: Pin) -> D:
+        return self.__values[self.__nets[pin]]
+
+    def poke(self, pin: Pin, value):
+        net = self.__nets[pin]
+        self.__values[net] = _write(self.__values[net], value)
+
+    def settle(self):
+        self.__settle(self.__values)
+
+    def step(self, cycles: int = 1):
+        """
+        Run clock cycles, each of a rising and a falling edge of the clock.
+        """
+        with self._installed():
+            for _ in range(cycles):
+                self.__edge(1)
+                self.__edge(0)
+
+    def __edge(self, level: int):
+        values = self.__values
+        clock = self.__nets[self.__clock]
+        values[clock] = values[clock].of(level)
+        if self.__gated:
+            self.__settle(values)
+        dirty = self.__component_behavior.dirty
+        for comp, ins, _ in self.__syncs:
+            for alias, net in ins:
+                comp.__setattr__(alias, values[net])
+        for comp, _, outs in self.__syncs:
+            if comp in dirty:
+                for alias, net, template in outs:
+                    values[net] = _write(template, comp.__getattribute__(alias))
+        dirty.clear()
+        self.__settle(values)
+
+    def sync(self):
+        """
+        Write net values back to the pins.
+        """
+        with self._installed():
+            for pin, net in self.__nets.items():
+                pin.write(self.__values[net])
+
+    @contextmanager
+    def _installed(self):
+        behaviors = Pin.behavior, Wire.behavior, Component.behavior
+        Pin.behavior = lambda pin: self.__pin_behavior
+        Wire.behavior = lambda wire: self.__wire_behavior
+        Component.behavior = lambda comp: self.__component_behavior
+        try:
+            yield
+        finally:
+            Pin.behavior, Wire.behavior, Component.behavior = behaviors
+
+    class PinBehavior(PinBehavior):
+        def on_data_update(self, pin: Pin, prev_state):
+            return
+
+    class WireBehavior(WireBehavior):
+        def on_pin_write(self, wire: Wire, pin: Pin, data):
+            return
+
+    class ComponentBehavior(ComponentBehavior):
+        def __init__(self):
+            self.dirty: Set[Component] = set()
+
+        def on_pin_update(self, comp: Component, pin: Pin, prev_state):
+            return
+
+        def on_comp_update(self, comp: Component, subcomp: Component, prev_state):
+            return
+
+        def on_state_update(self, comp: Component, state, prev_state):
+            self.dirty.add(comp)
+
+        def write_pin(self, comp: Component, pin: Pin[D], data: D):
+            return
+
+
+def _write(template: D, value) -> D:
+    return template.of(value.value if isinstance(value, Data) else value)
+
+
+if __name__ == '__main__':
+    import time
+    from logy.builtin.register import Register
+    from logy.core.primitive.data import BinaryData
+    from logy.core.system import WriteEvent
+
+    class Adder(Component):
+        def __init__(self, pin_a: Pin, pin_b: Pin, pin_out: Pin, name: str = None):
+            super().__init__([(pin_a, Mode.IN, 'a'), (pin_b, Mode.IN, 'b'), (pin_out, Mode.OUT, 'out')], name=name)
+            self.A, self.B, self.Out
+
+        @Component.mapped('a', Mode.IN)
+        def A(self, data: D) -> int:
+            return data.value
+
+        @Component.mapped('b', Mode.IN)
+        def B(self, data: D) -> int:
+            return data.value
+
+        @Component.mapped('out', Mode.OUT, srcs=("A", "B"), eval=lambda a, b: (a + b) & 0xff)
+        def Out(self, value: int) -> int:
+            return value
+
+    def design(size: int):
+        logy = Logy()
+        regs = [Register(BinaryData(0, length=8), name=str(i)) for i in range(size)]
+        adders = [Adder(Pin(BinaryData(0, length=8)), Pin(BinaryData(0, length=8)), Pin(BinaryData(0, length=8)))
+                  for _ in range(size)]
+        logy.add_comp(*regs, *adders)
+        logy.add_pin(clk := Pin(BinaryData(0, length=1), name="GCLK"), inc := Pin(BinaryData(0, length=8), name="INC"))
+        logy.add_wire(Wire.branch(clk, [(reg.pin_clk, 0) for reg in regs]),
+                      Wire.branch(inc, [(adder.get_pin('b').pin, 0) for adder in adders]))
+        for i, (reg, adder) in enumerate(zip(regs, adders)):
+            logy.add_wire(Wire.direct(reg.pin_data_out, adder.get_pin('a').pin),
+                          Wire.direct(adder.get_pin('out').pin, regs[(i + 1) % size].pin_data_in))
+        return logy, regs, clk, inc
+
+    SIZE, CYCLES = 8, 50
+
+    logy, regs, clk, inc = design(SIZE)
+    logy.system.schedule(WriteEvent(None, inc, 0, 1))
+    for cycle in range(CYCLES):
+        logy.system.schedule(WriteEvent(None, clk, cycle * 10 + 5, 1))
+        logy.system.schedule(WriteEvent(None, clk, cycle * 10 + 7, 0))
+    start = time.perf_counter()
+    logy.system.advance(CYCLES * 10)
+    print(f"event engine:    {time.perf_counter() - start:.4f}s", [reg.data.value for reg in regs])
+
+    logy, regs, clk, inc = design(SIZE)
+    compiled = CompiledLogy(logy, clk)
+    start = time.perf_counter()
+    compiled.poke(inc, 1)
+    compiled.settle()
+    compiled.step(CYCLES)
+    print(f"compiled engine: {time.perf_counter() - start:.4f}s", [reg.data.value for reg in regs])
@@ -3,4 +3,8 @@ class NonDeterministicError(Exception):
 
 
 class DesignError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class SchedulerOverflowError(Exception):
+    pass
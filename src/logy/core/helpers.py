@@ -1,2 +1,53 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List, Tuple
+
+# slots of elements kept in the element and wire tables of netlists and templates rather than pickled
+ELEMENT_SLOTS = ('_Element__named', '_Element__name', '_Element__id')
+PIN_SLOTS = (*ELEMENT_SLOTS, '_BufferedElement__data', '_BufferedElement__validated', '_Pin__entries')
+WIRE_SLOTS = (*ELEMENT_SLOTS, '_Wire__delay')
+
+
 def demangled(cls, name: str):
     return name if not name.startswith('__') else '_' + cls.__name__ + name
+
+
+def path_of(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve(path: str) -> type:
+    module, qualname = path.split(':')
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def slots(cls: type) -> List[str]:
+    """
+    Get the names of the slots of a class and its bases, mangled as stored.
+    """
+    names = []
+    for clz in cls.__mro__:
+        declared = vars(clz).get('__slots__', ())
+        for name in (declared,) if isinstance(declared, str) else declared:
+            if name in ('__dict__', '__weakref__'):
+                continue
+            if name.startswith('__') and not name.endswith('__'):
+                name = f"_{clz.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return names
+
+
+def extras_of(element, handled: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Get the attributes of an element not kept in the tables.
+    """
+    extras = {name: getattr(element, name) for name in slots(type(element))
+              if name not in handled and hasattr(element, name)}
+    extras.update(getattr(element, '__dict__', {}))
+    if '_Component__table' in extras:
+        extras['_Component__table'] = None
+    return extras
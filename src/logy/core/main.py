@@ -1,31 +1,51 @@
 from __future__ import annotations
 
-from queue import PriorityQueue
-from typing import Set, Callable, Union, Tuple, List
+from time import perf_counter
+from typing import Set, Callable, Union, Tuple, List, Dict, Optional, Iterable, BinaryIO
 
-from logy.core.primitive import PinBehavior, WireBehavior, ComponentBehavior, Pin, Wire, Component, PinEntry, Mode
+from logy.core import checkpoint, validation, netlist, run
+from logy.core.error import DesignError
+from logy.core.primitive import PinBehavior, WireBehavior, ComponentBehavior, Pin, Wire, Component, PinEntry, Mode, \
+    Element, Registry
 from logy.core.system import InternalEvent, EventHandler, Event, WriteEvent, \
-    EventHandlerImpl, EventSystem
+    EventHandlerImpl, EventSystem, EventQueue, Stimulus
 from logy.core.system.handler import handler
+from logy.core.trace import TraceSink
+from logy.core.profile import Profiler
 
 
 class Logy:
 
     def __init__(self):
-        self.__pins: Set[Pin] = set()
-        self.__wires: Set[Wire] = set()
-        self.__comps: Set[Component] = set()
+        # ordered sets, keeping the order elements were added in
+        self.__pins: Dict[Pin, None] = {}
+        self.__wires: Dict[Wire, None] = {}
+        self.__comps: Dict[Component, None] = {}
+        # fanout: pin -> (sink wires with delay, sink components with delay)
+        self.__fanout: Dict[Pin, Tuple[List[Tuple[Wire, int]], List[Tuple[Component, int]]]] = {}
+        # elements of the simulation by hierarchical id
+        self.registry = Registry()
         self.__pin_behavior = Logy.PinBehavior(self)
         self.__wire_behavior = Logy.WireBehavior(self)
         self.__component_behavior = Logy.ComponentBehavior(self)
-        Pin.behavior = lambda pin: self.__pin_behavior
-        Wire.behavior = lambda wire: self.__wire_behavior
-        Component.behavior = lambda comp: self.__component_behavior
-
-        self.system = Logy.EventSystem()
-        self.system.attach(Logy.write_handler)
-        self.system.attach(Logy.pin_to_state_sync_handler)
-        self.system.attach(Logy.state_to_pin_sync_handler)
+        self.__installed: Dict[type, Callable] = {Pin: lambda pin: self.__pin_behavior,
+                                                  Wire: lambda wire: self.__wire_behavior,
+                                                  Component: lambda comp: self.__component_behavior}
+        for cls, behavior in self.__installed.items():
+            cls.behavior = behavior
+        self.__elaborated = False
+
+        self.system: Logy.EventSystem = None
+        self.use(Logy.EventSystem())
+
+    def use(self, system: Logy.EventSystem):
+        """
+        Replace the event system, attaching the handlers of the design to it.
+        """
+        system.attach(Logy.write_handler)
+        system.attach(Logy.pin_to_state_sync_handler)
+        system.attach(Logy.state_to_pin_sync_handler)
+        self.system = system
 
     @staticmethod
     @handler(WriteEvent)
@@ -40,9 +60,68 @@ class Logy:
     @staticmethod
     @handler(InternalEvent, sources=[Component], targets=[Pin])
     def state_to_pin_sync_handler(event: InternalEvent):
-        data = next(event.source.__getattribute__(alias) for id, alias in event.source.pin_mapped.items() if (entry := event.source.get_pin(id)).pin is event.target and entry.mode is Mode.OUT)
-        event.source.write_pin(event.target, data)
+        comp, pin = event.source, event.target
+        comp.write_pin(pin, comp.__getattribute__(comp.table.pins[pin.entry(Mode.OUT)][1]))
+
+    def profile(self, profiler: Optional[Profiler]):
+        """
+        Enable profiling of the event system and component behaviors, or disable it with None.
+        """
+        self.system.profiler = profiler
+        behavior = Profiler.ComponentBehavior(profiler, self.__component_behavior) if profiler \
+            else self.__component_behavior
+        Component.behavior = self.__installed[Component] = lambda comp: behavior
+
+    def close(self):
+        """
+        Tear down the simulation: forget its elements and pending events, and uninstall its behaviors.
+        Elements are then only kept alive by outside references.
+        """
+        for cls, behavior in self.__installed.items():
+            if cls.__dict__.get('behavior') is behavior:
+                del cls.behavior
+        self.__installed.clear()
+        self.registry.clear()
+        self.__pins.clear()
+        self.__wires.clear()
+        self.__comps.clear()
+        self.__fanout.clear()
+        self.__elaborated = False
+        self.system.reset(self.system.now())
+
+    def validate(self):
+        """
+        Check the design rules over the netlist, raising an error which reports every violation.
+        """
+        validation.validate(self)
+
+    def elaborate(self):
+        """
+        Validate and freeze the netlist, and build the pin tables of every component, so that events are handled
+        by direct lookups. Elements cannot be added afterwards.
+        """
+        self.validate()
+        for pin in self.__pins:
+            pin.mark_validated()
+        for comp in self.__comps:
+            comp.elaborate()
+        for pin, (wires, comps) in self.__fanout.items():
+            self.__fanout[pin] = (tuple(wires), tuple(comps))
+        self.__elaborated = True
+
+    @property
+    def elaborated(self) -> bool:
+        return self.__elaborated
+
+    def __check_open(self):
+        if self.__elaborated:
+            raise DesignError("the netlist is frozen once elaborated")
 
+    def find(self, id: str) -> Element:
+        """
+        Find an element of the simulation by its id.
+        """
+        return self.registry.find(id)
 
     @property
     def pins(self):
@@ -56,58 +135,459 @@ class Logy:
     def comps(self):
         return set(self.__comps)
 
+    @property
+    def ordered_pins(self) -> List[Pin]:
+        """
+        Get all pins in the order they were added.
+        """
+        return list(self.__pins)
+
+    @property
+    def ordered_wires(self) -> List[Wire]:
+        """
+        Get all wires in the order they were added.
+        """
+        return list(self.__wires)
+
+    @property
+    def ordered_comps(self) -> List[Component]:
+        """
+        Get all components in the order they were added.
+        """
+        return list(self.__comps)
+
+    @property
+    def elements(self) -> List[Element]:
+        """
+        Get all components, wires and pins in the order they were added.
+        """
+        return [*self.__comps, *self.__wires, *self.__pins]
+
+    def checkpoint(self, file: Union[str, BinaryIO]):
+        """
+        Save the time, pending events and every element state to a file.
+        """
+        checkpoint.save(self, file)
+
+    def restore(self, file: Union[str, BinaryIO]):
+        """
+        Restore a checkpoint saved from the same design, built the same way.
+        """
+        checkpoint.restore(self, file)
+
+    def export(self, file: Union[str, BinaryIO]):
+        """
+        Export the elaborated netlist to a file, which load() builds a Logy from without constructing the design.
+        """
+        netlist.save(self, file)
+
+    @staticmethod
+    def load(file: Union[str, bytes]) -> Logy:
+        """
+        Load a Logy from an exported netlist.
+        """
+        return netlist.load(file)
+
+    def _assemble(self, comps: List[Component], wires: List[Wire], pins: List[Pin],
+                  fanout: Dict[Pin, Tuple[Tuple[Tuple[Wire, int], ...], Tuple[Tuple[Component, int], ...]]]):
+        """
+        Fill an empty Logy with the elements of a loaded netlist, identified and connected already, and freeze it.
+        """
+        if self.__comps or self.__wires or self.__pins:
+            raise DesignError("a netlist can only be loaded into an empty Logy")
+        self.__comps.update(dict.fromkeys(comps))
+        self.__wires.update(dict.fromkeys(wires))
+        self.__pins.update(dict.fromkeys(pins))
+        self.__fanout.update(fanout)
+        self.registry.restore([*comps, *wires, *pins])
+        self.__elaborated = True
+
+    def fanout(self, pin: Pin) -> Tuple[List[Tuple[Wire, int]], List[Tuple[Component, int]]]:
+        """
+        Get wires and components driven by the pin, each with its input delay.
+        """
+        return self.__fanout.get(pin, ((), ()))
+
+    def __sinks(self, pin: Pin):
+        if pin not in self.__fanout:
+            self.__fanout[pin] = ([], [])
+        return self.__fanout[pin]
+
+    def __register(self, comp: Component, parent: Optional[Component] = None):
+        self.registry.register(comp, parent)
+        for pin in comp.pins:
+            self.registry.register(pin, comp)
+        for wire in comp.wires:
+            self.registry.register(wire, comp)
+        for sub in comp.comps:
+            self.__register(sub, comp)
+
     def add_pin(self, *pins: Pin):
+        self.__check_open()
         for pin in pins:
-            self.__pins.add(pin)
+            self.registry.register(pin)
+            self.__pins[pin] = None
+            self.__sinks(pin)
 
     def add_wire(self, *wires: Wire):
+        self.__check_open()
         for wire in wires:
-            self.__wires.add(wire)
+            if wire in self.__wires:
+                continue
+            self.registry.register(wire)
+            self.__wires[wire] = None
+            for entry in wire.entries:
+                if entry.mode is Mode.IN:
+                    self.__sinks(entry.pin)[0].append((wire, wire.get_delay(entry.pin, Mode.IN)))
 
     def add_comp(self, *comps: Component):
+        self.__check_open()
         for comp in comps:
-            self.__comps.add(comp)
+            if comp in self.__comps:
+                continue
+            self.__register(comp)
+            self.__comps[comp] = None
+            for entry in comp.entries:
+                if entry.mode is Mode.IN:
+                    self.__sinks(entry.pin)[1].append((comp, comp.table.pins[entry][0]))
             self.add_comp(*comp.comps)
             self.add_wire(*comp.wires)
             self.add_pin(*comp.pins)
 
     class EventSystem(EventSystem):
-        MAX_SIZE: int = 1024
-
-        def __init__(self):
+        MAX_SIZE: Optional[int] = None
+        # counters of executed and avoided events, saved by checkpoints and summed over partitions
+        COUNTERS = ('executed', 'cancelled', 'dropped', 'deltas')
+
+        def __init__(self, capacity: Optional[int] = None, inertial: Optional[int] = None, delta: bool = False):
+            """
+            :param capacity: maximum number of pending events, MAX_SIZE if None
+            :param inertial: window of the inertial delay model, transport delays if None
+            :param delta: whether to evaluate components once per delta cycle
+            """
             self.__time = 0
             self.__handlers: List[EventHandler] = []
-            self.__queue: PriorityQueue[Event] = PriorityQueue(maxsize=Logy.EventSystem.MAX_SIZE)
+            # dispatch: (event type, source type, target type, watched source id, watched target id)
+            #           -> *(handler, per-event check)
+            self.__dispatch: Dict[Tuple, List[Tuple[EventHandler, Optional[Callable[[Event], bool]]]]] = {}
+            self.__watched: Set[int] = set()
+            # sink receiving value changes of pins, None when tracing is disabled
+            self.sink: Optional[TraceSink] = None
+            # profiler of scheduled and executed events, None when profiling is disabled
+            self.profiler: Optional[Profiler] = None
+            # number of events executed so far
+            self.executed = 0
+            # inertial delay window: a write to a target supersedes its pending writes scheduled within the window
+            # before it, and writes which would not change a pin are dropped
+            self.inertial: Optional[int] = inertial
+            # number of writes cancelled by a later one, and of writes dropped as they would not change their pin
+            self.cancelled = 0
+            self.dropped = 0
+            # pending events by target, or by source and target for wires, while the inertial model is enabled
+            self.__pending: Dict[Union[Element, Tuple[Element, Wire]], List[Event]] = {}
+            # delta cycles: events at a time are executed in deltas, each applying all of its pin writes first and
+            # then evaluating every component whose inputs changed once, with the updated pins by previous state
+            self.delta = delta
+            self.deltas = 0
+            self.__updates: Optional[Dict[Component, Dict[Pin, object]]] = None
+            self.__queue: EventQueue[Event] = EventQueue(capacity or Logy.EventSystem.MAX_SIZE)
 
         @property
         def queue(self):
-            return list(self.__queue.queue)
+            return list(self.__queue)
 
         def peek_queue(self):
-            return self.__queue.queue[0]
+            return self.__queue.peek()
 
         def now(self) -> int:
             return self.__time
 
+        def next_time(self) -> Optional[int]:
+            """
+            Get the time of the earliest pending event, None if there is none.
+            """
+            return self.__queue.peek_time()
+
+        @property
+        def avoided(self) -> int:
+            """
+            Get the number of events avoided by the inertial delay model.
+            """
+            return self.cancelled + self.dropped
+
+        def defer(self, comp: Component, pin: Pin, prev_state) -> bool:
+            """
+            Defer a pin update of the component to the end of the current delta.
+            Return False if not executing a delta, so that the update should be handled right away.
+            """
+            if self.__updates is None:
+                return False
+            pins = self.__updates.get(comp)
+            if pins is None:
+                pins = self.__updates[comp] = {}
+            if pin not in pins:
+                pins[pin] = prev_state
+            return True
+
         def advance(self, time_diff: int):
-            while not self.__queue.empty():
-                if self.peek_queue().time > self.__time + time_diff:
-                    break
-                event = self.__queue.get()
-                self.execute(event)
-            self.__time += time_diff
+            if self.delta:
+                return self.__advance_delta(time_diff)
+            until = self.__time + time_diff
+            queue = self.__queue
+            while queue and queue.peek_time() <= until:
+                self.__step()
+            self.__time = until
+
+        def __step(self):
+            # execute the next event, unless dropped by the inertial model
+            event = self.__queue.pop()
+            if isinstance(event.source, Stimulus):
+                self.__pull(event.source)
+            # events scheduled while executing are relative to the event's time
+            if event.time > self.__time:
+                self.__time = event.time
+            if self.__pending and not isinstance(event.target, Component) and self.__done(event):
+                self.dropped += 1
+                return
+            self.execute(event)
+            self.executed += 1
+
+        def __advance_delta(self, time_diff: int):
+            until = self.__time + time_diff
+            queue = self.__queue
+            while queue and queue.peek_time() <= until:
+                self.propagate(queue.peek_time())
+                self.evaluate()
+            self.__time = until
+
+        def propagate(self, time: int, limit: Optional[int] = None):
+            """
+            Execute the events of a delta at the time, deferring pin updates of components until evaluate().
+            Events scheduled at the same time while executing join the delta, and so do events scheduled before
+            calling it again.
+            :param limit: number of executed events to stop at, the rest of the delta being left in the queue
+            """
+            if time > self.__time:
+                self.__time = time
+            if self.__updates is None:
+                self.__updates = {}
+            queue = self.__queue
+            try:
+                while queue and queue.peek_time() == time and (limit is None or self.executed < limit):
+                    self.__step()
+            except BaseException:
+                self.__updates = None
+                raise
+
+        def evaluate(self):
+            """
+            End the current delta, evaluating once each component whose inputs changed in it.
+            Component outputs are scheduled by the evaluations, and make the next delta.
+            """
+            updates, self.__updates = self.__updates, None
+            if updates is None:
+                return
+            for comp, pins in updates.items():
+                comp.on_pins_update(pins)
+            self.deltas += 1
+
+        def run_until(self, predicate: Optional[Callable[[], bool]] = None, watch: Iterable[Element] = (),
+                      clock: Optional[Pin] = None, edges: Optional[int] = None, rising: Optional[bool] = True,
+                      duration: Optional[int] = None, events: Optional[int] = None,
+                      seconds: Optional[float] = None) -> run.Run:
+            """
+            Run until a condition is met, or the queue is empty.
+            A predicate and clock edges stop the run once the events of the time they are met at are executed.
+            Other limits stop it right away, and it can be resumed with the events left in the queue.
+            :param predicate: a breakpoint, checked whenever an event reached a watched element, or every event
+            :param watch: pins and components whose changes the predicate depends on
+            :param clock: a clock pin, whose edges are counted
+            :param edges: number of edges of the clock to run for
+            :param rising: whether to count rising edges, falling ones, or both if None
+            :param duration: simulated time to run for at most; unless stopped by another condition, the current
+                             time is then advanced by it, whether it was reached or the queue became empty
+            :param events: number of events to execute at most
+            :param seconds: wall-clock time to run for at most, checked every 256 events, or every delta
+            """
+            if edges is not None and clock is None:
+                raise ValueError("counting edges needs a clock pin")
+            start, executed = perf_counter(), self.executed
+            until = None if duration is None else self.__time + duration
+            limit = None if events is None else executed + events
+            watcher = run.Watch(watch) if predicate is not None and watch else None
+            counter = run.EdgeCounter(clock, rising) if clock is not None else None
+            for h in (watcher, counter):
+                if h is not None:
+                    self.attach(h)
+            queue, stop, reason, steps = self.__queue, None, run.QUIESCENT, 0
+            deadline = None if seconds is None else start + seconds
+            try:
+                while queue:
+                    time = queue.peek_time()
+                    if stop is not None and time > self.__time:
+                        break
+                    if until is not None and time > until:
+                        self.__time, reason = until, run.TIME
+                        break
+                    if limit is not None and self.executed >= limit:
+                        reason = run.EVENTS
+                        break
+                    if deadline is not None and (self.delta or not steps & 0xff) and perf_counter() >= deadline:
+                        reason = run.WALL_CLOCK
+                        break
+                    steps += 1
+                    if self.delta:
+                        self.propagate(time, limit)
+                        # a delta cut by the event budget is evaluated once resumed and propagated to its end
+                        if limit is None or self.executed < limit or queue.peek_time() != time:
+                            self.evaluate()
+                    else:
+                        self.__step()
+                    if stop is None:
+                        if counter is not None and edges is not None and counter.edges >= edges:
+                            stop = run.EDGES
+                        elif predicate is not None and (watcher is None or watcher.touched):
+                            if watcher is not None:
+                                watcher.touched = False
+                            if predicate():
+                                stop = run.PREDICATE
+                else:
+                    if until is not None and stop is None:
+                        self.__time = until
+            finally:
+                for h in (watcher, counter):
+                    if h is not None:
+                        self.detach(h)
+            return run.Run(stop or reason, self.__time, self.executed - executed,
+                           counter.edges if counter is not None else 0, perf_counter() - start)
+
+        def run_cycles(self, clock: Pin, cycles: int, **limits) -> run.Run:
+            """
+            Run for a number of rising edges of the clock, with the events of the last edge's time.
+            Other limits of run_until() may be given.
+            """
+            return self.run_until(clock=clock, edges=cycles, **limits)
+
+        def reset(self, time: int = 0, events: Iterable[Event] = ()):
+            """
+            Reset the current time and replace pending events, in the order they should be executed.
+            """
+            self.__time = time
+            self.__queue.clear()
+            self.__pending.clear()
+            for event in events:
+                self.__queue.push(event)
+                if self.inertial is not None and not isinstance(event.target, Component):
+                    self.__pending.setdefault(self.__key(event), []).append(event)
 
         def schedule(self, event: Event):
-            self.__queue.put(event)
+            if self.inertial is not None:
+                self.__supersede(event)
+            self.__queue.push(event)
+            if self.profiler is not None:
+                self.profiler.on_schedule(event)
+
+        def stream(self, *sources: Union[Stimulus, Iterable[Tuple[int, Pin, object]]]):
+            """
+            Drive pins from sources of changes as (time, pin, value), pulled lazily: only the next change of each
+            source is in the queue, so that the memory used does not depend on the length of the sources.
+            """
+            for source in sources:
+                self.__pull(Stimulus.of(source))
+
+        def __pull(self, source: Stimulus):
+            # schedule the next change of the source, if any
+            event = source.next()
+            if event is not None:
+                self.schedule(event)
+
+        def __supersede(self, event: Event):
+            """
+            Cancel pending writes to the event's target within the inertial window, and index the event.
+            Whether a write would change its pin is only known once it executes, as writes scheduled later may
+            happen earlier; __done() drops it then.
+            """
+            if isinstance(event.target, Component):
+                # pin to component syncs neither write pins nor can be superseded
+                return
+            key = self.__key(event)
+            pending = self.__pending.get(key)
+            if isinstance(event, WriteEvent):
+                if pending:
+                    start, end = event.time - self.inertial, event.time
+                    for superseded in [e for e in pending if isinstance(e, WriteEvent) and start <= e.time <= end]:
+                        self.__queue.cancel(superseded)
+                        self.__remove(pending, superseded)
+                        self.cancelled += 1
+                        if isinstance(superseded.source, Stimulus):
+                            self.__pull(superseded.source)
+            if pending is None:
+                pending = self.__pending[key] = []
+            pending.append(event)
+
+        def __done(self, event: Event) -> bool:
+            """
+            Remove an event leaving the queue from the pending index.
+            Return True if it is a write which would not change its pin anymore, and should be dropped.
+            """
+            target, key = event.target, self.__key(event)
+            pending = self.__pending.get(key)
+            if pending is not None:
+                self.__remove(pending, event)
+                if not pending:
+                    del self.__pending[key]
+            return self.inertial is not None and isinstance(event, WriteEvent) and isinstance(target, Pin) \
+                and target.data == event.data
+
+        @staticmethod
+        def __key(event: Event):
+            # writes of different input pins of a wire drive different slices or drivers, and never supersede
+            # each other
+            return (event.source, event.target) if isinstance(event.target, Wire) else event.target
+
+        @staticmethod
+        def __remove(pending: List[Event], event: Event):
+            # by identity, as events compare equal by value
+            for i, e in enumerate(pending):
+                if e is event:
+                    del pending[i]
+                    return
 
         def execute(self, event: Event):
-            for handler in self.__handlers:
-                if handler.matches(event):
+            if self.profiler is not None:
+                return self.__execute_profiled(event)
+            for handler, refine in self.dispatch(event):
+                if refine is None or refine(event):
                     handler.handle(event)
-            print(f"executed {event}")
+
+        def __execute_profiled(self, event: Event):
+            profiler = self.profiler
+            profiler.on_execute(event, len(self.__queue))
+            for handler, refine in self.dispatch(event):
+                if refine is None or refine(event):
+                    start = perf_counter()
+                    try:
+                        handler.handle(event)
+                    finally:
+                        profiler.on_handle(handler, perf_counter() - start)
+
+        def dispatch(self, event: Event) -> List[Tuple[EventHandler, Optional[Callable[[Event], bool]]]]:
+            """
+            Get the candidate handlers for the event in attached order, each with its remaining per-event check.
+            """
+            source, target = event.source, event.target
+            key = (type(event), type(source), type(target),
+                   id(source) if id(source) in self.__watched else None,
+                   id(target) if id(target) in self.__watched else None)
+            handlers = self.__dispatch.get(key)
+            if handlers is None:
+                handlers = self.__dispatch[key] = [(h, h.refine()) for h in self.__handlers
+                                                   if h.accepts(type(event), source, target)]
+            return handlers
 
         def attach(self, handler: EventHandler):
             self.__handlers.append(handler)
+            self.__reindex()
 
         def detach(self, handler: Union[EventHandler, Callable[[EventHandler], bool], None]):
             if isinstance(handler, EventHandler):
@@ -118,6 +598,11 @@ class Logy:
                         self.__handlers.remove(h)
             else:
                 raise AttributeError
+            self.__reindex()
+
+        def __reindex(self):
+            self.__dispatch.clear()
+            self.__watched = {id(element) for h in self.__handlers for element in h.elements}
 
     class BaseBehavior:
         def __init__(self, logy: Logy):
@@ -133,35 +618,67 @@ class Logy:
 
     class PinBehavior(PinBehavior, BaseBehavior):
         def on_data_update(self, pin: Pin, prev_state):
-            for wire in self.logy.wires:
-                if PinEntry(pin, Mode.IN) in wire.entries:
-                    self.system.schedule(
-                        WriteEvent(pin, wire, self.system.after(wire.get_delay(pin, Mode.IN)), pin.data))
-            for comp in self.logy.comps:
-                if PinEntry(pin, Mode.IN) in comp.entries:
-                    self.system.schedule(
-                        InternalEvent(pin, comp, self.system.after(comp.get_delay(pin, Mode.IN)), prev_state))
+            system = self.system
+            if system.sink is not None:
+                system.sink.on_change(system.now(), pin, pin.data)
+            wires, comps = self.logy.fanout(pin)
+            for wire, delay in wires:
+                self.system.schedule(WriteEvent(pin, wire, self.system.after(delay), pin.data))
+            for comp, delay in comps:
+                self.system.schedule(InternalEvent(pin, comp, self.system.after(delay), prev_state))
 
     class WireBehavior(WireBehavior, BaseBehavior):
 
         def on_pin_write(self, wire: Wire, pin: Pin, data):
-            for entry in wire.entries:
-                if entry.mode is Mode.OUT:
-                    self.system.schedule(
-                        WriteEvent(wire, entry.pin, self.system.after(wire.get_delay(entry.pin, Mode.OUT)), data))
+            for target, delay, value in wire.deliver(pin, data):
+                self.system.schedule(WriteEvent(wire, target, self.system.after(delay), value))
 
     class ComponentBehavior(ComponentBehavior, BaseBehavior):
 
+        def __init__(self, logy: Logy):
+            super().__init__(logy)
+            # while evaluating a component once for a delta: states left to evaluate, and output pins to schedule
+            # with their previous state
+            self.__affected: Optional[Dict[str, None]] = None
+            self.__outputs: Optional[Dict[PinEntry, object]] = None
+
         def on_pin_update(self, comp: Component, pin: Pin, prev_state):
-            for id, alias in list(comp.pin_mapped.items()):
-                if comp.get_pin(id).pin is pin:
-                    comp.__setattr__(alias, pin.data)
+            if self.system.defer(comp, pin, prev_state):
+                return
+            for alias in comp.table.inputs.get(pin, ()):
+                comp.__setattr__(alias, pin.data)
+
+        def on_pins_update(self, comp: Component, pins: Dict[Pin, object]):
+            inputs = comp.table.inputs
+            data = {alias: pin.data for pin in pins for alias in inputs.get(pin, ())}
+            self.__affected, self.__outputs = affected, outputs = {}, {}
+            try:
+                comp.write_mapped(data)
+                while affected:
+                    name = next(iter(affected))
+                    del affected[name]
+                    comp.__getattribute__(name)
+            finally:
+                self.__affected = self.__outputs = None
+            table = comp.table
+            for entry, prev_state in outputs.items():
+                self.system.schedule(
+                    InternalEvent(comp, entry.pin, self.system.after(table.pins[entry][0]), prev_state))
 
         def on_comp_update(self, comp: Component, subcomp: Component, prev_state):
             return
 
         def on_state_update(self, comp: Component, state, prev_state):
             updated_states = [name for name, value in state.items() if value != prev_state[name]]
+            table = comp.table
+            if self.__affected is not None:
+                # evaluating for a delta: collect affected states and outputs, to handle each once
+                for updated in updated_states:
+                    self.__affected.update(dict.fromkeys(comp.pin_affected.get(updated, ())))
+                    for entry in table.outputs.get(updated, ()):
+                        if entry not in self.__outputs:
+                            self.__outputs[entry] = prev_state
+                return
             for updated in updated_states:
                 # state affects another state
                 affected = comp.pin_affected.get(updated, set())
@@ -169,10 +686,9 @@ class Logy:
                     comp.__getattribute__(aff_name)
 
                 # state affects output pin
-                entry = next((comp.get_pin(id) for id, name in comp.pin_mapped.items() if name == updated), None)
-                if entry and entry.mode is Mode.OUT:
+                for entry in table.outputs.get(updated, ()):
                     self.system.schedule(
-                        InternalEvent(comp, entry.pin, self.system.after(comp.get_delay(entry.pin, entry.mode)), prev_state))
+                        InternalEvent(comp, entry.pin, self.system.after(table.pins[entry][0]), prev_state))
 
         def write_pin(self, comp: Component, pin: Pin[D], data: D):
             pin.write(data, comp)
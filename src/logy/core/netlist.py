@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import io
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from typing import Dict, List, Tuple, Any, Callable, Optional, Union, BinaryIO, TYPE_CHECKING
+
+from logy.core.error import DesignError
+from logy.core.helpers import ELEMENT_SLOTS, PIN_SLOTS, WIRE_SLOTS, extras_of, path_of, resolve
+from logy.core.primitive import Element, Pin, Wire, Component
+
+if TYPE_CHECKING:
+    from logy.core.main import Logy
+
+VERSION = 1
+MAGIC = b'LOGYNET1'
+# magic, then the size of the pickled header, which is followed by the arrays, each aligned to 8 bytes
+_PREFIX = struct.Struct('<8sQ')
+_ALIGN = 8
+
+def _sources(classes: List[type]) -> Dict[str, str]:
+    """
+    Get a digest of the source file of each module defining the classes or their bases.
+    """
+    modules = {clz.__module__ for cls in classes for clz in cls.__mro__}
+    return {module: _digest_module(module) for module in sorted(modules)}
+
+
+def _digest_module(module: str) -> Optional[str]:
+    try:
+        path = inspect.getsourcefile(sys.modules.get(module) or __import__(module, fromlist=['_']))
+    except (TypeError, ImportError):
+        return None
+    if not path:
+        return None
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+class _Arrays:
+    """
+    Arrays laid out one after another, each aligned, with their (typecode, offset, length) by name.
+    """
+
+    def __init__(self):
+        self.layout: Dict[str, Tuple[str, int, int]] = {}
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, name: str, typecode: str, values) -> bool:
+        try:
+            data = array(typecode, values).tobytes()
+        except (OverflowError, TypeError):
+            return False
+        self.layout[name] = (typecode, self.size, len(data) // array(typecode).itemsize)
+        padding = -len(data) % _ALIGN
+        self.chunks.append(data + bytes(padding))
+        self.size += len(data) + padding
+        return True
+
+
+class _Pickler(pickle.Pickler):
+    """
+    A pickler referring to elements by their index in the netlist.
+    """
+
+    def __init__(self, file, indices: Dict[int, int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__indices = indices
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Element):
+            return self.__indices[id(obj)]
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, elements: List[Element]):
+        super().__init__(file)
+        self.__elements = elements
+
+    def persistent_load(self, index):
+        return self.__elements[index]
+
+
+def save(logy: Logy, file: Union[str, BinaryIO], key: Optional[str] = None):
+    """
+    Export the netlist of a Logy, elaborating it first if needed.
+    Elements are kept in tables of arrays: names, classes, pin data, wire connectivity and delays, and fanout;
+    other attributes of components are pickled, referring to elements by index.
+    """
+    if not logy.elaborated:
+        logy.elaborate()
+    comps, wires, pins = logy.ordered_comps, logy.ordered_wires, logy.ordered_pins
+    elements: List[Element] = [*comps, *wires, *pins]
+    indices = {id(element): index for index, element in enumerate(elements)}
+
+    classes: Dict[type, int] = {}
+    strings: Dict[str, int] = {}
+    arrays = _Arrays()
+    header: Dict[str, Any] = {'version': VERSION, 'key': key, 'counts': (len(comps), len(wires), len(pins))}
+
+    arrays.add('class', 'I', (classes.setdefault(type(element), len(classes)) for element in elements))
+    arrays.add('name', 'I', (strings.setdefault(element.name, len(strings)) for element in elements))
+    arrays.add('id', 'I', (strings.setdefault(element.id, len(strings)) for element in elements))
+    arrays.add('named', 'B', (element.named for element in elements))
+
+    # pin data: a template of the data class and fields by pin, and its value
+    templates: Dict[Tuple[type, tuple], int] = {}
+    values = []
+    template_of = array('I')
+    for pin in pins:
+        number, *fields = pin.data.__reduce__()[1]
+        template_of.append(templates.setdefault((type(pin.data), tuple(fields)), len(templates)))
+        values.append(number)
+    arrays.add('pin_template', 'I', template_of)
+    if not arrays.add('pin_value', 'Q', values):
+        header['pin_value'] = values
+
+    # wire entries: pin, mode and delay, from an offset by wire
+    offsets, entry_pins, entry_modes, entry_delays = array('I', [0]), array('I'), array('B'), []
+    for wire in wires:
+        for entry in wire.entries:
+            entry_pins.append(indices[id(entry.pin)])
+            entry_modes.append(entry.mode)
+            entry_delays.append(wire.get_delay(entry.pin, entry.mode))
+        offsets.append(len(entry_pins))
+    arrays.add('wire_offset', 'I', offsets)
+    arrays.add('wire_pin', 'I', entry_pins)
+    arrays.add('wire_mode', 'B', entry_modes)
+    if not arrays.add('wire_delay', 'q', entry_delays):
+        header['wire_delay'] = entry_delays
+
+    # fanout: sink wires then sink components with delays, from an offset by pin
+    offsets, sinks, sink_delays = array('I', [0]), array('I'), []
+    for pin in pins:
+        for group in logy.fanout(pin):
+            for sink, delay in group:
+                sinks.append(indices[id(sink)])
+                sink_delays.append(delay)
+        offsets.append(len(sinks))
+    arrays.add('fanout_offset', 'I', offsets)
+    arrays.add('fanout_sink', 'I', sinks)
+    if not arrays.add('fanout_delay', 'q', sink_delays):
+        header['fanout_delay'] = sink_delays
+
+    # attributes not kept in tables, and pin mappings each class made on first access of its mapped properties
+    extras = []
+    for index, element in enumerate(elements):
+        handled = PIN_SLOTS if isinstance(element, Pin) else WIRE_SLOTS if isinstance(element, Wire) \
+            else ELEMENT_SLOTS
+        state = extras_of(element, handled)
+        if state:
+            extras.append((index, state))
+    buffer = io.BytesIO()
+    try:
+        _Pickler(buffer, indices).dump(extras)
+    except (TypeError, pickle.PicklingError, AttributeError) as e:
+        raise DesignError(f"netlist cannot be exported: {e}") from e
+
+    header.update({
+        'classes': [path_of(cls) for cls in classes],
+        'mappings': [(cls.states, cls.pin_mapped, cls.pin_delay, cls.pin_affected) if issubclass(cls, Component)
+                     else None for cls in classes],
+        'sources': _sources(list(classes)),
+        'strings': list(strings),
+        'templates': [(path_of(cls), fields) for cls, fields in templates],
+        'arrays': arrays.layout,
+        'extras': buffer.getvalue(),
+    })
+    data = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+    data += bytes(-(len(data) + _PREFIX.size) % _ALIGN)
+
+    def write(f: BinaryIO):
+        f.write(_PREFIX.pack(MAGIC, len(data)))
+        f.write(data)
+        for chunk in arrays.chunks:
+            f.write(chunk)
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'wb') as f:
+            write(f)
+    else:
+        write(file)
+
+
+def _header(view: memoryview) -> Tuple[Dict[str, Any], int]:
+    magic, size = _PREFIX.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("not a netlist file")
+    header = pickle.loads(view[_PREFIX.size:_PREFIX.size + size])
+    if header.get('version') != VERSION:
+        raise ValueError(f"unsupported netlist version {header.get('version')}")
+    return header, _PREFIX.size + size
+
+
+def load(file: Union[str, os.PathLike, bytes], logy: Optional[Logy] = None) -> Logy:
+    """
+    Load a netlist into a new Logy, or an empty one given, elaborated.
+    Files are memory-mapped and their arrays read in place; no element constructor is called.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                return _load(view, logy)
+            finally:
+                view.release()
+    return _load(memoryview(file), logy)
+
+
+def _load(view: memoryview, logy: Optional[Logy]) -> Logy:
+    from logy.core.main import Logy
+
+    header, base = _header(view)
+    arrays: Dict[str, memoryview] = {}
+    try:
+        for name, (typecode, offset, length) in header['arrays'].items():
+            size = array(typecode).itemsize
+            arrays[name] = view[base + offset:base + offset + length * size].cast(typecode)
+        return _assemble(header, arrays, logy if logy is not None else Logy())
+    finally:
+        for array_view in arrays.values():
+            array_view.release()
+
+
+def _assemble(header: Dict[str, Any], arrays: Dict[str, memoryview], logy: Logy) -> Logy:
+    classes = [resolve(path) for path in header['classes']]
+    for cls, mapping in zip(classes, header['mappings']):
+        if mapping is not None:
+            states, pin_mapped, pin_delay, pin_affected = mapping
+            for alias, name in states.items():
+                if alias not in cls.states:
+                    cls.add_state(name, alias=alias)
+            cls.pin_mapped.update(pin_mapped)
+            cls.pin_delay.update(pin_delay)
+            for state, affected in pin_affected.items():
+                cls.pin_affected[state] = cls.pin_affected.get(state, set()).union(affected)
+
+    strings = header['strings']
+    n_comps, n_wires, n_pins = header['counts']
+    new, setattr_ = object.__new__, object.__setattr__
+    elements: List[Element] = []
+    for cls, name, id, named in zip(arrays['class'], arrays['name'], arrays['id'], arrays['named']):
+        element = new(classes[cls])
+        setattr_(element, '_Element__named', bool(named))
+        setattr_(element, '_Element__name', strings[name])
+        setattr_(element, '_Element__id', strings[id])
+        elements.append(element)
+    comps, wires, pins = elements[:n_comps], elements[n_comps:n_comps + n_wires], elements[n_comps + n_wires:]
+
+    templates = [resolve(path)(0, *fields) for path, fields in header['templates']]
+    values = header.get('pin_value') or arrays['pin_value']
+    for pin, template, value in zip(pins, arrays['pin_template'], values):
+        setattr_(pin, '_BufferedElement__data', templates[template]._with(value))
+        # exported netlists are elaborated, so validated
+        setattr_(pin, '_BufferedElement__validated', True)
+        setattr_(pin, '_Pin__entries', None)
+
+    offsets, entry_pins, modes = arrays['wire_offset'], arrays['wire_pin'], arrays['wire_mode']
+    delays = header.get('wire_delay') or arrays['wire_delay']
+    for i, wire in enumerate(wires):
+        setattr_(wire, '_Wire__delay', {elements[entry_pins[k]].entry(modes[k]): delays[k]
+                                        for k in range(offsets[i], offsets[i + 1])})
+
+    for index, state in _Unpickler(io.BytesIO(header['extras']), elements).load():
+        element = elements[index]
+        for name, value in state.items():
+            setattr_(element, name, value)
+
+    offsets, sinks = arrays['fanout_offset'], arrays['fanout_sink']
+    delays = header.get('fanout_delay') or arrays['fanout_delay']
+    fanout = {}
+    for i, pin in enumerate(pins):
+        group = [(elements[sinks[k]], delays[k]) for k in range(offsets[i], offsets[i + 1])]
+        fanout[pin] = (tuple((sink, delay) for sink, delay in group if isinstance(sink, Wire)),
+                       tuple((sink, delay) for sink, delay in group if isinstance(sink, Component)))
+
+    logy._assemble(comps, wires, pins, fanout)
+    return logy
+
+
+def _stable(value: Any, modules: Dict[str, None]) -> str:
+    """
+    Get a representation of an argument which does not change between processes, collecting the modules defining
+    the functions and classes it refers to.
+    """
+    if isinstance(value, (list, tuple)):
+        items = ', '.join(_stable(item, modules) for item in value)
+        return f"{type(value).__name__}({items})"
+    if isinstance(value, dict):
+        items = ', '.join(f"{_stable(k, modules)}: {_stable(v, modules)}"
+                          for k, v in sorted(value.items(), key=lambda item: repr(item[0])))
+        return f"dict({items})"
+    if callable(value) and hasattr(value, '__module__') and hasattr(value, '__qualname__'):
+        if '<' in value.__qualname__:
+            raise ValueError(f"{value.__qualname__} cannot be keyed, as it has no importable name")
+        modules[value.__module__] = None
+        return f"{value.__module__}:{value.__qualname__}"
+    text = repr(value)
+    if ' at 0x' in text:
+        raise ValueError(f"{text} cannot be keyed, as its representation changes between processes")
+    return text
+
+
+def key(build: Callable, *args, **kwargs) -> str:
+    """
+    Get the cache key of a design: a hash of the build function and the arguments by stable names, and of the
+    module sources of the build function and of the functions and classes given as arguments.
+    """
+    modules: Dict[str, None] = {}
+    call = _stable((build, list(args), dict(kwargs)), modules)
+    hasher = hashlib.sha1()
+    hasher.update(f"{VERSION}:{call};".encode())
+    for module in modules:
+        hasher.update(f"{module}:{_digest_module(module) or ''};".encode())
+    return hasher.hexdigest()
+
+
+def _fresh(path: str, key: str) -> bool:
+    """
+    Check that a cached netlist was saved under the key, and that the modules of its element classes are unchanged.
+    """
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                header, _ = _header(view)
+            finally:
+                view.release()
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return False
+    return header.get('key') == key and all(_digest_module(module) == digest
+                                            for module, digest in header['sources'].items())
+
+
+def cached(build: Callable[..., Logy], *args, directory: Optional[str] = None, **kwargs) -> Logy:
+    """
+    Get the design built by build(*args, **kwargs), loaded from the cache if it holds it.
+    Otherwise the design is built, elaborated and saved, keyed by a hash of the build function's module source and
+    the arguments; entries are also rebuilt when a module of their element classes changed.
+    """
+    directory = directory or os.environ.get('LOGY_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'logy')
+    design = key(build, *args, **kwargs)
+    path = os.path.join(directory, f"{design}.netlist")
+    if _fresh(path, design):
+        return load(path)
+    logy = build(*args, **kwargs)
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}"
+    save(logy, temporary, key=design)
+    os.replace(temporary, path)
+    return logy
+
+
+if __name__ == '__main__':
+    import dataclasses
+    import tempfile
+    from time import perf_counter
+    from logy.bench.circuits import Circuit, ripple_chain, adder_tree
+    from logy.bench.runner import logy_of, simulate
+
+    SIZE = 4096
+    with tempfile.TemporaryDirectory() as directory:
+        start = perf_counter()
+        built = cached(logy_of, ripple_chain, SIZE, directory=directory)
+        first = perf_counter() - start
+        built.close()
+        start = perf_counter()
+        loaded = cached(logy_of, ripple_chain, SIZE, directory=directory)
+        second = perf_counter() - start
+        size = os.path.getsize(os.path.join(directory, os.listdir(directory)[0]))
+        loaded.close()
+    start = perf_counter()
+    ripple_chain(SIZE).logy.close()
+    rebuilt = perf_counter() - start
+    print(f"ripple_chain({SIZE}): build {rebuilt:.3f}s, build and save {first:.3f}s, "
+          f"load {second:.3f}s from {size / 1024:.0f}KiB")
+
+    class Remapped:
+        """
+        Schedules the events of a stimulus to the elements of the same ids in another Logy.
+        """
+
+        def __init__(self, logy: Logy):
+            self.logy = logy
+            self.system = self
+
+        def schedule(self, event):
+            self.logy.system.schedule(dataclasses.replace(event, target=self.logy.find(event.target.id)))
+
+    # a loaded design simulates like the built one; the last Logy made drives the elements, so one runs at a time
+    for build in (ripple_chain, adder_tree):
+        reference = build(64)
+        buffer = io.BytesIO()
+        save(reference.logy, buffer)
+        simulate(reference, 20)
+        copy = load(buffer.getvalue())
+        simulate(Circuit(copy, copy.find(reference.clock.id),
+                         lambda logy, time, cycle: reference.stimulus(Remapped(logy), time, cycle)), 20)
+        print(f"{build.__name__}: match:", [element.__getstate__() for element in reference.logy.elements]
+              == [element.__getstate__() for element in copy.elements])
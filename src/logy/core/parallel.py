@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+import traceback
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional, Tuple, Any, Set, Union
+
+from logy.core import checkpoint
+from logy.core.error import DesignError
+from logy.core.main import Logy
+from logy.core.primitive import Element, Mode
+from logy.core.system import Event, EventHandler, EventSystem
+
+# an event sent between processes: class, source row or -1 if not an element, target row, time, other fields
+Message = Tuple[type, int, int, int, tuple]
+
+
+@lru_cache(maxsize=None)
+def _fields(cls: type) -> Tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(cls)[3:])
+
+
+class ParallelLogy:
+    """
+    A parallel engine running partitions of a design in their own processes.
+    Top-level components are split into contiguous partitions with their subcomponents and pins, keeping together
+    those joined by wires without delay unless that leaves a single partition. Wires belong to the partition where
+    their crossing delays are the largest, and other pins to the first partition unless kept with components.
+    Each process builds its own copy of the design, executes the events targeting its partition and passes the
+    others over a pipe.
+
+    Synchronization is conservative with windowed barriers: an event crossing partitions is never scheduled sooner
+    than the lookahead, the smallest delay of a wire crossing partitions, so all processes can safely execute the
+    window of that width starting at the earliest pending event. With the inertial model, the window is narrower by
+    the inertial window, so that a write crossing partitions supersedes the same pending writes as it would in a
+    single process, as long as each pin is written from a single partition.
+
+    Without lookahead, processes go through a time together in rounds, so that events are executed in the order
+    of a single process: one per delta in delta mode, and otherwise one per generation of the events at the time,
+    each made of those the previous one scheduled. Each round costs a round trip to every active process. This is
+    the case when all wires are without delay, as in the benchmark circuits, where the design is still split but
+    the engine is slower than a single process: parallelism pays off for designs whose partitions are joined by
+    delayed wires only. Without a positive window, the inertial model may also supersede writes crossing partitions
+    differently.
+    Handlers, sinks and profilers of the design are not carried to the processes.
+    """
+
+    def __init__(self, logy: Logy, build: Callable[..., Logy], *args, partitions: Optional[int] = None, **options):
+        """
+        :param logy: the design in this process, which routes scheduled events and receives results on sync
+        :param build: a picklable function building the same design in each process from args
+        :param partitions: maximum number of processes, the number of cores if None
+        :param options: attributes of the event system in each process, like inertial or delta
+        """
+        self.__logy = logy
+        self.__elements = logy.elements
+        self.__rows: Dict[int, int] = {id(element): row for row, element in enumerate(self.__elements)}
+        owner = ParallelLogy.partition(logy, partitions or os.cpu_count() or 1)
+        self.__owner: List[int] = [owner[element] for element in self.__elements]
+        self.__lookahead = ParallelLogy.lookahead_of(logy, owner)
+        # a write cancels pending writes of its target up to the inertial window before it, so a partition must not
+        # run past that window before receiving the writes of others
+        inertial = options.get('inertial')
+        self.__width = self.__lookahead if self.__lookahead is None or inertial is None \
+            else max(0, self.__lookahead - inertial)
+
+        size = max(self.__owner, default=0) + 1
+        context = multiprocessing.get_context()
+        digest = checkpoint.digest(self.__elements)
+        self.__conns: List[Connection] = []
+        self.__processes = []
+        for index in range(size):
+            conn, child = context.Pipe()
+            process = context.Process(target=_work, args=(child, build, args, self.__owner, index, digest, options),
+                                      daemon=True)
+            process.start()
+            child.close()
+            self.__conns.append(conn)
+            self.__processes.append(process)
+        for index in range(size):
+            self.__receive(index)
+
+        # next pending time of each partition, and events to pass to each partition on its next window
+        self.__next: List[Optional[int]] = [None] * size
+        self.__inboxes: List[List[Message]] = [[] for _ in range(size)]
+        self.__delta = bool(options.get('delta'))
+        self.rounds = 0
+        self.system = ParallelLogy.EventSystem(self)
+
+    @property
+    def logy(self):
+        return self.__logy
+
+    @property
+    def partitions(self) -> int:
+        return len(self.__conns)
+
+    @property
+    def lookahead(self) -> Optional[int]:
+        """
+        Get the smallest delay of events crossing partitions, None if no event crosses partitions.
+        """
+        return self.__lookahead
+
+    def owner(self, element: Element) -> int:
+        return self.__owner[self.__rows[id(element)]]
+
+    @staticmethod
+    def partition(logy: Logy, partitions: int) -> Dict[Element, int]:
+        """
+        Assign each element of a Logy to one of the partitions.
+        """
+        subcomps = {sub for comp in logy.comps for sub in comp.comps}
+        groups = []
+        for top in (comp for comp in logy.ordered_comps if comp not in subcomps):
+            group, stack = [], [top]
+            while stack:
+                group.append(comp := stack.pop())
+                stack.extend(comp.comps)
+            groups.append(group)
+        pins = set(logy.pins)
+        for wire in logy.ordered_wires:
+            for pin in wire.pins:
+                if pin not in pins:
+                    raise DesignError(f"pin {pin.full_name} of wire {wire.full_name} is not part of the design")
+
+        # groups joined by a wire without delay are kept together, so that only delayed events cross partitions;
+        # unless this leaves a single cluster of components, as then partitions exchange events without lookahead
+        node: Dict[Element, int] = {element: index for index, group in enumerate(groups)
+                                    for comp in group for element in (comp, *comp.pins)}
+        members: List[List[Element]] = [*groups, *([pin] for pin in logy.ordered_pins if pin not in node)]
+        node.update((group[0], index) for index, group in enumerate(members) if index >= len(groups))
+        parent = list(range(len(members)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = index = parent[parent[index]]
+            return index
+
+        for wire in logy.ordered_wires:
+            roots = {find(node[entry.pin]) for entry in wire.entries if wire.get_delay(entry.pin, entry.mode) == 0}
+            for root in roots:
+                parent[root] = min(roots)
+        clusters: Dict[int, List[Element]] = {}
+        for index, group in enumerate(members):
+            clusters.setdefault(find(index), []).extend(group)
+        if len({find(index) for index in range(len(groups))}) > 1:
+            groups = list(clusters.values())
+
+        owner: Dict[Element, int] = {}
+        total, done = sum(len(group) for group in groups) or 1, 0
+        for group in groups:
+            index = min(partitions - 1, done * partitions // total)
+            owner.update(dict.fromkeys(group, index))
+            done += len(group)
+        for comp in logy.ordered_comps:
+            for pin in comp.pins:
+                if owner.setdefault(pin, owner[comp]) != owner[comp]:
+                    raise DesignError(f"pin {pin.full_name} is shared by components across partitions")
+        for pin in pins:
+            owner.setdefault(pin, 0)
+        for wire in logy.ordered_wires:
+            # the wire belongs where its crossing delays are the largest, by default with its input pin
+            candidates = dict.fromkeys(owner[entry.pin] for entry in
+                                       sorted(wire.entries, key=lambda entry: entry.mode is not Mode.IN))
+            owner[wire] = max(candidates, key=lambda index: min(
+                (wire.get_delay(entry.pin, entry.mode) for entry in wire.entries if owner[entry.pin] != index),
+                default=float('inf')))
+        return owner
+
+    @staticmethod
+    def lookahead_of(logy: Logy, owner: Dict[Element, int]) -> Optional[int]:
+        """
+        Get the smallest delay of wires passing data across partitions, None if there is none.
+        """
+        delays = [wire.get_delay(entry.pin, entry.mode) for wire in logy.wires for entry in wire.entries
+                  if owner[entry.pin] != owner[wire]]
+        return min(delays, default=None)
+
+    @staticmethod
+    def encode(event: Event, rows: Dict[int, int]) -> Message:
+        return (type(event), rows.get(id(event.source), -1), rows[id(event.target)], event.time,
+                tuple(getattr(event, name) for name in _fields(type(event))))
+
+    @staticmethod
+    def decode(message: Message, elements: List[Element]) -> Event:
+        cls, source, target, time, fields = message
+        return cls(elements[source] if source >= 0 else None, elements[target], time, *fields)
+
+    """ coordination """
+
+    def __receive(self, index: int):
+        ok, value = self.__conns[index].recv()
+        if not ok:
+            raise RuntimeError(f"partition {index} failed:\n{value}")
+        return value
+
+    def schedule(self, event: Event):
+        message = ParallelLogy.encode(event, self.__rows)
+        self.__inboxes[self.__owner[message[2]]].append(message)
+
+    def __active(self, end: int) -> List[int]:
+        """
+        Get partitions with events to execute until the time, pending or to be passed.
+        """
+        return [index for index, (inbox, time) in enumerate(zip(self.__inboxes, self.__next))
+                if (time is not None and time <= end) or any(message[3] <= end for message in inbox)]
+
+    def __round(self, command: str, time: int, active: List[int]):
+        """
+        Pass the command with pending events to the partitions in parallel, and route the events they send back.
+        """
+        for index in active:
+            self.__conns[index].send((command, (time, self.__inboxes[index])))
+            self.__inboxes[index] = []
+        for index in active:
+            outbox, self.__next[index] = self.__receive(index)
+            for message in outbox:
+                self.__inboxes[self.__owner[message[2]]].append(message)
+        self.rounds += 1
+
+    def run(self, until: int):
+        """
+        Execute all events until the time, window by window.
+        """
+        width = self.__width
+        while True:
+            times = [time for time in self.__next if time is not None]
+            times.extend(message[3] for inbox in self.__inboxes for message in inbox)
+            if not times or (start := min(times)) > until:
+                return
+            if width == 0 and self.__delta:
+                # without lookahead, partitions go through each delta together: writes at the time are propagated
+                # across partitions first, then components are evaluated
+                evaluated = set()
+                while active := self.__active(start):
+                    self.__round('propagate', start, active)
+                    evaluated.update(active)
+                self.__round('evaluate', start, sorted(evaluated))
+                continue
+            if width == 0:
+                # without lookahead, partitions go through the events at the time generation by generation, each
+                # made of the events the previous one scheduled at the time, in the order a single queue has them
+                while active := self.__active(start):
+                    self.__round('generation', start, active)
+                continue
+            end = until if width is None else min(start + width - 1, until) if width > 0 else start
+            self.__round('run', end, self.__active(end))
+
+    def sync(self):
+        """
+        Copy the states of all partitions into the design of this process.
+        """
+        for conn in self.__conns:
+            conn.send(('collect', None))
+        totals = dict.fromkeys(Logy.EventSystem.COUNTERS, 0)
+        for index in range(self.partitions):
+            states, counts = self.__receive(index)
+            for row, state in states:
+                self.__elements[row].__setstate__(state)
+            for name, count in zip(Logy.EventSystem.COUNTERS, counts):
+                totals[name] += count
+        for name, count in totals.items():
+            setattr(self.system, name, count)
+
+    def close(self):
+        for conn in self.__conns:
+            try:
+                conn.send(('stop', None))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self.__processes:
+            process.join()
+        self.__conns.clear()
+        self.__processes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    class EventSystem(EventSystem):
+        """
+        The event system of the coordinator, passing scheduled events to their partitions.
+        """
+
+        def __init__(self, parallel: ParallelLogy):
+            self.__parallel = parallel
+            self.__time = 0
+            # counters of all partitions, as of the last sync
+            self.executed = 0
+            self.cancelled = 0
+            self.dropped = 0
+            self.deltas = 0
+
+        @property
+        def avoided(self) -> int:
+            return self.cancelled + self.dropped
+
+        def now(self) -> int:
+            return self.__time
+
+        def advance(self, time_diff: int):
+            until = self.__time + time_diff
+            self.__parallel.run(until)
+            self.__time = until
+
+        def schedule(self, event: Event):
+            self.__parallel.schedule(event)
+
+        def execute(self, event: Event):
+            raise NotImplementedError("events are executed by the partitions")
+
+        def attach(self, handler: EventHandler):
+            raise NotImplementedError("handlers are not carried to the partitions")
+
+        def detach(self, handler: Union[EventHandler, Callable[[EventHandler], bool], None]):
+            raise NotImplementedError("handlers are not carried to the partitions")
+
+    class PartitionSystem(Logy.EventSystem):
+        """
+        The event system of a partition, keeping events targeting other partitions aside to be passed on.
+        """
+
+        def __init__(self, rows: Dict[int, int], remote: Set[int]):
+            super().__init__()
+            self.__rows = rows
+            self.__remote = remote
+            self.__outbox: List[Message] = []
+            # events scheduled at the current time while executing a generation, None otherwise
+            self.__held: Optional[List[Event]] = None
+
+        def schedule(self, event: Event):
+            if id(event.target) in self.__remote:
+                self.__outbox.append(ParallelLogy.encode(event, self.__rows))
+            elif self.__held is not None and event.time <= self.now():
+                self.__held.append(event)
+            else:
+                super().schedule(event)
+
+        def generation(self, time: int):
+            """
+            Execute the events pending at the time, holding those they schedule at the time back to the next call.
+            """
+            self.__held = []
+            try:
+                self.advance(time - self.now())
+            finally:
+                held, self.__held = self.__held, None
+            for event in held:
+                super().schedule(event)
+
+        def flush(self) -> List[Message]:
+            outbox, self.__outbox = self.__outbox, []
+            return outbox
+
+
+def _work(conn: Connection, build: Callable[..., Logy], args: tuple, owner: List[int], index: int, digest: str,
+          options: Dict[str, Any]):
+    """
+    Run a partition, answering each command from the coordinator with (True, result) or (False, traceback).
+    """
+    try:
+        logy = build(*args)
+        elements = logy.elements
+        if checkpoint.digest(elements) != digest:
+            raise DesignError("the design built by the partition differs from the coordinator's")
+        system = ParallelLogy.PartitionSystem({id(element): row for row, element in enumerate(elements)},
+                                              {id(element) for element, o in zip(elements, owner) if o != index})
+        for name, value in options.items():
+            if not hasattr(system, name):
+                raise AttributeError(f"event system has no option '{name}'")
+            setattr(system, name, value)
+        logy.use(system)
+        conn.send((True, None))
+
+        while True:
+            command, payload = conn.recv()
+            if command in ('run', 'generation', 'propagate', 'evaluate'):
+                time, messages = payload
+                for message in messages:
+                    system.schedule(ParallelLogy.decode(message, elements))
+                if command == 'run':
+                    system.advance(time - system.now())
+                elif command == 'generation':
+                    system.generation(time)
+                elif command == 'propagate':
+                    system.propagate(time)
+                else:
+                    system.evaluate()
+                conn.send((True, (system.flush(), system.next_time())))
+            elif command == 'collect':
+                conn.send((True, ([(row, elements[row].__getstate__()) for row, o in enumerate(owner) if o == index],
+                                  tuple(getattr(system, name) for name in Logy.EventSystem.COUNTERS))))
+            elif command == 'stop':
+                return
+    except (EOFError, KeyboardInterrupt):
+        return
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    import sys
+    from functools import partial
+    from time import perf_counter
+    from logy.bench.circuits import Circuit, ripple_chain
+    from logy.bench.runner import simulate, logy_of
+
+    size, cycles = 256, 20
+    print(f"{os.cpu_count()} cores", file=sys.stderr)
+    # without delays, partitions exchange events at every time; with them, they run windows of the lookahead
+    for name, build in (('no delay', ripple_chain), ('delay 3', partial(ripple_chain, delay=3))):
+        reference = build(size)
+        start = perf_counter()
+        simulate(reference, cycles)
+        print(f"{name}: sequential: {perf_counter() - start:.3f}s, {reference.logy.system.executed} events",
+              file=sys.stderr)
+        states = [element.__getstate__() for element in reference.logy.elements]
+
+        for partitions in (2, 4, 8):
+            circuit = build(size)
+            with ParallelLogy(circuit.logy, logy_of, build, size, partitions=partitions) as parallel:
+                start = perf_counter()
+                simulate(Circuit(parallel, circuit.clock, circuit.stimulus), cycles)
+                parallel.sync()
+                print(f"  {parallel.partitions} partitions: {perf_counter() - start:.3f}s, "
+                      f"{parallel.system.executed} events, {parallel.rounds} rounds, lookahead {parallel.lookahead}, "
+                      f"match: {states == [element.__getstate__() for element in circuit.logy.elements]}",
+                      file=sys.stderr)
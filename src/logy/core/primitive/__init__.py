@@ -1,5 +1,5 @@
 from .data import Mode, D, Data, BD, BinaryData
-from .element import B, ElementBehavior, E, Element, BufferedElement
+from .element import B, ElementBehavior, E, Element, BufferedElement, Registry
 from .pin import Pin, PinEntry, PinBehavior
-from .component import Component, ComponentBehavior
-from .wire import Wire, SimpleWire, WireBehavior
+from .component import Component, ComponentBehavior, MappedProperty, PinTable
+from .wire import Wire, SimpleWire, MultiWire, WireBehavior
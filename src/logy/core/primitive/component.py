@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
-from typing import Iterable, Set, Dict, Union, List, Any, Callable, Tuple
+from typing import Iterable, Set, Dict, Union, List, Any, Callable, Tuple, NamedTuple, Optional
 
 from logy.core.primitive.data import Mode, D
 from logy.core.primitive.element import Element, ElementBehavior
@@ -20,6 +20,13 @@ class ComponentBehavior(ElementBehavior, ABC):
         """
         ...
 
+    def on_pins_update(self, comp: Component, pins: Dict[Pin, Any]):
+        """
+        Handle updates of several attached pins at once, by previous state of each pin.
+        """
+        for pin, prev_state in pins.items():
+            self.on_pin_update(comp, pin, prev_state)
+
     @abstractmethod
     def on_comp_update(self, comp: Component, subcomp: Component, prev_state):
         """
@@ -42,23 +49,69 @@ class ComponentBehavior(ElementBehavior, ABC):
         ...
 
 
+class MappedProperty(property):
+    """
+    A pin-mapped property made by Component.mapped, which keeps its definition for elaboration.
+    """
+
+    def __init__(self, fget, fset, *, id: str, mode: Mode, delay: int, srcs: Iterable[str],
+                 eval: Callable, func: Callable):
+        super().__init__(fget, fset)
+        self.id = id
+        self.mode = mode
+        self.delay = delay
+        self.srcs = tuple(srcs)
+        self.eval = eval
+        self.func = func
+
+
+class PinTable(NamedTuple):
+    """
+    Direct lookup tables of a component's attached pins, built on elaboration.
+    """
+    # entry -> (delay, alias of the mapped state, None if unmapped)
+    pins: Dict[PinEntry, Tuple[int, Optional[str]]]
+    # input pin -> aliases of the states it sets
+    inputs: Dict[Pin, Tuple[str, ...]]
+    # alias of a state -> output entries it drives
+    outputs: Dict[str, Tuple[PinEntry, ...]]
+
+    @staticmethod
+    def of(comp: Component) -> PinTable:
+        pins = {entry: (0, None) for entry in comp.entries}
+        inputs: Dict[Pin, Tuple[str, ...]] = {}
+        outputs: Dict[str, Tuple[PinEntry, ...]] = {}
+        for id, alias in comp.pin_mapped.items():
+            entry = comp.get_pin(id)
+            pins[entry] = (comp.pin_delay.get(id, 0), alias)
+            if entry.mode is Mode.IN:
+                inputs[entry.pin] = inputs.get(entry.pin, ()) + (alias,)
+            else:
+                outputs[alias] = outputs.get(alias, ()) + (entry,)
+        return PinTable(pins, inputs, outputs)
+
+
 class Component(Element[ComponentBehavior], classifier="C"):
+    # pin tables, built on elaboration
+    __table: Optional[PinTable] = None
+
     def __init__(self, pins: Iterable[Union[Tuple[Pin, Mode, str]]] = (),
                  wires: Iterable[Wire] = (),
                  components: Iterable[Component] = (),
                  name: str = None):
-        super(Component, self).__init__(name)
-        self.__pins: Set[PinEntry] = set()
+        # not through super(), which would reach BufferedElement first in components which also hold data
+        Element.__init__(self, name)
+        # ordered sets, keeping the order elements were given in
+        self.__pins: Dict[PinEntry, None] = {}
         self.__pin_names: Dict[str, PinEntry] = {}
+        self.__pin_ids: Dict[PinEntry, str] = {}
+        self.__table: Optional[PinTable] = None
 
         for pin, mode, id in pins:
-            entry = PinEntry(pin, mode)
-            self.__pins.add(entry)
-            if id:
-                self.__pin_names[id] = entry
+            self.attach(pin, mode, id)
 
-        self.__wires: Set[Wire] = set(wires)
-        self.__comps: Set[Component] = set(components)
+        self.__wires: Dict[Wire, None] = dict.fromkeys(wires)
+        self.__comps: Dict[Component, None] = dict.fromkeys(components)
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -71,19 +124,19 @@ class Component(Element[ComponentBehavior], classifier="C"):
 
     @property
     def pins(self):
-        return {entry.pin for entry in self.__pins}
+        return dict.fromkeys(entry.pin for entry in self.__pins).keys()
 
     @property
     def wires(self):
-        return set(self.__wires)
+        return dict.fromkeys(self.__wires).keys()
 
     @property
     def entries(self):
-        return self.__pins.copy()
+        return dict.fromkeys(self.__pins).keys()
 
     @property
     def comps(self):
-        return set(self.__comps)
+        return dict.fromkeys(self.__comps).keys()
 
     @classmethod
     def mapped(cls, id: Union[Pin[D], str], mode: Mode, delay: int = 0, srcs: Iterable[Union[str]] = (), eval=None):
@@ -108,7 +161,7 @@ class Component(Element[ComponentBehavior], classifier="C"):
                     if not hasattr(self, name) or self.__getattribute__(name) != value:
                         self.__setattr__(name, value)
 
-                return property(getter, fset=setter)
+                return MappedProperty(getter, setter, id=id, mode=mode, delay=delay, srcs=srcs, eval=eval, func=func)
             elif mode is Mode.OUT:
                 def getter(self):
                     if state not in self.states.keys():
@@ -126,7 +179,8 @@ class Component(Element[ComponentBehavior], classifier="C"):
                     if self.__getattribute__(name) != value:
                         self.__setattr__(name, value)
 
-                return property(getter if eval else None, fset=setter)
+                return MappedProperty(getter if eval else None, setter, id=id, mode=mode, delay=delay, srcs=srcs,
+                                      eval=eval, func=func)
 
         return decorator
 
@@ -134,45 +188,86 @@ class Component(Element[ComponentBehavior], classifier="C"):
     def name_mapped(name: str):
         return f"_mapped_{name}"
 
+    @classmethod
+    def mapped_properties(cls) -> Dict[str, MappedProperty]:
+        """Get pin-mapped properties of the class by alias, including inherited ones."""
+        return {alias: prop for clz in reversed(cls.mro()) for alias, prop in vars(clz).items()
+                if isinstance(prop, MappedProperty)}
+
     def update(self, state):
         super().update(state)
-        for name, value in self.__getstate__().items():
-            if value != state[name]:
-                self.on_state_update({name: state[name]}, {name: value})
+        for name, prev in state.items():
+            value = getattr(self, self.states[name], None)
+            if value != prev:
+                self.on_state_update({name: prev}, {name: value})
+
+    def write_mapped(self, data: Dict[str, D]):
+        """
+        Write pin data to several input mapped states by alias, and handle all their changes in a single update.
+        """
+        prev_state = {}
+        for alias, value in data.items():
+            name = self.states[alias]
+            value = getattr(type(self), alias).func(self, value)
+            if name not in self.__dict__:
+                super(Element, self).__setattr__(name, value)
+            elif self.__dict__[name] != value:
+                prev_state[alias] = self.__dict__[name]
+                super(Element, self).__setattr__(name, value)
+        if prev_state:
+            self.update(prev_state)
+
+    @property
+    def table(self) -> PinTable:
+        """
+        Get the pin tables of the component, elaborating it if needed.
+        """
+        return self.__table or self.elaborate()
+
+    def elaborate(self) -> PinTable:
+        """
+        Build the pin tables of the component, once all its pins are attached and mapped states defined.
+        """
+        self.__table = PinTable.of(self)
+        return self.__table
 
     def get_pin(self, id: str):
         return self.__pin_names[id]
 
     def get_delay(self, pin: Pin, mode: Mode):
-        entry = PinEntry(pin, mode)
-        if entry in self.__pin_names.values():
-            name = next(name for name, e in self.__pin_names.items() if e == entry)
-            return self.pin_delay[name]
-        return 0
+        id = self.__pin_ids.get(pin.entry(mode))
+        return self.pin_delay.get(id, 0) if id is not None else 0
 
     def attach(self, pin: Pin, mode: Mode, id: Union[int, str] = None):
-        entry = PinEntry(pin, mode)
-        self.__pins.add(entry)
+        entry = pin.entry(mode)
+        self.__pins[entry] = None
         if id:
             self.__pin_names[id] = entry
+            self.__pin_ids[entry] = id
+        self.__table = None
 
     def detach(self, arg: Union[Pin, Union[int, str]], mode: Mode = None):
         if isinstance(arg, int) or isinstance(arg, str):
             entry = self.get_pin(arg)
-            self.__pins.remove(entry)
+            del self.__pins[entry]
             del self.__pin_names[arg]
+            del self.__pin_ids[entry]
         else:
-            entry = PinEntry(arg, mode)
-            self.__pins.remove(entry)
-            if entry in self.__pin_names.values():
-                key = next(i for i, e in self.__pin_names if e == entry)
+            entry = arg.entry(mode)
+            del self.__pins[entry]
+            key = self.__pin_ids.pop(entry, None)
+            if key is not None:
                 del self.__pin_names[key]
+        self.__table = None
 
     """ methods delegated by behavior """
 
     def on_pin_update(self, pin: Pin[D], prev_state):
         self.behavior().on_pin_update(self, pin, prev_state)
 
+    def on_pins_update(self, pins: Dict[Pin, Any]):
+        self.behavior().on_pins_update(self, pins)
+
     def on_comp_update(self, subcomp: Component, prev_state):
         self.behavior().on_comp_update(self, subcomp, prev_state)
 
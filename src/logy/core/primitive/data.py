@@ -17,10 +17,28 @@ D1 = TypeVar("D1", bound='Data')
 D2 = TypeVar("D2", bound='Data')
 
 
-@dataclasses.dataclass(frozen=True, eq=False)
+# masks of all ones, indexed by width
+_MASKS = [(1 << length) - 1 for length in range(65)]
+
+
+def mask(length: int) -> int:
+    """
+    Get a mask of all ones for the width.
+    """
+    return _MASKS[length] if length < len(_MASKS) else (1 << length) - 1
+
+
 class Data(Generic[D]):
-    value: int
-    default: int = 0
+    """
+    An immutable value carried by pins.
+    Instances are slotted and frozen; use of() to get a new data object with a new value.
+    """
+    __slots__ = ('value', 'default')
+
+    def __init__(self, value: int, default: int = 0):
+        _set = object.__setattr__
+        _set(self, 'value', value)
+        _set(self, 'default', default)
 
     def valid(self, value: int) -> bool:
         """Check if a value is valid for data."""
@@ -36,6 +54,37 @@ class Data(Generic[D]):
     def __lt__(self, other: D):
         return self.value < other.value
 
+    def __setattr__(self, key, value):
+        raise dataclasses.FrozenInstanceError(f"cannot assign to field '{key}'")
+
+    def __delattr__(self, key):
+        raise dataclasses.FrozenInstanceError(f"cannot delete field '{key}'")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, self._fields()
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(value={self.value!r}, default={self.default!r})"
+
+    def _fields(self) -> tuple:
+        return self.value, self.default
+
+    def _with(self, value: int):
+        """
+        Get a copy of the data with the value replaced, without validation.
+        """
+        data = object.__new__(self.__class__)
+        _set = object.__setattr__
+        _set(data, 'value', value)
+        _set(data, 'default', self.default)
+        return data
+
     def compatible(self, other: D):
         """
         Check if two data is compatible.
@@ -50,7 +99,7 @@ class Data(Generic[D]):
             value = self.default
         if not self.valid(value):
             raise AttributeError
-        return dataclasses.replace(self, value=value)
+        return self._with(value)
 
     @classmethod
     def reduce(cls, *datas: D) -> D:
@@ -68,13 +117,39 @@ class Data(Generic[D]):
 BD = TypeVar('BD', bound='BinaryData')
 
 
-@dataclasses.dataclass(frozen=True, eq=False)
 class BinaryData(Generic[BD], Data[BD]):
-    length: int = 1
-    signed: bool = False
+    __slots__ = ('length', 'signed')
+
+    def __init__(self, value: int, default: int = 0, length: int = 1, signed: bool = False):
+        super().__init__(value, default)
+        _set = object.__setattr__
+        _set(self, 'length', length)
+        _set(self, 'signed', signed)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(value={self.value!r}, default={self.default!r}, " \
+               f"length={self.length!r}, signed={self.signed!r})"
+
+    def _fields(self) -> tuple:
+        return self.value, self.default, self.length, self.signed
+
+    def _with(self, value: int):
+        data = object.__new__(self.__class__)
+        _set = object.__setattr__
+        _set(data, 'value', value)
+        _set(data, 'default', self.default)
+        _set(data, 'length', self.length)
+        _set(data, 'signed', self.signed)
+        return data
+
+    @property
+    def mask(self) -> int:
+        return mask(self.length)
 
     def valid(self, value: int) -> bool:
-        return 0 <= self._to_binary(value, length=self.length, signed=self.signed) < 2 ** self.length
+        if self.signed:
+            value = self._to_binary(value, length=self.length, signed=True)
+        return 0 <= value <= mask(self.length)
 
     def compatible(self, other: BD):
         return super().compatible(other) \
@@ -83,16 +158,14 @@ class BinaryData(Generic[BD], Data[BD]):
     def of(self, value: Optional[int], _slice: slice = None):
         if _slice:
             start, stop, _ = _slice.indices(self.length)
-            mask = sum(1 << i for i in range(start, stop))
-            _slice.indices(self.length)
-            return super().of((self.value & ~mask) | ((value << start) & mask))
+            bits = mask(stop - start) << start if stop > start else 0
+            return super().of((self.value & ~bits) | ((value << start) & bits))
         return super().of(value)
 
     def __getitem__(self, item):
         if isinstance(item, slice):
             start, stop, _ = item.indices(self.length)
-            mask = sum(1 << i for i in range(start, stop))
-            return (self.value & mask) >> start
+            return (self.value >> start) & mask(stop - start) if stop > start else 0
         else:
             if item < 0 or item >= self.length:
                 raise IndexError
@@ -104,15 +177,29 @@ class BinaryData(Generic[BD], Data[BD]):
 
     @classmethod
     def _to_binary(cls, actual: int, *, length: int, signed=False):
-        return 2 ** length - actual if signed else actual
+        return (1 << length) - actual if signed else actual
 
     @classmethod
     def _to_actual(cls, binary: int, *, length: int, signed=False):
-        return 2 ** length - binary if signed else binary
+        return (1 << length) - binary if signed else binary
 
 
 if __name__ == '__main__':
     data1 = Data(1)
     data2 = BinaryData(0, length=16)
     print(data1, data2)
-    print(repr(data1), repr(data2))
\ No newline at end of file
+    print(repr(data1), repr(data2))
+
+    import timeit
+
+    N = 200_000
+    for length in (1, 8, 32, 64):
+        data = BinaryData(0, length=length)
+        top = mask(length)
+        write = timeit.timeit(lambda: data.of(top), number=N)
+        read = timeit.timeit(lambda: data[length // 4:length // 2 + 1], number=N)
+        assign = timeit.timeit(lambda: data.of(1, slice(length // 4, length // 2 + 1)), number=N)
+        compare = timeit.timeit(lambda: data == top, number=N)
+        print(f"width {length:2}: " + ", ".join(f"{name} {N / elapsed / 1e6:.2f}M/s" for name, elapsed in
+                                             [("write", write), ("slice", read), ("slice-assign", assign),
+                                              ("compare", compare)]))
\ No newline at end of file
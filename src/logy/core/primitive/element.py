@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import random
-import string
+import itertools
 from abc import ABC
 from copy import copy
-from typing import TypeVar, Dict, Collection, Union, Tuple, Generic
+from typing import TypeVar, Dict, Collection, Union, Tuple, Generic, Optional, Iterator, Iterable
+from weakref import WeakValueDictionary
 
 from logy.core.helpers import demangled
 from logy.core.primitive.data import D, Data
@@ -18,20 +18,24 @@ class ElementBehavior(ABC):
 
 E = TypeVar("E", bound='Element')
 
+# a marker for states not set yet
+_UNSET = object()
+
 
 class Element(Generic[B]):
     """
     A base class for all circuit elements.
-    Each primitive has name and unique id, with some convenience like prefix, random naming.
+    Each primitive has a name with a classifier prefix, and an id once registered to a simulation.
+    Unnamed elements get a provisional name from a counter, replaced by a deterministic one on registration.
+    Elements are slotted; subclasses without __slots__, like components, keep their states in a __dict__.
     """
-    RAND_NAME_SIZE = 5
-    entry: Dict[str, Element] = {}
+    __slots__ = ('__named', '__name', '__id', '__weakref__')
+    __names = itertools.count()
 
     def __init__(self, name: str = None):
-        if not name:
-            name = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(Element.RAND_NAME_SIZE))
-        self.__name = name
-        Element.entry[self.id] = self
+        self.__named = bool(name)
+        self.__name = name or str(next(Element.__names))
+        self.__id: Optional[str] = None
 
     def __init_subclass__(cls, classifier: str = None, states: Collection[Union[Tuple[str, str], str]] = None,
                           **kwargs):
@@ -52,6 +56,8 @@ class Element(Generic[B]):
         cls.states: Dict[str, str] = {alias: name for it in
                                       (clz.states.items() for clz in cls.mro() if hasattr(clz, 'states')) for
                                       alias, name in it}
+        # state_aliases: attribute name -> state alias, for tracking writes
+        cls.state_aliases: Dict[str, str] = {name: alias for alias, name in cls.states.items()}
         if states:
             for state in states:
                 state, alias = (state if isinstance(state, tuple) else (state, None))
@@ -63,6 +69,7 @@ class Element(Generic[B]):
         if (alias or state) in cls.states:
             raise NameError(f"{cls.__name__}: state '{alias}' already defined in the superclass")
         cls.states[alias or state] = state
+        cls.state_aliases[state] = alias or state
 
     def behavior(self) -> B:
         return None
@@ -76,49 +83,128 @@ class Element(Generic[B]):
         return self.classifier + '_' + self.name if self.classifier else self.name
 
     @property
-    def id(self) -> str:
-        return self.__name + '__' + str(id(self))
+    def named(self) -> bool:
+        return self.__named
 
-    @staticmethod
-    def find(id: str):
-        return Element.entry[id]
+    @property
+    def id(self) -> str:
+        """
+        Get the hierarchical id given by the registry of a simulation, or the full name if not registered.
+        """
+        return self.__id or self.full_name
 
-    def __del__(self):
-        del Element.entry[self.id]
+    def _identify(self, id: Optional[str], name: str = None):
+        """
+        Set the id, and the name of an unnamed element, on registration.
+        """
+        self.__id = id
+        if name is not None:
+            self.__name = name
 
     def __getstate__(self):
-        return {alias: copy(self.__dict__.get(name)) for alias, name in self.states.items()}
+        return {alias: copy(getattr(self, name, None)) for alias, name in self.states.items()}
 
     def __setstate__(self, state):
-        for alias, value in state:
-            if alias in self.states.keys():
-                self.__setattr__(self.states[alias], value)
+        # restoring a state is not a change to track
+        for alias, value in state.items():
+            if alias in self.states:
+                super(Element, self).__setattr__(self.states[alias], value)
 
     def __setattr__(self, key, value):
-        if key in self.states.values() and hasattr(self, key):
-            state = self.__getstate__()
-            super(Element, self).__setattr__(key, value)
-            self.update(state)
-        else:
-            super(Element, self).__setattr__(key, value)
-
-    def __hash__(self):
-        return hash(self.id)
+        alias = self.state_aliases.get(key)
+        prev = _UNSET if alias is None else getattr(self, key, _UNSET)
+        super(Element, self).__setattr__(key, value)
+        if prev is not _UNSET:
+            self.update({alias: prev})
 
     def update(self, state):
         """
         Handle state changes.
-        :param state: previous state before update
+        :param state: previous values of the written states, by alias
         """
 
     def __repr__(self):
         return f"<<{self.full_name}>>({', '.join(f'{key}: {value}' for key, value in self.__getstate__().items())})"
 
 
+class Registry:
+    """
+    A registry of the elements of a simulation by id, holding them weakly.
+    Ids are hierarchical, like 'C_REG_R0.P_DIN', and unnamed elements are named by their order among
+    the unnamed elements of the same classifier in the same scope, so that ids do not depend on the process.
+    """
+
+    def __init__(self):
+        self.__elements: WeakValueDictionary[str, Element] = WeakValueDictionary()
+        # (scope, classifier) -> number of unnamed elements named so far
+        self.__unnamed: Dict[Tuple[str, str], int] = {}
+        # id -> last suffix given to a duplicate of it
+        self.__suffixes: Dict[str, int] = {}
+
+    def register(self, element: Element, parent: Optional[Element] = None) -> str:
+        """
+        Register an element in the scope of its parent if any, and get its id.
+        Registering an element again keeps its id.
+        """
+        if self.__elements.get(element.id) is element:
+            return element.id
+        scope = f"{parent.id}." if parent is not None else ''
+        if not element.named:
+            key = (scope, element.classifier)
+            index = self.__unnamed.get(key, 0)
+            self.__unnamed[key] = index + 1
+            element._identify(None, name=str(index))
+        id = base = scope + element.full_name
+        if id in self.__elements:
+            suffix = self.__suffixes.get(base, 0) + 1
+            while f"{base}#{suffix}" in self.__elements:
+                suffix += 1
+            self.__suffixes[base] = suffix
+            id = f"{base}#{suffix}"
+        element._identify(id)
+        self.__elements[id] = element
+        return id
+
+    def restore(self, elements: Iterable[Element]):
+        """
+        Register elements under the ids they already have, as loaded from a netlist.
+        """
+        for element in elements:
+            self.__elements[element.id] = element
+
+    def remove(self, element: Element):
+        if self.__elements.get(element.id) is element:
+            del self.__elements[element.id]
+            element._identify(None)
+
+    def clear(self):
+        for element in list(self.__elements.values()):
+            element._identify(None)
+        self.__elements.clear()
+        self.__unnamed.clear()
+        self.__suffixes.clear()
+
+    def find(self, id: str) -> Element:
+        return self.__elements[id]
+
+    def __contains__(self, id: str):
+        return id in self.__elements
+
+    def __len__(self):
+        return len(self.__elements)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.__elements.keys()))
+
+
 class BufferedElement(Generic[B, D], Element[B], states=[('__data', 'data')]):
+    __slots__ = ('__data', '__validated')
+
     def __init__(self, data: D, name: str = None):
         super().__init__(name=name)
         self.__data = data
+        # whether validation checked the data joined to this element, so that writes need not check it
+        self.__validated = False
 
     @property
     def data(self):
@@ -127,18 +213,24 @@ class BufferedElement(Generic[B, D], Element[B], states=[('__data', 'data')]):
     @data.setter
     def data(self, value: Union[int, D]):
         if isinstance(value, Data):
-            if not self.__data.compatible(value):
+            # compatibility is checked until the design is validated, of() still validates the value
+            if not self.__validated and not self.__data.compatible(value):
                 raise AttributeError
             self.__data = self.__data.of(value.value)
         else:
-            if not self.__data.valid(value):
-                raise AttributeError
+            # of() validates the value
             self.__data = self.__data.of(value)
 
     @data.deleter
     def data(self):
         self.__data = self.__data.of(None)
 
+    def mark_validated(self):
+        """
+        Stop checking the compatibility of written data, once validation checked the data joined by wires.
+        """
+        self.__validated = True
+
 
 if __name__ == "__main__":
     class MyElement(Element, states=[('value', 'val')]):
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import dataclasses
 from abc import ABC, abstractmethod
-from typing import Generic, Union, Callable
+from typing import Generic, Union, Callable, Optional, Tuple
 
 from logy.core.primitive.data import D, Mode
 from logy.core.primitive.element import BufferedElement, ElementBehavior, Element
@@ -22,10 +21,23 @@ class PinBehavior(ElementBehavior, ABC):
 
 
 class Pin(Generic[D], BufferedElement[PinBehavior, D], classifier="P"):
+    __slots__ = ('__entries',)
+
+    def __init__(self, data: D, name: str = None):
+        super().__init__(data, name=name)
+        self.__entries: Optional[Tuple[PinEntry, PinEntry]] = None
+
+    def entry(self, mode: Mode) -> PinEntry:
+        """
+        Get the entry of the pin in the mode, made once per pin and mode.
+        """
+        if self.__entries is None:
+            self.__entries = (PinEntry._make(self, Mode.IN), PinEntry._make(self, Mode.OUT))
+        return self.__entries[mode]
 
     def update(self, state):
         super().update(state)
-        if state['data'] != self.data:
+        if 'data' in state and state['data'] != self.data:
             self.on_data_update({"data": state['data']})
 
     def write(self, data: Union[D, int], writer: Element = None):
@@ -39,11 +51,29 @@ class Pin(Generic[D], BufferedElement[PinBehavior, D], classifier="P"):
         self.behavior().on_data_update(self, prev_state)
 
 
-@dataclasses.dataclass
 class PinEntry:
-    pin: Pin
-    mode: Mode
+    """
+    A pin attached in a mode.
+    Entries are interned by their pin, so that PinEntry(pin, mode) is the same object each time,
+    compared and hashed by identity.
+    """
+    __slots__ = ('pin', 'mode')
+
+    def __new__(cls, pin: Pin, mode: Mode):
+        return pin.entry(mode)
+
+    @classmethod
+    def _make(cls, pin: Pin, mode: Mode) -> PinEntry:
+        entry = object.__new__(cls)
+        entry.pin, entry.mode = pin, mode
+        return entry
+
+    def __iter__(self):
+        return iter((self.pin, self.mode))
+
+    def __reduce__(self):
+        return PinEntry, (self.pin, self.mode)
 
-    def __hash__(self):
-        return hash((self.pin, self.mode))
+    def __repr__(self):
+        return f"PinEntry(pin={self.pin!r}, mode={self.mode!r})"
 
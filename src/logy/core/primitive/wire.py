@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import dataclasses
 from abc import ABC, abstractmethod
-from typing import Generic, Iterable, Tuple, Optional, Dict, Set, TYPE_CHECKING, Union
+from typing import Generic, Iterable, Tuple, Optional, Dict, Set, TYPE_CHECKING, Union, List
 
-from logy.core.primitive.data import D1, D2, D, Mode
+from logy.core.primitive.data import D1, D2, D, Mode, BD, BinaryData, Data, mask
 from logy.core.primitive.element import BufferedElement, ElementBehavior, Element
 from logy.core.primitive.pin import Pin, PinEntry
 
@@ -23,25 +22,32 @@ class WireBehavior(ElementBehavior, ABC):
 
 
 class Wire(Generic[D, D1, D2], Element[WireBehavior], classifier="W"):
+    __slots__ = ('__delay',)
+
     def __init__(self, pin_ins: Iterable[Tuple[Pin[D1], int]], pin_outs: Iterable[Tuple[Pin[D2], int]],
                  name: str = None):
         super().__init__(name=name)
-        self.__delay: Dict[PinEntry, int] = {PinEntry(pin, mode): delay for pins, mode in
+        # entries in order, with their delays
+        self.__delay: Dict[PinEntry, int] = {pin.entry(mode): delay for pins, mode in
                                              [(pin_ins, Mode.IN), (pin_outs, Mode.OUT)] for pin, delay in
                                              pins}
-        self.__pins: Set[PinEntry] = set(self.__delay.keys())
 
     @property
     def pins(self):
-        return {entry.pin for entry in self.__pins}
+        return dict.fromkeys(entry.pin for entry in self.__delay).keys()
 
     def get_delay(self, pin: Pin, mode: Mode):
-        entry = PinEntry(pin, mode)
-        return self.__delay[entry]
+        return self.__delay[pin.entry(mode)]
 
     @property
     def entries(self):
-        return self.__pins.copy()
+        return dict.fromkeys(self.__delay).keys()
+
+    def deliver(self, pin: Pin, data: D) -> Iterable[Tuple[Pin, int, D]]:
+        """
+        Get the writes a write of an input pin makes, as (output pin, delay, data).
+        """
+        return [(entry.pin, delay, data) for entry, delay in self.__delay.items() if entry.mode is Mode.OUT]
 
     def write(self, data: Union[D1, int], writer: Element = None):
         if not writer or not isinstance(writer, Pin):
@@ -68,15 +74,79 @@ class Wire(Generic[D, D1, D2], Element[WireBehavior], classifier="W"):
 
 
 class SimpleWire(Generic[D], Wire[D, D, D], ABC, classifier="s"):
+    __slots__ = ()
+
     def __init__(self, pin_ins: Iterable[Tuple[Pin[D1], int]], pin_outs: Iterable[Tuple[Pin[D2], int]],
                  name: Optional[str] = None):
         super(SimpleWire, self).__init__(pin_ins, pin_outs, name=name)
 
 
-# class MultiWire(Generic[BD], Wire[BD, BinaryData, BinaryData], ABC, classifier="m"):
-#     def __init__(self, data: D, pins: Iterable[Tuple['Pin[BD]', Direction, Tuple[int, int], int]]):
-#         super().__init__(data, [(pin, mode, delay) for pin, mode, _, delay in pins])
-#         self.__bitmap: Dict[Wire.PinEntry, Tuple[int, int]] = {Wire.PinEntry(pin, mode): bit for pin, mode, bit, _ in pins}
+class MultiWire(Generic[BD], Wire[BD, BinaryData, BinaryData], classifier="m", states=[('__data', 'data')]):
+    """
+    A bus wire joining slices of binary data pins: each pin is connected to bits [start, stop) of the bus.
+    A write of an input pin replaces its slice of the bus, and only outputs whose slice changed are written,
+    with the bits of their slice. Masks and shifts of slices are computed once, on creation.
+    """
+    __slots__ = ('__data', '__slices', '__inputs', '__outputs')
+
+    def __init__(self, data: BD, pin_ins: Iterable[Tuple[Pin[BinaryData], Tuple[int, int], int]],
+                 pin_outs: Iterable[Tuple[Pin[BinaryData], Tuple[int, int], int]], name: str = None):
+        """
+        :param data: data of the bus, giving its width
+        :param pin_ins: pins driving the bus, with their slice (start, stop) and delay
+        :param pin_outs: pins driven by the bus, with their slice (start, stop) and delay
+        """
+        pin_ins, pin_outs = list(pin_ins), list(pin_outs)
+        super().__init__([(pin, delay) for pin, _, delay in pin_ins], [(pin, delay) for pin, _, delay in pin_outs],
+                         name=name)
+        self.__slices: Dict[PinEntry, Tuple[int, int]] = {
+            pin.entry(mode): bits for pins, mode in [(pin_ins, Mode.IN), (pin_outs, Mode.OUT)]
+            for pin, bits, _ in pins}
+        # (shift, mask) by input pin, and (pin, delay, shift, mask) of outputs
+        self.__inputs: Dict[Pin, Tuple[int, int]] = {pin: (start, mask(stop - start))
+                                                     for pin, (start, stop), _ in pin_ins}
+        self.__outputs: Tuple[Tuple[Pin, int, int, int], ...] = tuple(
+            (pin, delay, start, mask(stop - start)) for pin, (start, stop), delay in pin_outs)
+        value = data.value
+        for pin, (shift, bits) in self.__inputs.items():
+            value = (value & ~(bits << shift)) | ((pin.data.value & bits) << shift)
+        self.__data: BD = data.of(value)
+
+    @property
+    def data(self) -> BD:
+        return self.__data
+
+    def get_slice(self, pin: Pin, mode: Mode) -> Tuple[int, int]:
+        return self.__slices[pin.entry(mode)]
+
+    def deliver(self, pin: Pin, data: Union[BinaryData, int]) -> List[Tuple[Pin, int, int]]:
+        shift, bits = self.__inputs[pin]
+        old = self.__data.value
+        new = (old & ~(bits << shift)) | (((data.value if isinstance(data, Data) else data) & bits) << shift)
+        if new == old:
+            return []
+        self.__data = self.__data._with(new)
+        changed = old ^ new
+        return [(out, delay, (new >> start) & bits) for out, delay, start, bits in self.__outputs
+                if (changed >> start) & bits]
+
+    @classmethod
+    def split(cls, start: Pin[BinaryData], ends: Iterable[Tuple[Pin[BinaryData], Tuple[int, int]]], delay: int = 0,
+              name: str = None):
+        """
+        Split a pin into fields, each end getting bits [start, stop) of it.
+        """
+        return MultiWire(start.data.of(None), [(start, (0, start.data.length), 0)],
+                         [(pin, bits, delay) for pin, bits in ends], name=name or f"[{start.full_name}:...]")
+
+    @classmethod
+    def join(cls, starts: Iterable[Tuple[Pin[BinaryData], Tuple[int, int]]], end: Pin[BinaryData], delay: int = 0,
+             name: str = None):
+        """
+        Join fields into a pin, each start giving bits [start, stop) of it.
+        """
+        return MultiWire(end.data.of(None), [(pin, bits, 0) for pin, bits in starts],
+                         [(end, (0, end.data.length), delay)], name=name or f"[...:{end.full_name}]")
 
 
 if __name__ == '__main__':
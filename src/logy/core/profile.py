@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from time import perf_counter
+from typing import Dict, Optional, Any, Tuple
+
+from logy.core.primitive import ComponentBehavior, Component, Element, Pin, D
+from logy.core.system import Event, EventHandler
+
+
+class Profiler:
+    """
+    An opt-in instrumentation of an event system.
+    It counts scheduled and executed events per element and event type, accumulates wall time per handler and
+    per component behavior callback, and keeps a histogram of the queue depth seen at each execution.
+    Timings are inclusive: a callback which triggers another one also accounts for its time.
+    """
+
+    def __init__(self):
+        self.scheduled_by_element: Counter[str] = Counter()
+        self.scheduled_by_type: Counter[str] = Counter()
+        self.executed_by_element: Counter[str] = Counter()
+        self.executed_by_type: Counter[str] = Counter()
+        self.handler_time: Dict[str, float] = {}
+        self.handler_calls: Counter[str] = Counter()
+        self.callback_time: Dict[str, float] = {}
+        self.callback_calls: Counter[str] = Counter()
+        # queue depth histogram: power-of-two bucket -> count, bucket b counts depths in [b, 2b)
+        self.queue_depth: Counter[int] = Counter()
+        self.max_queue_depth = 0
+        self.__first: Optional[Tuple[int, float]] = None
+        self.__last: Optional[Tuple[int, float]] = None
+
+    @staticmethod
+    def name(element: Optional[Element]) -> str:
+        return element.id if isinstance(element, Element) else str(element)
+
+    """ hooks called by event system """
+
+    def on_schedule(self, event: Event):
+        self.scheduled_by_element[self.name(event.target)] += 1
+        self.scheduled_by_type[event.type] += 1
+
+    def on_execute(self, event: Event, depth: int):
+        self.executed_by_element[self.name(event.target)] += 1
+        self.executed_by_type[event.type] += 1
+        self.queue_depth[1 << (depth.bit_length() - 1) if depth else 0] += 1
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.__last = event.time, perf_counter()
+        if self.__first is None:
+            self.__first = self.__last
+
+    def on_handle(self, handler: EventHandler, elapsed: float):
+        self.__account(self.handler_time, self.handler_calls, handler.name, elapsed)
+
+    def on_callback(self, callback: str, elapsed: float):
+        self.__account(self.callback_time, self.callback_calls, callback, elapsed)
+
+    @staticmethod
+    def __account(times: Dict[str, float], calls: Counter[str], name: str, elapsed: float):
+        times[name] = times.get(name, 0.0) + elapsed
+        calls[name] += 1
+
+    """ report """
+
+    @property
+    def executed(self) -> int:
+        return sum(self.executed_by_type.values())
+
+    def rates(self) -> Dict[str, Optional[float]]:
+        """
+        Get executed events per simulated time unit and per wall-clock second, between the first and last execution.
+        """
+        if self.__first is None:
+            return {'per_time_unit': None, 'per_second': None}
+        (time0, wall0), (time1, wall1) = self.__first, self.__last
+        return {'per_time_unit': self.executed / (time1 - time0) if time1 > time0 else None,
+                'per_second': self.executed / (wall1 - wall0) if wall1 > wall0 else None}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'scheduled': {'by_element': dict(self.scheduled_by_element), 'by_type': dict(self.scheduled_by_type)},
+            'executed': {'by_element': dict(self.executed_by_element), 'by_type': dict(self.executed_by_type)},
+            'handlers': {name: {'calls': self.handler_calls[name], 'time': time}
+                         for name, time in self.handler_time.items()},
+            'callbacks': {name: {'calls': self.callback_calls[name], 'time': time}
+                          for name, time in self.callback_time.items()},
+            'queue_depth': {'histogram': {str(bucket): count for bucket, count in sorted(self.queue_depth.items())},
+                            'max': self.max_queue_depth},
+            'rates': self.rates(),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def report(self, top: int = 10) -> str:
+        rates = self.rates()
+        lines = [f"executed {self.executed} events, "
+                 f"{rates['per_time_unit'] or 0:.2f}/time unit, {rates['per_second'] or 0:,.0f}/s"]
+        lines.append("events by type (scheduled / executed):")
+        for type, count in self.executed_by_type.most_common():
+            lines.append(f"  {type:<24} {self.scheduled_by_type[type]:>10} {count:>10}")
+        lines.append(f"top {top} elements by executed events:")
+        for name, count in self.executed_by_element.most_common(top):
+            lines.append(f"  {name:<40} {count:>10}")
+        for title, times, calls in [("handlers", self.handler_time, self.handler_calls),
+                                    ("callbacks", self.callback_time, self.callback_calls)]:
+            lines.append(f"{title} (calls / seconds):")
+            for name, time in sorted(times.items(), key=lambda it: -it[1]):
+                lines.append(f"  {name:<40} {calls[name]:>10} {time:>10.4f}")
+        lines.append(f"queue depth (max {self.max_queue_depth}):")
+        for bucket, count in sorted(self.queue_depth.items()):
+            lines.append(f"  {f'{bucket}..{max(bucket * 2 - 1, bucket)}':<16} {count:>10}")
+        return '\n'.join(lines)
+
+    class ComponentBehavior(ComponentBehavior):
+        """
+        A component behavior timing each callback of the wrapped behavior.
+        """
+
+        def __init__(self, profiler: Profiler, behavior: ComponentBehavior):
+            self.__profiler = profiler
+            self.__behavior = behavior
+
+        @property
+        def behavior(self):
+            return self.__behavior
+
+        def on_pin_update(self, comp: Component, pin: Pin, prev_state):
+            start = perf_counter()
+            try:
+                self.__behavior.on_pin_update(comp, pin, prev_state)
+            finally:
+                self.__profiler.on_callback('on_pin_update', perf_counter() - start)
+
+        def on_pins_update(self, comp: Component, pins: Dict[Pin, Any]):
+            start = perf_counter()
+            try:
+                self.__behavior.on_pins_update(comp, pins)
+            finally:
+                self.__profiler.on_callback('on_pins_update', perf_counter() - start)
+
+        def on_comp_update(self, comp: Component, subcomp: Component, prev_state):
+            start = perf_counter()
+            try:
+                self.__behavior.on_comp_update(comp, subcomp, prev_state)
+            finally:
+                self.__profiler.on_callback('on_comp_update', perf_counter() - start)
+
+        def on_state_update(self, comp: Component, state, prev_state):
+            start = perf_counter()
+            try:
+                self.__behavior.on_state_update(comp, state, prev_state)
+            finally:
+                self.__profiler.on_callback('on_state_update', perf_counter() - start)
+
+        def write_pin(self, comp: Component, pin: Pin[D], data: D):
+            start = perf_counter()
+            try:
+                self.__behavior.write_pin(comp, pin, data)
+            finally:
+                self.__profiler.on_callback('write_pin', perf_counter() - start)
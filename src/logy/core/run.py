@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, NamedTuple, Optional, Set, Type
+
+from logy.core.primitive import Element, Pin
+from logy.core.system import Event, EventHandler, WriteEvent
+
+# reasons a run stops for
+QUIESCENT = 'quiescent'
+PREDICATE = 'predicate'
+EDGES = 'edges'
+TIME = 'time'
+EVENTS = 'events'
+WALL_CLOCK = 'wall-clock'
+
+
+class Run(NamedTuple):
+    """
+    The outcome of a run: why it stopped, the time it stopped at, events executed, clock edges passed and
+    seconds spent.
+    """
+    reason: str
+    time: int
+    events: int
+    edges: int
+    elapsed: float
+
+
+class Watch(EventHandler[Event]):
+    """
+    A handler flagging events to the watched elements, so that a breakpoint is only checked once they changed.
+    """
+
+    def __init__(self, elements: Iterable[Element]):
+        self.__elements = set(elements)
+        self.touched = False
+
+    def matches(self, event: Event) -> bool:
+        return event.target in self.__elements
+
+    def accepts(self, event_type: Type[Event], source: Element, target: Element) -> bool:
+        return target in self.__elements
+
+    def refine(self) -> Optional[Callable[[Event], bool]]:
+        return None
+
+    @property
+    def elements(self) -> Set[Element]:
+        return self.__elements
+
+    def handle(self, event: Event):
+        self.touched = True
+
+
+class EdgeCounter(EventHandler[WriteEvent]):
+    """
+    A handler counting edges of a clock pin, after they are written: rising edges, falling ones, or both if None.
+    """
+
+    def __init__(self, clock: Pin, rising: Optional[bool] = True):
+        self.__clock = clock
+        self.__rising = rising
+        self.__last = clock.data.value
+        self.edges = 0
+
+    def matches(self, event: WriteEvent) -> bool:
+        return event.target is self.__clock
+
+    def accepts(self, event_type: Type[Event], source: Element, target: Element) -> bool:
+        return issubclass(event_type, WriteEvent) and target is self.__clock
+
+    def refine(self) -> Optional[Callable[[WriteEvent], bool]]:
+        return None
+
+    @property
+    def elements(self) -> Set[Element]:
+        return {self.__clock}
+
+    def handle(self, event: WriteEvent):
+        value = self.__clock.data.value
+        if value != self.__last:
+            self.__last = value
+            if self.__rising is None or bool(value) is self.__rising:
+                self.edges += 1
+
+
+if __name__ == '__main__':
+    from logy.bench.circuits import Increment
+    from logy.builtin.register import Register
+    from logy.core.main import Logy
+    from logy.core.primitive import BinaryData, Wire
+    from logy.core.system import Stimulus
+
+    def counter():
+        """
+        A register counting up every cycle, clocked by a clock streamed forever.
+        """
+        logy = Logy()
+        reg = Register(BinaryData(0, length=32), name="COUNT")
+        inc = Increment(Pin(BinaryData(0, length=32), name="I"), Pin(BinaryData(0, length=32), name="O"), name="INC")
+        logy.add_comp(reg, inc)
+        logy.add_pin(clock := Pin(BinaryData(0, length=1), name="GCLK"))
+        logy.add_wire(Wire.direct(clock, reg.pin_clk), Wire.direct(reg.pin_data_out, inc.pin_in),
+                      Wire.direct(inc.pin_out, reg.pin_data_in))
+        logy.elaborate()
+        logy.system.schedule(WriteEvent(None, reg.pin_data_in, 0, 1))
+        logy.system.stream(Stimulus.clock(clock, 10, start=5))
+        return logy, reg, clock
+
+    # a regression test waiting for the counter to reach 100, against guessing a window of 2000 time units
+    logy, reg, clock = counter()
+    logy.system.advance(2000)
+    print(f"advance(2000): count {reg.pin_data_out.data.value}, {logy.system.executed} events")
+
+    logy, reg, clock = counter()
+    run = logy.system.run_until(lambda: reg.pin_data_out.data.value == 100, watch=[reg.pin_data_out],
+                                events=100_000)
+    print(f"run_until(count == 100): {run}, count {reg.pin_data_out.data.value}")
+
+    logy, reg, clock = counter()
+    run = logy.system.run_cycles(clock, 42)
+    print(f"run_cycles(42): {run}, count {reg.pin_data_out.data.value}")
+
+    run = logy.system.run_until(events=500)
+    print(f"run_until(events=500): {run}")
+    run = logy.system.run_until(seconds=0.05)
+    print(f"run_until(seconds=0.05): {run.reason}, {run.events} events")
+
+    logy, reg, clock = counter()
+    logy.system.reset(events=[WriteEvent(None, reg.pin_data_in, 0, 1)])
+    logy.system.stream(Stimulus.clock(clock, 10, cycles=3, start=5))
+    run = logy.system.run_until()
+    print(f"run_until() over 3 cycles: {run}, count {reg.pin_data_out.data.value}")
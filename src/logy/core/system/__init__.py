@@ -1,3 +1,5 @@
 from .event import Event, WriteEvent, InternalEvent
 from .handler import EventHandler, EventHandlerImpl
 from .system import EventSystem
+from .scheduler import EventQueue
+from .stimulus import Stimulus
@@ -15,6 +15,11 @@ EV = TypeVar('EV', bound='Event')
 
 @dataclasses.dataclass
 class Event(Generic[E1, E2], ABC):
+    """
+    An event from a source to a target at a time.
+    Events are slotted, fields being declared in __slots__ by each subclass.
+    """
+    __slots__ = ('source', 'target', 'time')
     source: E1
     target: E2
     time: int
@@ -36,9 +41,10 @@ W = TypeVar('W', Wire, Pin)
 
 @dataclasses.dataclass
 class WriteEvent(Generic[E1, W, D], Event[E1, W]):
+    __slots__ = ('data',)
     data: D
 
 @dataclasses.dataclass
 class InternalEvent(Event[Union[Pin, Component], Union[Pin, Component]]):
+    __slots__ = ('prev_state',)
     prev_state: Any
-    pass
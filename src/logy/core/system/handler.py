@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Generic, Collection, Union, Type, Callable, Iterable
+from typing import Generic, Collection, Union, Type, Callable, Iterable, Optional, Set
 
 from logy.core.primitive import Element
 from logy.core.system.event import EV, E1, E2
 
 
-class EventHandler(Generic[EV], Callable[[EV], None], ABC):
+class EventHandler(Generic[EV], ABC):
     def __call__(self, event: EV):
         if self.matches(event):
             self.handle(event)
@@ -18,12 +18,37 @@ class EventHandler(Generic[EV], Callable[[EV], None], ABC):
     @abstractmethod
     def handle(self, event: EV): ...
 
+    def accepts(self, event_type: Type[EV], source: Element, target: Element) -> bool:
+        """
+        Check if events of the type from the source to the target can be matched.
+        The result should depend only on the event type, the element types and the elements in `elements`,
+        so that an event system can cache it.
+        """
+        return True
+
+    def refine(self) -> Optional[Callable[[EV], bool]]:
+        """
+        Get the per-event check left after accepts(), None if accepts() is sufficient.
+        """
+        return self.matches
+
+    @property
+    def elements(self) -> Set[Element]:
+        """
+        Get the elements this handler is restricted to by instance.
+        """
+        return set()
+
+    @property
+    def name(self) -> str:
+        return type(self).__qualname__
+
     @staticmethod
     def simple(source: Union[E1, None, Type[E1]], target: Union[E2, None, Type[E2]],
                event_types: Collection[Union[Type[EV], str]],
                eventhandler: Callable[[EV], None],
                matcher: Callable[[EV], bool] = None):
-        eventhandler = EventHandlerImpl(source, target, event_types, matcher, eventhandler)
+        eventhandler = EventHandlerImpl(event_types, [source], [target], matcher, eventhandler)
         return eventhandler
 
 
@@ -39,12 +64,26 @@ class EventHandlerImpl(Generic[EV], EventHandler[EV]):
         self.__handler = handler
 
     def matches(self, event: EV) -> bool:
-        type_matches = any(isinstance(event, t) if isinstance(t, type)
-                           else t == event.type for t in self.__event_types)
-        source_matches = self.match_element(event.source, self.__sources)
-        target_matches = self.match_element(event.target, self.__targets)
-        matcher_matches = self.__matcher(event) if self.__matcher else True
-        return type_matches and source_matches and target_matches and matcher_matches
+        return self.accepts(type(event), event.source, event.target) \
+            and (self.__matcher(event) if self.__matcher else True)
+
+    def accepts(self, event_type: Type[EV], source: Element, target: Element) -> bool:
+        type_matches = any(issubclass(event_type, t) if isinstance(t, type)
+                           else t == event_type.type for t in self.__event_types)
+        return type_matches and self.match_element(source, self.__sources) \
+            and self.match_element(target, self.__targets)
+
+    def refine(self) -> Optional[Callable[[EV], bool]]:
+        return self.__matcher
+
+    @property
+    def name(self) -> str:
+        return getattr(self.__handler, '__qualname__', super().name)
+
+    @property
+    def elements(self) -> Set[Element]:
+        return {etype for etypes in (self.__sources, self.__targets) if etypes for etype in etypes
+                if etype is not None and not isinstance(etype, type)}
 
     @staticmethod
     def match_element(element: Element, etypes):
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections import deque
+from heapq import heappush, heappop
+from typing import Generic, Dict, Deque, List, Optional, Iterator, Set
+
+from logy.core.error import SchedulerOverflowError
+from logy.core.system.event import EV
+
+
+class EventQueue(Generic[EV]):
+    """
+    A single-threaded calendar queue of events.
+    Events are bucketed by time, and each bucket keeps its events in FIFO order,
+    so that events at the same time are executed in the order they were scheduled.
+    Pushing to an already pending time is O(1); only a new distinct time touches the heap.
+    Cancelled events are deleted lazily: they are only marked, and skipped when they reach the front.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        :param capacity: maximum number of pending events, unbounded if None
+        """
+        self.__buckets: Dict[int, Deque[EV]] = {}
+        self.__times: List[int] = []
+        self.__size = 0
+        self.__capacity = capacity
+        # ids of cancelled events still held by a bucket
+        self.__cancelled: Set[int] = set()
+
+    @property
+    def capacity(self) -> Optional[int]:
+        return self.__capacity
+
+    def __len__(self):
+        return self.__size
+
+    def __bool__(self):
+        return self.__size > 0
+
+    def __iter__(self) -> Iterator[EV]:
+        cancelled = self.__cancelled
+        for time in sorted(self.__buckets):
+            yield from (event for event in self.__buckets[time] if id(event) not in cancelled)
+
+    def push(self, event: EV):
+        if self.__capacity is not None and self.__size >= self.__capacity:
+            raise SchedulerOverflowError(f"event queue is full ({self.__capacity} pending events)")
+        bucket = self.__buckets.get(event.time)
+        if bucket is None:
+            bucket = self.__buckets[event.time] = deque()
+            heappush(self.__times, event.time)
+        bucket.append(event)
+        self.__size += 1
+
+    def cancel(self, event: EV):
+        """
+        Cancel a pending event, which must be in the queue and not cancelled yet.
+        """
+        self.__cancelled.add(id(event))
+        self.__size -= 1
+
+    def __purge(self):
+        # drop cancelled events from the front, so that the earliest bucket starts with a pending event
+        cancelled = self.__cancelled
+        while self.__times:
+            time = self.__times[0]
+            bucket = self.__buckets[time]
+            while bucket and id(bucket[0]) in cancelled:
+                cancelled.discard(id(bucket.popleft()))
+            if bucket:
+                return
+            del self.__buckets[time]
+            heappop(self.__times)
+
+    def peek_time(self) -> Optional[int]:
+        """
+        Get the time of the earliest pending event, None if empty.
+        """
+        if self.__cancelled:
+            self.__purge()
+        return self.__times[0] if self.__times else None
+
+    def peek(self) -> EV:
+        if self.__cancelled:
+            self.__purge()
+        if not self.__times:
+            raise IndexError("peek from an empty event queue")
+        return self.__buckets[self.__times[0]][0]
+
+    def pop(self) -> EV:
+        if self.__cancelled:
+            self.__purge()
+        if not self.__times:
+            raise IndexError("pop from an empty event queue")
+        time = self.__times[0]
+        bucket = self.__buckets[time]
+        event = bucket.popleft()
+        if not bucket:
+            del self.__buckets[time]
+            heappop(self.__times)
+        self.__size -= 1
+        return event
+
+    def clear(self):
+        self.__buckets.clear()
+        self.__times.clear()
+        self.__cancelled.clear()
+        self.__size = 0
+
+
+if __name__ == '__main__':
+    import time
+    from queue import PriorityQueue
+    from logy.core.system.event import WriteEvent
+
+    # clock tree: each edge of the root clock fans out to every leaf at the same time
+    LEAVES, EDGES = 1000, 1000
+
+    def workload(put, get, empty):
+        start = time.perf_counter()
+        for edge in range(EDGES):
+            for leaf in range(LEAVES):
+                put(WriteEvent(None, leaf, edge * 5, edge & 1))
+            while not empty():
+                get()
+        return time.perf_counter() - start
+
+    queue = EventQueue()
+    elapsed = workload(queue.push, queue.pop, lambda: not queue)
+    print(f"EventQueue:    {LEAVES * EDGES / elapsed:,.0f} events/s")
+
+    pqueue = PriorityQueue()
+    elapsed = workload(pqueue.put, pqueue.get, pqueue.empty)
+    print(f"PriorityQueue: {LEAVES * EDGES / elapsed:,.0f} events/s")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+from itertools import count
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from logy.core.primitive import Pin, Data
+from logy.core.system.event import WriteEvent
+
+if TYPE_CHECKING:
+    from logy.core.main import Logy
+
+MAGIC = b'LOGYSTI1'
+# magic, number of records and offset of the pickled pin ids, followed by the records
+_PREFIX = struct.Struct('<8sQQ')
+# a record: time, pin index and value
+_RECORD = struct.Struct('<QQQ')
+
+Change = Tuple[int, Pin, Union[Data, int]]
+
+
+class Stimulus:
+    """
+    A lazy source of pin changes as (time, pin, value), in order of time, made of any iterable or generator.
+    The event system pulls a change only once the previous one has left its queue, so that a source holds a single
+    pending event however long it is. Checkpoints keep the pending change of a source, but not the source.
+    """
+    __slots__ = ('__changes', '__time', 'name')
+
+    def __init__(self, changes: Iterable[Change], name: str = None):
+        self.__changes: Iterator[Change] = iter(changes)
+        self.__time: Optional[int] = None
+        self.name = name
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name or hex(id(self))} at {self.__time}>"
+
+    @classmethod
+    def of(cls, changes: Union[Stimulus, Iterable[Change]]) -> Stimulus:
+        return changes if isinstance(changes, Stimulus) else cls(changes)
+
+    @property
+    def time(self) -> Optional[int]:
+        """
+        Get the time of the last change pulled, None if none was.
+        """
+        return self.__time
+
+    def next(self) -> Optional[WriteEvent]:
+        """
+        Pull the next change as a write event from the source, None once exhausted.
+        """
+        change = next(self.__changes, None)
+        if change is None:
+            return None
+        time, pin, value = change
+        if self.__time is not None and time < self.__time:
+            raise ValueError(f"{self!r}: change of {pin.full_name} at {time} is earlier than the previous one")
+        self.__time = time
+        return WriteEvent(self, pin, time, value)
+
+    @classmethod
+    def clock(cls, pin: Pin, period: int, cycles: Optional[int] = None, start: int = 0) -> Stimulus:
+        """
+        Get a clock on the pin, rising at start of each period and falling at half of it, for cycles or forever.
+        """
+        half = period // 2
+
+        def edges():
+            for cycle in (range(cycles) if cycles is not None else count()):
+                yield start + cycle * period, pin, 1
+                yield start + cycle * period + half, pin, 0
+
+        return cls(edges(), name=f"clock {pin.full_name}")
+
+    """ trace files """
+
+    @staticmethod
+    def save(file: Union[str, os.PathLike, BinaryIO], changes: Iterable[Change]) -> int:
+        """
+        Write changes to a trace file, pins being referred to by id, and get the number of changes written.
+        Changes are streamed to the file, and values are stored as 64-bit unsigned integers.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'wb') as f:
+                return Stimulus.save(f, changes)
+        start = file.tell()
+        file.write(_PREFIX.pack(MAGIC, 0, 0))
+        indices: Dict[Pin, int] = {}
+        records, pack, buffer = 0, _RECORD.pack, []
+        for time, pin, value in changes:
+            index = indices.get(pin)
+            if index is None:
+                index = indices[pin] = len(indices)
+            buffer.append(pack(time, index, value.value if isinstance(value, Data) else value))
+            records += 1
+            if len(buffer) >= 1024:
+                file.write(b''.join(buffer))
+                buffer.clear()
+        file.write(b''.join(buffer))
+        offset = file.tell() - start
+        pickle.dump([pin.id for pin in indices], file, protocol=pickle.HIGHEST_PROTOCOL)
+        end = file.tell()
+        file.seek(start)
+        file.write(_PREFIX.pack(MAGIC, records, offset))
+        file.seek(end)
+        return records
+
+    @classmethod
+    def load(cls, file: Union[str, os.PathLike], logy: Logy) -> Stimulus:
+        """
+        Get a source reading the changes of a trace file, memory-mapped and unpacked one record at a time.
+        Pins are found by id in the Logy.
+        """
+        return cls(cls.__records(os.fspath(file), logy), name=os.path.basename(os.fspath(file)))
+
+    @staticmethod
+    def __records(path: str, logy: Logy) -> Iterator[Change]:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                magic, records, offset = _PREFIX.unpack_from(view)
+                if magic != MAGIC:
+                    raise ValueError(f"{path} is not a stimulus file")
+                pins: List[Any] = [logy.find(id) for id in pickle.loads(view[offset:])]
+                records = view[_PREFIX.size:_PREFIX.size + records * _RECORD.size]
+                unpacked = _RECORD.iter_unpack(records)
+                try:
+                    for time, index, value in unpacked:
+                        yield time, pins[index], value
+                finally:
+                    # views must be released before the file is unmapped
+                    del unpacked
+                    records.release()
+            finally:
+                view.release()
+
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional, TextIO, Union, Set
+
+from logy.core.primitive import Pin, Component, BinaryData, D
+
+
+class TraceSink(ABC):
+    """
+    A base class for sinks which receive value changes of pins from an event system.
+    """
+
+    @abstractmethod
+    def on_change(self, time: int, pin: Pin, data: D):
+        """
+        Handle a value change of the pin at the time.
+        """
+        ...
+
+    def close(self):
+        """
+        Flush and release the sink.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class VcdWriter(TraceSink):
+    """
+    A trace sink streaming value changes of selected pins in Value Change Dump format.
+    Pins are scoped by the components they belong to, and selected by globs matched against either
+    the pin's full name or its hierarchical path like 'C_REG_1.P_DIN'.
+    """
+
+    def __init__(self, file: Union[str, TextIO], pins: Iterable[Pin], comps: Iterable[Component] = (),
+                 signals: Iterable[str] = ('*',), timescale: str = '1ns', buffering: int = 1 << 16):
+        self.__file = open(file, 'w', buffering=buffering) if isinstance(file, str) else file
+        self.__owned = isinstance(file, str)
+        self.__signals = list(signals)
+        self.__ids: Dict[Pin, str] = {}
+        self.__time: Optional[int] = None
+        self.__write_header(list(pins), list(comps), timescale)
+
+    @classmethod
+    def of(cls, logy, file: Union[str, TextIO], signals: Iterable[str] = ('*',), **kwargs) -> VcdWriter:
+        """
+        Get a writer for the pins and components of a Logy.
+        """
+        return cls(file, logy.ordered_pins, logy.ordered_comps, signals=signals, **kwargs)
+
+    def selects(self, *paths: str) -> bool:
+        return any(fnmatchcase(path, signal) for path in paths for signal in self.__signals)
+
+    def __identifier(self, pin: Pin) -> str:
+        if pin not in self.__ids:
+            index, code = len(self.__ids), ''
+            while True:
+                index, digit = divmod(index, 94)
+                code += chr(33 + digit)
+                if not index:
+                    break
+            self.__ids[pin] = code
+        return self.__ids[pin]
+
+    def __write_header(self, pins: List[Pin], comps: List[Component], timescale: str):
+        lines = [f"$timescale {timescale} $end"]
+        subcomps: Set[Component] = {sub for comp in comps for sub in comp.comps}
+        scoped: Set[Pin] = set()
+
+        def scope(comp: Component, path: str):
+            path = f"{path}.{comp.full_name}" if path else comp.full_name
+            lines.append(f"$scope module {comp.full_name} $end")
+            for pin in sorted(comp.pins, key=lambda p: p.full_name):
+                scoped.add(pin)
+                if self.selects(pin.full_name, f"{path}.{pin.full_name}"):
+                    lines.append(self.__var(pin))
+            for sub in sorted(comp.comps, key=lambda c: c.full_name):
+                scope(sub, path)
+            lines.append("$upscope $end")
+
+        lines.append("$scope module logy $end")
+        for comp in sorted((comp for comp in comps if comp not in subcomps), key=lambda c: c.full_name):
+            scope(comp, '')
+        for pin in sorted((pin for pin in pins if pin not in scoped), key=lambda p: p.full_name):
+            if self.selects(pin.full_name):
+                lines.append(self.__var(pin))
+        lines.append("$upscope $end")
+        lines.append("$enddefinitions $end")
+
+        lines.append("$dumpvars")
+        lines.extend(self.__value(pin.data, code) for pin, code in self.__ids.items())
+        lines.append("$end")
+        self.__file.write('\n'.join(lines) + '\n')
+
+    def __var(self, pin: Pin) -> str:
+        width = pin.data.length if isinstance(pin.data, BinaryData) else 64
+        return f"$var wire {width} {self.__identifier(pin)} {pin.full_name} $end"
+
+    @staticmethod
+    def __value(data: D, code: str) -> str:
+        width = data.length if isinstance(data, BinaryData) else 64
+        if width == 1:
+            return f"{int(data.value) & 1}{code}"
+        # negative values are written in two's complement at the declared width
+        return f"b{int(data.value) & ((1 << width) - 1):b} {code}"
+
+    def on_change(self, time: int, pin: Pin, data: D):
+        code = self.__ids.get(pin)
+        if code is None:
+            return
+        if time != self.__time:
+            self.__time = time
+            self.__file.write(f"#{time}\n")
+        self.__file.write(self.__value(data, code) + '\n')
+
+    def close(self):
+        if self.__owned:
+            self.__file.close()
+        elif not self.__file.closed:
+            self.__file.flush()
+
+
+if __name__ == '__main__':
+    import sys
+    from logy.core.main import Logy
+    from logy.builtin.register import Register
+    from logy.core.primitive import Wire
+    from logy.core.system import WriteEvent
+
+    logy = Logy()
+    reg = Register(BinaryData(0, length=8), name="1")
+    logy.add_comp(reg)
+    logy.add_pin(pin_clk := Pin(BinaryData(0, length=1), name="GCLK"))
+    logy.add_wire(Wire.direct(pin_clk, reg.pin_clk))
+
+    with VcdWriter.of(logy, sys.stdout, signals=['P_GCLK', 'C_REG_*.P_D*']) as writer:
+        logy.system.sink = writer
+        logy.system.schedule(WriteEvent(None, reg.pin_data_in, 0, 255))
+        logy.system.schedule(WriteEvent(None, pin_clk, 5, 1))
+        logy.system.schedule(WriteEvent(None, pin_clk, 7, 0))
+        logy.system.advance(10)
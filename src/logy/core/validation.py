@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, TYPE_CHECKING
+
+from logy.core.error import DesignError, NonDeterministicError
+from logy.core.primitive import Element, Pin, Mode, MultiWire, BinaryData
+
+if TYPE_CHECKING:
+    from logy.core.main import Logy
+
+# design rules
+MULTIPLE_DRIVERS = 'multiple-drivers'
+OUTPUT_TO_OUTPUT = 'output-to-output'
+UNREGISTERED = 'unregistered'
+WIDTH_MISMATCH = 'width-mismatch'
+
+
+class Violation(NamedTuple):
+    """
+    A design rule violated by an element.
+    """
+    rule: str
+    element: Element
+    message: str
+
+    def __str__(self):
+        return f"{self.element.id}: {self.message} [{self.rule}]"
+
+
+def check(logy: Logy) -> List[Violation]:
+    """
+    Check the design rules over the netlist of a Logy, and get every violation in the order elements were added.
+    """
+    violations: List[Violation] = []
+    pins = logy.pins
+    # pin -> components driving it, and wires driving it
+    comp_drivers: Dict[Pin, List[Element]] = {}
+    wire_drivers: Dict[Pin, List[Element]] = {}
+
+    for comp in logy.ordered_comps:
+        # outputs driven by mapped states, as those of hierarchical components are driven by their inner wires
+        for entries in comp.table.outputs.values():
+            for entry in entries:
+                comp_drivers.setdefault(entry.pin, []).append(comp)
+
+    for wire in logy.ordered_wires:
+        reference = None
+        for entry in wire.entries:
+            pin = entry.pin
+            if pin not in pins:
+                violations.append(Violation(UNREGISTERED, wire, f"pin {pin.id} is not added to the simulation"))
+            if entry.mode is Mode.OUT:
+                wire_drivers.setdefault(pin, []).append(wire)
+                if pin in comp_drivers:
+                    violations.append(Violation(OUTPUT_TO_OUTPUT, wire, f"drives {pin.id}, an output of "
+                                                + ', '.join(comp.id for comp in comp_drivers[pin])))
+            if isinstance(wire, MultiWire):
+                continue
+            if reference is None:
+                reference = pin
+            elif type(reference.data) is not type(pin.data) or not reference.data.compatible(pin.data):
+                violations.append(Violation(WIDTH_MISMATCH, wire, f"joins {reference.id} ({reference.data!r}) "
+                                                                  f"and {pin.id} ({pin.data!r})"))
+
+        if isinstance(wire, MultiWire):
+            violations.extend(_check_slices(wire))
+
+    for drivers in (comp_drivers, wire_drivers):
+        for pin, elements in drivers.items():
+            if len(elements) > 1:
+                violations.append(Violation(MULTIPLE_DRIVERS, pin, "driven by "
+                                            + ', '.join(element.id for element in elements)))
+    return violations
+
+
+def _check_slices(wire: MultiWire) -> List[Violation]:
+    """
+    Check the slices of a bus wire: each fits the bus and the width of its pin, and no bit has several drivers.
+    """
+    violations: List[Violation] = []
+    length = wire.data.length
+    drivers: Dict[int, Pin] = {}
+    for entry in wire.entries:
+        pin = entry.pin
+        start, stop = wire.get_slice(pin, entry.mode)
+        if not 0 <= start < stop <= length:
+            violations.append(Violation(WIDTH_MISMATCH, wire, f"slice [{start}:{stop}) of {pin.id} is out of "
+                                                              f"the bus of {length} bits"))
+        elif not isinstance(pin.data, BinaryData) or pin.data.length != stop - start:
+            violations.append(Violation(WIDTH_MISMATCH, wire, f"joins {pin.id} ({pin.data!r}) "
+                                                              f"to slice [{start}:{stop})"))
+        elif entry.mode is Mode.IN:
+            others = dict.fromkeys(drivers[bit] for bit in range(start, stop) if bit in drivers)
+            if others:
+                violations.append(Violation(MULTIPLE_DRIVERS, wire, f"slice [{start}:{stop}) driven by {pin.id} "
+                                            f"and " + ', '.join(other.id for other in others)))
+            drivers.update(dict.fromkeys(range(start, stop), pin))
+    return violations
+
+
+def validate(logy: Logy):
+    """
+    Check the design rules, and raise an error reporting all violations if any.
+    Pins with several drivers raise a NonDeterministicError, as their value depends on the order of events,
+    and any other violation a DesignError.
+    """
+    violations = check(logy)
+    if not violations:
+        return
+    message = f"{len(violations)} design rule violation(s):\n  " + '\n  '.join(map(str, violations))
+    if all(violation.rule == MULTIPLE_DRIVERS for violation in violations):
+        raise NonDeterministicError(message)
+    raise DesignError(message)
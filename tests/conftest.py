@@ -0,0 +1,23 @@
+import os
+import sys
+from typing import List, Tuple
+
+# the package is run from its source tree
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+from logy.core.primitive import Pin
+from logy.core.trace import TraceSink
+
+
+class Changes(TraceSink):
+    """
+    A trace sink recording the (time, value) changes of a single pin.
+    """
+
+    def __init__(self, pin: Pin):
+        self.pin = pin
+        self.changes: List[Tuple[int, int]] = []
+
+    def on_change(self, time, pin, data):
+        if pin is self.pin:
+            self.changes.append((time, data.value))
@@ -0,0 +1,55 @@
+import io
+
+from logy.bench.circuits import Add
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent
+
+
+class Tagged(Add, states=['tag']):
+    """
+    An adder with a state no pin sets, unset until written.
+    """
+
+    def __init__(self, *pins: Pin, name: str = None):
+        super().__init__(*pins, name=name)
+        self.tag = None
+
+
+def glitching() -> Logy:
+    """
+    Two chained adders, each fed by both branches of a wire with different delays, so that outputs glitch.
+    """
+    logy = Logy()
+    logy.use(Logy.EventSystem(inertial=2))
+    logy.add_pin(pin := Pin(BinaryData(0, length=32), name="IN"))
+    source = pin
+    for index in range(2):
+        add = Tagged(Pin(BinaryData(0, length=32), name=f"A{index}"), Pin(BinaryData(0, length=32), name=f"B{index}"),
+                     Pin(BinaryData(0, length=32), name=f"S{index}"), name=f"ADD{index}")
+        logy.add_comp(add)
+        logy.add_wire(Wire.branch(source, [(add.get_pin('a').pin, 5), (add.get_pin('b').pin, 6)], name=f"W{index}"))
+        source = add.pin_out
+    for step in range(20):
+        logy.system.schedule(WriteEvent(None, pin, 20 * step + 3, step))
+    return logy
+
+
+def test_restore_counters_and_unset_states():
+    logy = glitching()
+    add = next(comp for comp in logy.comps if isinstance(comp, Tagged))
+    logy.system.advance(200)
+    buffer = io.BytesIO()
+    logy.checkpoint(buffer)
+    counters = {name: getattr(logy.system, name) for name in Logy.EventSystem.COUNTERS}
+    states = [element.__getstate__() for element in logy.elements]
+    assert counters['cancelled'] and counters['dropped']
+
+    logy.system.advance(200)
+    add.__setstate__({'tag': 5})
+    assert {name: getattr(logy.system, name) for name in Logy.EventSystem.COUNTERS} != counters
+    buffer.seek(0)
+    logy.restore(buffer)
+    assert {name: getattr(logy.system, name) for name in Logy.EventSystem.COUNTERS} == counters
+    assert [element.__getstate__() for element in logy.elements] == states
+    assert add.tag is None
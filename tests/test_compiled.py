@@ -0,0 +1,41 @@
+import pytest
+
+from logy.bench.circuits import CIRCUITS
+from logy.bench.runner import simulate
+from logy.builtin.register import Register
+from logy.core.compiled import CompiledLogy
+from logy.core.system import Event
+
+CYCLES = 20
+
+
+class Poke:
+    """
+    A stand-in for a Logy, whose system pokes the writes a stimulus schedules into a compiled engine.
+    """
+
+    def __init__(self, compiled: CompiledLogy):
+        self.system = self
+        self.__compiled = compiled
+
+    def schedule(self, event: Event):
+        self.__compiled.poke(event.target, event.data)
+
+
+@pytest.mark.parametrize('name', sorted(name for name in CIRCUITS if name != 'decode_stage'))
+def test_same_registers_as_event_engine(name):
+    build, sizes = CIRCUITS[name]
+    reference = build(sizes[0])
+    simulate(reference, CYCLES)
+
+    circuit = build(sizes[0])
+    compiled = CompiledLogy(circuit.logy, circuit.clock)
+    for cycle in range(CYCLES):
+        circuit.stimulus(Poke(compiled), 0, cycle)
+        compiled.settle()
+        compiled.step()
+    compiled.sync()
+
+    registers = [[comp.data for comp in circuit.logy.ordered_comps if isinstance(comp, Register)]
+                 for circuit in (reference, circuit)]
+    assert registers[0] and registers[1] == registers[0]
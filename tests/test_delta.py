@@ -0,0 +1,68 @@
+import pytest
+
+from logy.bench.circuits import CIRCUITS, Add
+from logy.bench.runner import simulate
+from logy.core import run
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent
+
+from conftest import Changes
+
+
+def adder(delta: bool, budget: int = None):
+    """
+    Write both inputs of an adder at the same time, and get the pins it was evaluated for, the changes of its
+    output and the system. With a budget, the run stops after that many events first, and is then resumed.
+    """
+    logy = Logy()
+    logy.use(Logy.EventSystem(delta=delta))
+    add = Add(Pin(BinaryData(0, length=32), name="A"), Pin(BinaryData(0, length=32), name="B"),
+              Pin(BinaryData(0, length=32), name="S"), name="ADD")
+    logy.add_comp(add)
+    logy.add_pin(a := Pin(BinaryData(0, length=32), name="X"), b := Pin(BinaryData(0, length=32), name="Y"))
+    logy.add_wire(Wire.direct(a, add.get_pin('a').pin), Wire.direct(b, add.get_pin('b').pin))
+    evaluations = []
+    update = add.on_pins_update
+    add.on_pins_update = lambda pins: (evaluations.append({pin.name for pin in pins}), update(pins))
+    logy.system.sink = changes = Changes(add.pin_out)
+
+    logy.system.schedule(WriteEvent(None, a, 10, 1))
+    logy.system.schedule(WriteEvent(None, b, 10, 2))
+    if budget is not None:
+        assert logy.system.run_until(events=budget).reason == run.EVENTS
+        assert logy.system.executed == budget
+    logy.system.run_until(duration=20 - logy.system.now())
+    assert add.pin_out.data.value == 3
+    return evaluations, changes.changes, logy.system
+
+
+def test_inputs_changing_together():
+    # both inputs change in the same delta: the adder is evaluated once, and writes its output once
+    evaluations, changes, system = adder(True)
+    assert evaluations == [{"A", "B"}]
+    assert changes == [(10, 3)]
+    _, changes, reference = adder(False)
+    assert changes == [(10, 3)]
+    assert system.executed == reference.executed - 1
+
+
+@pytest.mark.parametrize('budget', range(1, 9))
+def test_resumed_after_budget(budget):
+    # a delta cut by the budget is evaluated once, when resumed to its end
+    evaluations, changes, system = adder(True, budget)
+    assert evaluations == [{"A", "B"}]
+    assert changes == [(10, 3)]
+    assert system.executed == adder(True)[2].executed
+
+
+@pytest.mark.parametrize('name', sorted(CIRCUITS))
+def test_same_states_as_without_deltas(name):
+    build, sizes = CIRCUITS[name]
+    states = []
+    for delta in (False, True):
+        circuit = build(sizes[0])
+        circuit.logy.use(Logy.EventSystem(delta=delta))
+        simulate(circuit, 20)
+        states.append([element.__getstate__() for element in circuit.logy.elements])
+    assert states[0] == states[1]
@@ -0,0 +1,91 @@
+from typing import Optional
+
+import pytest
+
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, MultiWire, BinaryData
+from logy.core.system import WriteEvent
+
+from conftest import Changes
+
+
+def simulate(inertial: Optional[int], writes, wired: bool = False):
+    """
+    Write a pin, directly or through wires from pins A and B of delay 3, and get its changes and the system.
+    """
+    logy = Logy()
+    logy.use(Logy.EventSystem(inertial=inertial))
+    pin = Pin(BinaryData(0, length=8), name="P")
+    logy.add_pin(pin)
+    sources = {}
+    if wired:
+        sources = {name: Pin(BinaryData(0, length=8), name=name) for name in "AB"}
+        logy.add_pin(*sources.values())
+        logy.add_wire(*[Wire.branch(source, [(pin, 3)]) for source in sources.values()])
+    logy.system.sink = changes = Changes(pin)
+    for source, time, value in writes:
+        logy.system.schedule(WriteEvent(None, sources.get(source, pin), time, value))
+    logy.system.advance(100)
+    return pin, changes.changes, logy.system
+
+
+@pytest.mark.parametrize('inertial', [None, 0, 3])
+def test_out_of_order_scheduling(inertial):
+    # the write scheduled last happens first, and is overwritten by the one scheduled first
+    pin, changes, system = simulate(inertial, [(None, 10, 0), (None, 5, 1)])
+    assert pin.data.value == 0
+    assert changes == [(5, 1), (10, 0)]
+    assert system.dropped == 0
+
+
+def test_pulse_rejection_inside_window():
+    writes = [(None, 10, 1), (None, 12, 0)]
+    _, transport, _ = simulate(None, writes)
+    assert transport == [(10, 1), (12, 0)]
+    pin, inertial, system = simulate(3, writes)
+    assert pin.data.value == 0
+    assert inertial == []
+    assert system.cancelled == 1 and system.dropped == 1
+
+
+def test_pulse_wider_than_window():
+    writes = [(None, 10, 1), (None, 20, 0)]
+    _, transport, _ = simulate(None, writes)
+    _, inertial, system = simulate(3, writes)
+    assert inertial == transport == [(10, 1), (20, 0)]
+    assert system.avoided == 0
+
+
+def test_writes_from_different_sources():
+    writes = [('A', 10, 5), ('B', 11, 7)]
+    pin, transport, _ = simulate(None, writes, wired=True)
+    assert pin.data.value == 7
+    assert transport == [(13, 5), (14, 7)]
+    pin, inertial, system = simulate(3, writes, wired=True)
+    assert pin.data.value == 7
+    assert inertial == [(14, 7)]
+    assert system.cancelled == 1
+
+
+def test_unchanged_write_dropped_on_execution():
+    pin, changes, system = simulate(0, [(None, 5, 0), (None, 10, 3), (None, 15, 3)])
+    assert pin.data.value == 3
+    assert changes == [(10, 3)]
+    assert system.dropped == 2
+
+
+@pytest.mark.parametrize('inertial', [None, 0, 3])
+def test_slices_of_a_bus_written_together(inertial):
+    # writes of different inputs of a bus drive different slices, and do not supersede each other
+    logy = Logy()
+    logy.use(Logy.EventSystem(inertial=inertial))
+    a, b, out = Pin(BinaryData(0, length=4), name="A"), Pin(BinaryData(0, length=4), name="B"), \
+        Pin(BinaryData(0, length=8), name="O")
+    logy.add_pin(a, b, out)
+    logy.add_wire(MultiWire.join([(a, (0, 4)), (b, (4, 8))], out))
+    logy.system.schedule(WriteEvent(None, a, 10, 3))
+    logy.system.schedule(WriteEvent(None, b, 10, 5))
+    logy.system.advance(20)
+    assert out.data.value == 0x53
+    # only the write of the output with the slice of A alone is superseded
+    assert logy.system.cancelled == (0 if inertial is None else 1)
@@ -0,0 +1,31 @@
+from logy.builtin.memory import Memory
+from logy.core.main import Logy
+from logy.core.system import WriteEvent
+
+
+def clocked_write(address: int):
+    """
+    Write a word at the address on a rising edge of a memory of 16 bytes, and get the memory.
+    """
+    logy = Logy()
+    memory = Memory(16, name="MEM")
+    logy.add_comp(memory)
+    logy.system.schedule(WriteEvent(None, memory.pin_address, 0, address))
+    logy.system.schedule(WriteEvent(None, memory.pin_data_in, 0, 0xdeadbeef))
+    logy.system.schedule(WriteEvent(None, memory.pin_write_enable, 0, 1))
+    logy.system.schedule(WriteEvent(None, memory.pin_clk, 5, 1))
+    logy.system.advance(10)
+    return memory
+
+
+def test_write_in_range():
+    memory = clocked_write(4)
+    assert memory.read(4) == 0xdeadbeef
+    assert memory.pin_data_out.data.value == 0xdeadbeef
+
+
+def test_write_out_of_range_is_ignored():
+    # the last word overlaps the end, and is read as the default word
+    memory = clocked_write(14)
+    assert bytes(memory.view()) == bytes(16)
+    assert memory.pin_data_out.data == memory.word
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from logy.bench.circuits import ripple_chain
+from logy.bench.runner import logy_of
+from logy.core import netlist
+from logy.core.main import Logy
+from logy.core.system import WriteEvent
+
+SRC = os.path.join(os.path.dirname(__file__), os.pardir, 'src')
+KEY = "from logy.core.netlist import key; from logy.bench.circuits import ripple_chain; " \
+      "from logy.bench.runner import logy_of; print(key(logy_of, ripple_chain, 16))"
+
+
+def test_key_is_stable_across_processes():
+    keys = {subprocess.run([sys.executable, '-c', KEY], env={**os.environ, 'PYTHONPATH': SRC}, check=True,
+                           capture_output=True, text=True).stdout.strip() for _ in range(2)}
+    assert keys == {netlist.key(logy_of, ripple_chain, 16)}
+
+
+def test_key_depends_on_arguments():
+    assert netlist.key(logy_of, ripple_chain, 16) != netlist.key(logy_of, ripple_chain, 32)
+    assert netlist.key(logy_of, ripple_chain, 16) != netlist.key(logy_of, ripple_chain, size=16)
+
+
+def test_key_follows_sources_of_arguments(tmp_path, monkeypatch):
+    module = tmp_path / 'design_under_key.py'
+    module.write_text("def build(size):\n    return size\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from design_under_key import build
+    before = netlist.key(logy_of, build, 16)
+    assert netlist.key(logy_of, build, 16) == before
+    module.write_text("def build(size):\n    return size + 1\n")
+    assert netlist.key(logy_of, build, 16) != before
+
+
+def test_key_rejects_unstable_arguments():
+    with pytest.raises(ValueError):
+        netlist.key(logy_of, lambda size: size, 16)
+    with pytest.raises(ValueError):
+        netlist.key(logy_of, object(), 16)
+
+
+def states(logy: Logy):
+    clock = logy.find('P_GCLK')
+    for cycle in range(8):
+        logy.system.schedule(WriteEvent(None, logy.find('C_REG_R0.P_DIN'), cycle * 10, cycle * 37 & 0xff))
+        logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 5, 1))
+        logy.system.schedule(WriteEvent(None, clock, cycle * 10 + 9, 0))
+        logy.system.advance(10)
+    result = [element.__getstate__() for element in logy.elements]
+    logy.close()
+    return result
+
+
+def test_cached_round_trip(tmp_path, monkeypatch):
+    loads = []
+    load = netlist.load
+    monkeypatch.setattr(netlist, 'load', lambda *args: loads.append(args) or load(*args))
+    built = netlist.cached(logy_of, ripple_chain, 16, directory=str(tmp_path))
+    assert not loads
+    reference = states(built)
+    loaded = netlist.cached(logy_of, ripple_chain, 16, directory=str(tmp_path))
+    assert len(loads) == 1
+    assert os.listdir(tmp_path) == [f"{netlist.key(logy_of, ripple_chain, 16)}.netlist"]
+    assert loaded.elaborated
+    assert states(loaded) == reference
@@ -0,0 +1,91 @@
+import pytest
+
+from logy.bench.circuits import CIRCUITS, Add, Circuit, ripple_chain
+from logy.bench.runner import logy_of, simulate
+from logy.core.main import Logy
+from logy.core.parallel import ParallelLogy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent
+
+
+def glitches(size: int) -> Logy:
+    """
+    A chain of adders, each feeding both inputs of the next with different delays, so that every output glitches.
+    """
+    logy = Logy()
+    logy.add_pin(source := Pin(BinaryData(0, length=32), name="IN"))
+    for index in range(size):
+        add = Add(Pin(BinaryData(0, length=32), name=f"A{index}"), Pin(BinaryData(0, length=32), name=f"B{index}"),
+                  Pin(BinaryData(0, length=32), name=f"S{index}"), name=f"ADD{index}")
+        logy.add_comp(add)
+        logy.add_wire(Wire.branch(source, [(add.get_pin('a').pin, 5), (add.get_pin('b').pin, 6)], name=f"W{index}"))
+        source = add.pin_out
+    return logy
+
+
+# irregular times, so that glitches straddle windows of the parallel engine
+TIMES = [13, 56, 89, 127, 129, 142, 148, 155, 187, 196, 212, 214, 256, 267, 276, 338, 360, 361, 382, 392]
+
+
+def stimulus(logy: Logy, system):
+    source = next(pin for pin in logy.pins if pin.name == "IN")
+    for step, time in enumerate(TIMES):
+        # an adder of equal inputs drops their top bit, so flipping it only glitches the first output
+        system.schedule(WriteEvent(None, source, time, (step & 1) << 31 | step >> 2))
+
+
+def sequential(inertial):
+    logy = glitches(8)
+    logy.use(Logy.EventSystem(inertial=inertial))
+    stimulus(logy, logy.system)
+    logy.system.advance(600)
+    return logy
+
+
+@pytest.mark.parametrize('inertial', [None, 2])
+def test_matches_sequential(inertial):
+    reference = sequential(inertial)
+    logy = glitches(8)
+    with ParallelLogy(logy, glitches, 8, partitions=4, inertial=inertial) as parallel:
+        assert parallel.partitions == 4 and parallel.lookahead == 5
+        stimulus(logy, parallel.system)
+        parallel.system.advance(600)
+        parallel.sync()
+    assert [element.__getstate__() for element in logy.elements] == \
+           [element.__getstate__() for element in reference.elements]
+    for name in ('executed', 'cancelled', 'dropped', 'avoided'):
+        assert getattr(parallel.system, name) == getattr(reference.system, name), name
+    if inertial is not None:
+        assert reference.system.cancelled and reference.system.dropped
+
+
+@pytest.mark.parametrize('delta', [False, True])
+@pytest.mark.parametrize('name', sorted(CIRCUITS))
+def test_same_events_without_lookahead(name, delta):
+    # partitions go through each time together, so they execute the events a single process would
+    build, sizes = CIRCUITS[name]
+    reference = build(sizes[0])
+    reference.logy.use(Logy.EventSystem(delta=delta))
+    simulate(reference, 10)
+    circuit = build(sizes[0])
+    with ParallelLogy(circuit.logy, logy_of, build, sizes[0], partitions=4, delta=delta) as parallel:
+        assert parallel.lookahead == 0
+        simulate(Circuit(parallel, circuit.clock, circuit.stimulus), 10)
+        parallel.sync()
+    assert [element.__getstate__() for element in circuit.logy.elements] == \
+           [element.__getstate__() for element in reference.logy.elements]
+    assert parallel.system.executed == reference.logy.system.executed
+
+
+def test_partition_across_delayed_wires():
+    circuit = ripple_chain(16, delay=3)
+    owner = ParallelLogy.partition(circuit.logy, 4)
+    assert len(set(owner.values())) == 4
+    assert ParallelLogy.lookahead_of(circuit.logy, owner) == 3
+
+
+def test_partition_without_delays():
+    circuit = ripple_chain(16)
+    owner = ParallelLogy.partition(circuit.logy, 4)
+    assert len(set(owner.values())) == 4
+    assert ParallelLogy.lookahead_of(circuit.logy, owner) == 0
@@ -0,0 +1,81 @@
+import pytest
+
+from logy.bench.circuits import Increment
+from logy.builtin.register import Register
+from logy.core import run
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+from logy.core.system import WriteEvent, Stimulus
+
+
+def counter(delta: bool = False, cycles: int = None):
+    """
+    A register counting up every cycle, clocked by a streamed clock of period 10.
+    """
+    logy = Logy()
+    logy.use(Logy.EventSystem(delta=delta))
+    reg = Register(BinaryData(0, length=32), name="COUNT")
+    inc = Increment(Pin(BinaryData(0, length=32), name="I"), Pin(BinaryData(0, length=32), name="O"), name="INC")
+    logy.add_comp(reg, inc)
+    logy.add_pin(clock := Pin(BinaryData(0, length=1), name="GCLK"))
+    logy.add_wire(Wire.direct(clock, reg.pin_clk), Wire.direct(reg.pin_data_out, inc.pin_in),
+                  Wire.direct(inc.pin_out, reg.pin_data_in))
+    logy.elaborate()
+    logy.system.schedule(WriteEvent(None, reg.pin_data_in, 0, 1))
+    logy.system.stream(Stimulus.clock(clock, 10, cycles=cycles, start=5))
+    return logy.system, reg, clock
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_predicate(delta):
+    system, reg, _ = counter(delta)
+    result = system.run_until(lambda: reg.pin_data_out.data.value == 10, watch=[reg.pin_data_out])
+    assert result.reason == run.PREDICATE
+    assert reg.pin_data_out.data.value == 10 and result.time == 95
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_cycles(delta):
+    system, reg, clock = counter(delta)
+    result = system.run_cycles(clock, 7)
+    assert result.reason == run.EDGES and result.edges == 7
+    assert reg.pin_data_out.data.value == 7
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_event_budget(delta):
+    system, _, _ = counter(delta)
+    result = system.run_until(events=1001)
+    assert result.reason == run.EVENTS and result.events == 1001
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_wall_clock_budget(delta):
+    # an endless clock only stops on the budget
+    system, _, _ = counter(delta)
+    result = system.run_until(seconds=0.05)
+    assert result.reason == run.WALL_CLOCK
+    assert result.elapsed < 1
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_quiescence_advances_duration(delta):
+    system, reg, _ = counter(delta, cycles=3)
+    result = system.run_until(duration=1000)
+    assert result.reason == run.QUIESCENT and result.time == 1000 and system.now() == 1000
+    assert reg.pin_data_out.data.value == 3
+
+
+def test_duration():
+    system, _, _ = counter()
+    result = system.run_until(duration=100)
+    assert result.reason == run.TIME and system.now() == 100
+
+
+@pytest.mark.parametrize('delta', [False, True])
+def test_matches_advance(delta):
+    advanced, reg, _ = counter(delta)
+    advanced.advance(200)
+    system, other, _ = counter(delta)
+    system.run_until(duration=200)
+    assert (advanced.executed, reg.pin_data_out.data.value) == (system.executed, other.pin_data_out.data.value)
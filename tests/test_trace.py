@@ -0,0 +1,30 @@
+import io
+
+from logy.core.primitive import Pin, BinaryData, Data
+from logy.core.trace import VcdWriter
+
+
+def changes(pin: Pin, data) -> str:
+    """
+    Trace a value change of the pin, and get the line it was written as.
+    """
+    file = io.StringIO()
+    writer = VcdWriter(file, [pin])
+    writer.on_change(0, pin, data)
+    return file.getvalue().splitlines()[-1]
+
+
+def test_negative_values_in_twos_complement():
+    pin = Pin(BinaryData(0, length=8, signed=True), name="S")
+    assert changes(pin, BinaryData(-5, length=8, signed=True)).startswith("b11111011 ")
+    assert changes(pin, BinaryData(5, length=8, signed=True)).startswith("b101 ")
+
+
+def test_negative_values_without_width():
+    pin = Pin(Data(0), name="D")
+    assert changes(pin, Data(-1)).startswith("b" + "1" * 64 + " ")
+
+
+def test_single_bit():
+    pin = Pin(BinaryData(0, length=1), name="B")
+    assert changes(pin, BinaryData(1, length=1)) == "1" + changes(pin, BinaryData(0, length=1))[1:]
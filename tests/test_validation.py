@@ -0,0 +1,28 @@
+import pytest
+
+from logy.core.main import Logy
+from logy.core.primitive import Pin, Wire, BinaryData
+
+
+def design():
+    logy = Logy()
+    a, b = Pin(BinaryData(0, length=8), name="A"), Pin(BinaryData(0, length=8), name="B")
+    logy.add_pin(a, b)
+    logy.add_wire(Wire.direct(a, b))
+    return logy, a
+
+
+def test_incompatible_write_before_elaboration():
+    _, pin = design()
+    with pytest.raises(AttributeError):
+        pin.data = BinaryData(1, length=4)
+    pin.data = BinaryData(1, length=8)
+    assert pin.data.value == 1
+
+
+def test_compatibility_checked_once_elaborated():
+    logy, pin = design()
+    logy.elaborate()
+    # validation checked the data joined by wires, so that writes skip the check
+    pin.data = BinaryData(1, length=4)
+    assert pin.data == BinaryData(1, length=8)